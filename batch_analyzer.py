@@ -0,0 +1,285 @@
+# batch_analyzer.py - análisis por lotes de sesiones grabadas, sin GUI
+# Uso:  python batch_analyzer.py CARPETA [--out CARPETA_SALIDA] [--workers N] [--window 0.2]
+#                                [--harmonics 15] [--chunk-rows 100000]
+# Procesa todos los CSV de save_to_csv y capturas .lvc de la carpeta, un archivo por
+# proceso (ProcessPoolExecutor). Cada archivo se lee por tramos de --chunk-rows filas y se
+# corta en ventanas de --window s; en cada tramo se calculan todas las ventanas juntas con
+# los mismos cálculos que la GUI (utils/signal_engine.py y utils/waveform_measurements.py):
+# lecturas, potencias, fasores, frecuencia y armónicos. Por archivo solo se guardan
+# acumuladores mín/promedio/máx, así la memoria de cada proceso no depende del tamaño.
+# Salida: un resumen por archivo (<nombre>.resumen.csv) y resumen_lote.csv con una fila por archivo.
+import argparse
+import csv
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from utils import signal_engine
+from utils.capture_file import estimate_fs, open_samples
+from utils.channel_registry import REGISTRY
+from utils.table_io import CHUNK_ROWS, iter_csv_chunks, sniff_csv
+from utils.waveform_measurements import measure_sweeps
+
+PATTERNS = ("*.csv", "*.lvc")
+AC_KINDS = ("voltage", "current")
+
+
+def _csv_blocks(path, chunk_rows):
+    """(claves, fs, generador de tramos filas x canales) de un CSV de save_to_csv."""
+    info = sniff_csv(path)
+    headers = info["headers"] or [f"Col {c}" for c in range(info["n_cols"])]
+    t_col = headers.index("t") if "t" in headers else None
+    cols = [c for c in range(len(headers)) if c != t_col]
+    chunks = iter_csv_chunks(path, info, chunk_rows)
+    first = next(chunks, None)
+    if first is None:
+        return [headers[c] for c in cols], 2000.0, iter(())
+    fs = estimate_fs(first[0][:, t_col]) if t_col is not None else 2000.0
+
+    def blocks():
+        yield first[0][:, cols]
+        for block, _, _ in chunks:
+            yield block[:, cols]
+    return [headers[c] for c in cols], fs, blocks()
+
+
+def _capture_blocks(path, chunk_rows):
+    """Lo mismo para una captura .lvc (np.memmap: solo se lee el tramo en curso)."""
+    meta, raw = open_samples(path)
+    blocks = (np.asarray(raw[r0:r0 + chunk_rows], dtype=float) for r0 in range(0, len(raw), chunk_rows))
+    return meta["keys"], float(meta["fs"]), blocks
+
+
+class Summary:
+    """Acumuladores mín/suma/máx por medida (una columna por medida, filas = ventanas)."""
+
+    def __init__(self):
+        self.names = []         # (canal, medida, unidad)
+        self._index = {}
+        self._lo, self._hi, self._sum, self._n = [], [], [], []
+        self._angles = {}       # medida -> suma de fasores unitarios (promedio circular)
+
+    def _slot(self, name):
+        i = self._index.get(name)
+        if i is None:
+            i = self._index[name] = len(self.names)
+            self.names.append(name)
+            self._lo.append(np.inf)
+            self._hi.append(-np.inf)
+            self._sum.append(0.0)
+            self._n.append(0)
+        return i
+
+    def add(self, names, values):
+        """values: (ventanas, len(names)); los NaN no cuentan."""
+        ok = np.isfinite(values)
+        lo = np.where(ok, values, np.inf).min(axis=0)
+        hi = np.where(ok, values, -np.inf).max(axis=0)
+        total = np.where(ok, values, 0.0).sum(axis=0)
+        count = ok.sum(axis=0)
+        for j, name in enumerate(names):
+            i = self._slot(name)
+            self._lo[i] = min(self._lo[i], lo[j])
+            self._hi[i] = max(self._hi[i], hi[j])
+            self._sum[i] += total[j]
+            self._n[i] += int(count[j])
+
+    def add_angles(self, names, degrees):
+        """Fases en grados: el promedio es el del fasor unitario (no salta en ±180)."""
+        ok = np.isfinite(degrees)
+        rad = np.radians(np.where(ok, degrees, 0.0))
+        vec = np.where(ok, np.cos(rad) + 1j * np.sin(rad), 0.0).sum(axis=0)
+        for j, name in enumerate(names):
+            self._slot(name)
+            self._angles[name] = self._angles.get(name, 0.0) + vec[j]
+
+    def rows(self):
+        """(canal, medida, unidad, mín, promedio, máx); las fases solo llevan promedio."""
+        out = []
+        for i, name in enumerate(self.names):
+            if name in self._angles:
+                vec = self._angles[name]
+                mean = float(np.degrees(np.angle(vec))) if abs(vec) > 0 else np.nan
+                out.append((*name, np.nan, mean, np.nan))
+            elif self._n[i]:
+                out.append((*name, self._lo[i], self._sum[i] / self._n[i], self._hi[i]))
+            else:
+                out.append((*name, np.nan, np.nan, np.nan))
+        return out
+
+
+def _analyze_windows(keys, wins, fs, n_harmonics, summary):
+    """
+    Todas las ventanas de un tramo juntas: wins es (ventanas, muestras, canales).
+    Los motores reciben (ventanas * canales) filas, igual que un bloque de la GUI.
+    """
+    n_win, width, _ = wins.shape
+    data = {key: wins[:, :, j] for j, key in enumerate(keys)}
+    for ch in REGISTRY.enabled("derived"):
+        out = signal_engine.derive(ch, data)
+        if out is not None:
+            data[ch.key] = out
+    all_keys = list(data)
+    defs = [REGISTRY.by_key(k) for k in all_keys]
+
+    # lecturas de medidor (rms o promedio según el registro) de todos los canales
+    matrix = np.stack([data[k] for k in all_keys], axis=1).reshape(-1, width)
+    modes = np.tile([d.reading if d else "rms" for d in defs], n_win)
+    values = signal_engine.readings(matrix, modes).reshape(n_win, len(all_keys))
+    summary.add([(k, d.reading if d else "rms", d.unit if d else "") for k, d in zip(all_keys, defs)],
+                values)
+
+    # tensiones y corrientes: fasores, frecuencia, pico a pico y armónicos
+    ac = [k for k, d in zip(all_keys, defs) if d and d.kind in AC_KINDS]
+    if not ac:
+        return
+    units = [REGISTRY.by_key(k).unit for k in ac]
+    matrix = np.stack([data[k] for k in ac], axis=1).reshape(-1, width)
+    _, phase, _ = signal_engine.phasors(matrix, fs)
+    phase = phase.reshape(n_win, len(ac))
+    # fase respecto del primer canal (la referencia de la ventana es arbitraria)
+    phase = (phase - phase[:, :1] + 180.0) % 360.0 - 180.0
+    summary.add_angles([(k, "fase", "°") for k in ac[1:]], phase[:, 1:])
+
+    meas = measure_sweeps(matrix, fs)
+    summary.add([(k, "frecuencia", "Hz") for k in ac], meas["freq"].reshape(n_win, len(ac)))
+    summary.add([(k, "pico a pico", u) for k, u in zip(ac, units)], meas["pk2pk"].reshape(n_win, len(ac)))
+
+    h, thd = signal_engine.harmonics(matrix, fs, n_harmonics)
+    h = h.reshape(n_win, len(ac), n_harmonics)
+    summary.add([(k, "THD", "%") for k in ac], thd.reshape(n_win, len(ac)))
+    summary.add([(k, "fundamental", u) for k, u in zip(ac, units)], h[:, :, 0])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rel = h[:, :, 1:] / h[:, :, :1] * 100
+    for j, k in enumerate(ac):
+        summary.add([(k, f"H{n}", "%") for n in range(2, n_harmonics + 1)], rel[:, j, :])
+
+
+def _fmt(value):
+    return "" if value is None or not np.isfinite(value) else f"{value:.6g}"
+
+
+def analyze_file(path, out_dir, window=0.2, n_harmonics=15, chunk_rows=CHUNK_ROWS):
+    """
+    Analiza un archivo (corre en un proceso del pool). Escribe su resumen y devuelve
+    dict para el informe del lote: archivo, estado, duración, fs, ventanas, segundos,
+    medias {(canal, medida): promedio}.
+    """
+    t_start = time.perf_counter()
+    result = {"archivo": os.path.basename(path), "estado": "ok", "duracion": np.nan,
+              "fs": np.nan, "ventanas": 0, "segundos": 0.0, "medias": {}}
+    try:
+        opener = _capture_blocks if path.lower().endswith(".lvc") else _csv_blocks
+        keys, fs, blocks = opener(path, chunk_rows)
+        width = max(int(round(window * fs)), 4)
+        summary = Summary()
+        carry = np.empty((0, len(keys)))
+        n_samples = 0
+        for block in blocks:
+            n_samples += len(block)
+            buf = np.concatenate([carry, block]) if len(carry) else block
+            n_win = len(buf) // width
+            if n_win:
+                wins = buf[:n_win * width].reshape(n_win, width, len(keys))
+                _analyze_windows(keys, wins, fs, n_harmonics, summary)
+                result["ventanas"] += n_win
+            carry = buf[n_win * width:]
+        # lo que no llega a una ventana entera queda afuera (la FFT pide el mismo largo)
+        if not result["ventanas"]:
+            raise ValueError(f"sin ventanas completas de {window} s ({n_samples} muestras)")
+
+        rows = summary.rows()
+        name = os.path.join(out_dir, os.path.basename(path) + ".resumen.csv")
+        with open(name, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["canal", "medida", "unidad", "mínimo", "promedio", "máximo"])
+            for channel, measure, unit, lo, mean, hi in rows:
+                writer.writerow([channel, measure, unit, _fmt(lo), _fmt(mean), _fmt(hi)])
+        result["duracion"] = n_samples / fs
+        result["fs"] = fs
+        result["medias"] = {(c, m): mean for c, m, _, _, mean, _ in rows
+                            if m in ("rms", "mean", "THD", "frecuencia")}
+    except Exception as e:
+        result["estado"] = f"error: {e}"
+    result["segundos"] = time.perf_counter() - t_start
+    return result
+
+
+def write_batch_report(path, results):
+    """Una fila por archivo; columnas: datos del archivo + promedio de las lecturas y THD."""
+    columns = []
+    for r in results:
+        for name in r["medias"]:
+            if name not in columns:
+                columns.append(name)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["archivo", "estado", "duración (s)", "fs (Hz)", "ventanas", "proceso (s)"]
+                        + [f"{c} {m}" for c, m in columns])
+        for r in results:
+            writer.writerow([r["archivo"], r["estado"], _fmt(r["duracion"]), _fmt(r["fs"]),
+                             r["ventanas"], f"{r['segundos']:.2f}"]
+                            + [_fmt(r["medias"].get(name)) for name in columns])
+
+
+def input_paths(folder):
+    """
+    Archivos a analizar en la carpeta. Quedan afuera los resúmenes de una corrida
+    anterior (si --out es la misma carpeta) y, cuando un CSV ya tiene su captura .lvc
+    convertida, uno de los dos: la captura si está al día, si no el CSV.
+    """
+    paths = {p for pattern in PATTERNS for p in glob.glob(os.path.join(folder, pattern))
+             if not p.endswith(".resumen.csv") and os.path.basename(p) != "resumen_lote.csv"}
+    for p in [p for p in paths if p.lower().endswith(".csv")]:
+        lvc = os.path.splitext(p)[0] + ".lvc"
+        if lvc in paths:
+            paths.discard(p if os.path.getmtime(lvc) >= os.path.getmtime(p) else lvc)
+    return sorted(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Análisis por lotes de sesiones grabadas de LabVolt")
+    parser.add_argument("folder", help="carpeta con CSV de save_to_csv y/o capturas .lvc")
+    parser.add_argument("--out", default=None, help="carpeta de salida (por defecto, FOLDER/analisis)")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--window", type=float, default=0.2,
+                        help="ventana de análisis en s (conviene ciclos enteros: 0.2 s = 10 a 50 Hz)")
+    parser.add_argument("--harmonics", type=int, default=15, help="armónicos a calcular")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="filas leídas por tramo")
+    args = parser.parse_args()
+
+    paths = input_paths(args.folder)
+    if not paths:
+        print(f"No hay archivos {', '.join(PATTERNS)} en {args.folder}")
+        sys.exit(1)
+    out_dir = args.out or os.path.join(args.folder, "analisis")
+    os.makedirs(out_dir, exist_ok=True)
+
+    workers = min(args.workers or os.cpu_count() or 1, len(paths))
+    print(f"{len(paths)} archivos, {workers} procesos")
+    t0 = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_file, p, out_dir, args.window, args.harmonics, args.chunk_rows)
+                   for p in paths]
+        for future in as_completed(futures):
+            r = future.result()
+            results.append(r)
+            done = f", {r['duracion']:.1f} s en {r['segundos']:.1f} s" if r["estado"] == "ok" else ""
+            print(f"[{len(results)}/{len(paths)}] {r['archivo']}: {r['estado']}{done}")
+    results.sort(key=lambda r: r["archivo"])
+    report = os.path.join(out_dir, "resumen_lote.csv")
+    write_batch_report(report, results)
+
+    elapsed = time.perf_counter() - t0
+    total = sum(r["duracion"] for r in results if np.isfinite(r["duracion"]))
+    print(f"{total:.0f} s de registro en {elapsed:.1f} s ({total / max(elapsed, 1e-9):.0f}x tiempo real)")
+    print(f"Informe: {report}")
+    if any(r["estado"] != "ok" for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# bench_startup.py - mide el arranque de la aplicación (importación, ventana, primer pintado)
+# Uso:  python bench_startup.py [--runs 5] [--max-ms 1500] [--offscreen]
+# Cada corrida es un proceso nuevo (importaciones en frío). Con --max-ms termina con
+# código 1 si la mediana del primer pintado supera el límite (para usar en CI/lab).
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from PySide6 import QtWidgets, QtCore
+app = QtWidgets.QApplication(sys.argv)
+import main_labvolt
+t_import = time.perf_counter()
+win = main_labvolt.MainLabVolt()
+t_build = time.perf_counter()
+
+painted = []
+class _FirstPaint(QtCore.QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Paint and not painted:
+            painted.append(time.perf_counter())
+        return False
+spy = _FirstPaint()
+win.installEventFilter(spy)
+win.show()
+deadline = time.perf_counter() + 10
+while not painted and time.perf_counter() < deadline:
+    app.processEvents()
+t_paint = painted[0] if painted else float("nan")
+
+heavy = [m for m in ("pandas", "pyqtgraph") if m in sys.modules]
+print(json.dumps({
+    "import_ms": (t_import - t0) * 1e3,
+    "build_ms": (t_build - t_import) * 1e3,
+    "first_paint_ms": (t_paint - t0) * 1e3,
+    "heavy_modules": heavy,
+}))
+"""
+
+
+def run_once(offscreen):
+    env = dict(os.environ)
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    here = os.path.dirname(os.path.abspath(__file__))
+    out = subprocess.run([sys.executable, "-c", _CHILD], cwd=here, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de LabVolt")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="límite para la mediana del primer pintado")
+    parser.add_argument("--offscreen", action="store_true",
+                        help="sin ventana real (QT_QPA_PLATFORM=offscreen)")
+    args = parser.parse_args()
+
+    results = [run_once(args.offscreen) for _ in range(args.runs)]
+    for key in ("import_ms", "build_ms", "first_paint_ms"):
+        values = [r[key] for r in results]
+        print(f"{key:>15}: mediana {statistics.median(values):8.1f}  "
+              f"mín {min(values):8.1f}  máx {max(values):8.1f}")
+    heavy = sorted({m for r in results for m in r["heavy_modules"]})
+    print(f"{'importados':>15}: {', '.join(heavy) if heavy else '(ni pandas ni pyqtgraph)'}")
+
+    if args.max_ms is not None:
+        median = statistics.median(r["first_paint_ms"] for r in results)
+        if median > args.max_ms:
+            print(f"FALLA: primer pintado {median:.1f} ms > {args.max_ms:.1f} ms")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
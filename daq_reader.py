@@ -1,21 +1,28 @@
 import threading
 import numpy as np
-import pandas as pd
 from PySide6 import QtCore
+from utils.channel_registry import REGISTRY
+from utils.capture_file import CaptureWriter
 
 class DAQReader(QtCore.QThread):
     data_ready = QtCore.Signal(dict)
 
-    def __init__(self, usb_port="COM3", fs=2000, block_size=200):
+    def __init__(self, usb_port="COM3", fs=2000, block_size=200, registry=REGISTRY):
         super().__init__()
+        self.registry = registry
         self.usb_port = usb_port
         self.fs = fs
         self.block_size = block_size
         self.running = False
         self.saved_data = []
+        # captura a disco (se escribe desde este hilo, no desde la GUI)
+        self._capture = None
+        self._capture_lock = threading.Lock()
 
-        # Diccionario de canales
-        self.channels = ['Va','Vb','Vc','Ia','Ib','Ic','speed','torque']
+    @property
+    def channels(self):
+        """Claves a adquirir: las entradas habilitadas del registro de canales."""
+        return self.registry.acquired_keys()
 
     def open_usb(self):
         """
@@ -42,30 +49,39 @@ class DAQReader(QtCore.QThread):
         Devuelve un diccionario con arrays de tamaño block_size.
         """
         # EJEMPLO CON DATOS SIMULADOS (para probar sin DAQ)
+        # solo se generan/leen los canales habilitados en el registro
         t = np.linspace(0, self.block_size/self.fs, self.block_size)
         w = 2*np.pi*50
-        Va = 220*np.sqrt(2)*np.sin(w*t)
-        Vb = 220*np.sqrt(2)*np.sin(w*t - 2*np.pi/3)
-        Vc = 220*np.sqrt(2)*np.sin(w*t + 2*np.pi/3)
-        Ia = 5*np.sqrt(2)*np.sin(w*t - np.pi/6)
-        Ib = 5*np.sqrt(2)*np.sin(w*t - 2*np.pi/3 - np.pi/6)
-        Ic = 5*np.sqrt(2)*np.sin(w*t + 2*np.pi/3 - np.pi/6)
-        speed = 1500 + 50*np.sin(w*t)
-        torque = 10 + 2*np.sin(w*t - np.pi/4)
-
-        return {
-            "t": t,
-            "Va": Va, "Vb": Vb, "Vc": Vc,
-            "Ia": Ia, "Ib": Ib, "Ic": Ic,
-            "speed": speed, "torque": torque
+        simulated = {
+            "Va": lambda: 220*np.sqrt(2)*np.sin(w*t),
+            "Vb": lambda: 220*np.sqrt(2)*np.sin(w*t - 2*np.pi/3),
+            "Vc": lambda: 220*np.sqrt(2)*np.sin(w*t + 2*np.pi/3),
+            "Ia": lambda: 5*np.sqrt(2)*np.sin(w*t - np.pi/6),
+            "Ib": lambda: 5*np.sqrt(2)*np.sin(w*t - 2*np.pi/3 - np.pi/6),
+            "Ic": lambda: 5*np.sqrt(2)*np.sin(w*t + 2*np.pi/3 - np.pi/6),
+            "speed": lambda: 1500 + 50*np.sin(w*t),
+            "torque": lambda: 10 + 2*np.sin(w*t - np.pi/4),
         }
 
+        data = {"t": t}
+        for k, key in enumerate(self.channels):
+            gen = simulated.get(key)
+            if gen is not None:
+                data[key] = gen()
+            else:
+                # entradas auxiliares EA-x: senoidal de 10 V desfasada según el canal
+                data[key] = 10*np.sin(w*t - k*np.pi/8)
+        return data
+
     def run(self):
         self.open_usb()
         self.running = True
         while self.running:
             data = self.read_block()
             self.saved_data.append(data)
+            with self._capture_lock:
+                if self._capture is not None:
+                    self._capture.append(data)
             self.data_ready.emit(data)
             self.msleep(int(1000*self.block_size/self.fs))
         self.close_usb()
@@ -73,10 +89,38 @@ class DAQReader(QtCore.QThread):
     def stop(self):
         self.running = False
         self.wait()
+        self.stop_capture()
+
+    def start_capture(self, path):
+        """Empieza a grabar todos los canales adquiridos en una captura (ver utils/capture_file.py)."""
+        with self._capture_lock:
+            if self._capture is None:
+                self._capture = CaptureWriter(path, self.channels, self.fs)
+
+    def stop_capture(self):
+        """
+        Cierra la captura en curso (escribe la pirámide de vista general) y devuelve su
+        ruta. Una captura sin muestras se borra y devuelve None.
+        """
+        with self._capture_lock:
+            capture, self._capture = self._capture, None
+        if capture is None:
+            return None
+        if capture.n_samples == 0:
+            capture.discard()
+            return None
+        capture.close()
+        return capture.path
+
+    @property
+    def capturing(self):
+        return self._capture is not None
 
     def save_to_csv(self, filename="mediciones_labvolt_usb.csv"):
         if not self.saved_data:
             return
+        # pandas se importa solo al guardar (no retrasa el arranque)
+        import pandas as pd
         df_list = []
         for entry in self.saved_data:
             temp_df = pd.DataFrame(entry)
@@ -3,19 +3,22 @@
 # Título actualizado y logo cargado desde la ruta en tu proyecto.
 import sys
 import os
+import time
 from PySide6 import QtWidgets, QtGui, QtCore
 from widgets import MeasurementWidget
 from daq_reader import DAQReader
 from utils.styles import apply_app_style
-from widgets.oscilloscope_widget import OscilloscopeWidget
-from widgets.phasor_widget import PhasorWidget
-from widgets.data_table_widget import DataTableWidget
+from utils.resources import resource_path
+from utils.channel_registry import REGISTRY
+from utils.demand_pipeline import DemandPipeline
+from utils.meter_averaging import MODES as METER_MODES
+from utils.trend_store import TrendStore
 
 
 # Ruta local del mini-logo según tu comentario
 _LOCAL_MINI_LOGO_PATH = r"C:\Users\Tepsi\Documents\LabVolt_Project\img\MiniLogo.png"
-# Fallback (si corres en el entorno actual)
-_FALLBACK_MINI_LOGO = "/mnt/data/MiniLogo.png"
+# Fallback: img/MiniLogo.png dentro del proyecto
+_FALLBACK_MINI_LOGO = resource_path("img", "MiniLogo.png")
 
 class MainLabVolt(QtWidgets.QMainWindow):
     def __init__(self):
@@ -30,6 +33,19 @@ class MainLabVolt(QtWidgets.QMainWindow):
         self.daq = DAQReader(usb_port="COM3", fs=2000, block_size=200)
         self.daq.data_ready.connect(self.on_data_ready)
         self._last_data = None
+        self._capture_windows = []
+
+        # tendencias de todas las lecturas desde que arranca la adquisición
+        self.trends = TrendStore([key for _, key, _ in REGISTRY.meter_defs()],
+                                 block_period=self.daq.block_size / self.daq.fs)
+
+        # cada vista declara lo que necesita; se procesa solo la unión
+        # (las pestañas se construyen al activarse por primera vez)
+        self.pipeline = DemandPipeline(self.daq.fs)
+        self.tabs.currentChanged.connect(self._ensure_tab)
+        self.tabs.currentChanged.connect(self._update_demand)
+        REGISTRY.add_listener(self._update_demand)
+        self._update_demand()
 
     def _build_ui(self):
         # Menu bar clásico
@@ -46,13 +62,25 @@ class MainLabVolt(QtWidgets.QMainWindow):
         cerrar = QtGui.QAction("Cerrar", self)
         cerrar.triggered.connect(self.close)
         archivo.addAction(impr); archivo.addAction(prev); archivo.addAction(conf_imp)
+        archivo.addSeparator()
+        # capturas largas a disco (con pirámide de vista general para revisarlas)
+        self.act_capture = QtGui.QAction("Grabar captura...", self)
+        self.act_capture.setCheckable(True)
+        self.act_capture.toggled.connect(self._toggle_capture)
+        abrir_captura = QtGui.QAction("Abrir captura...", self)
+        abrir_captura.triggered.connect(self._open_capture)
+        archivo.addAction(self.act_capture); archivo.addAction(abrir_captura)
         archivo.addSeparator(); archivo.addAction(cerrar)
 
         # Opciones -> acciones (placeholders)
         opciones.addAction(QtGui.QAction("Colores", self))
         opciones.addAction(QtGui.QAction("Disposición", self))
-        opciones.addAction(QtGui.QAction("Ajuste del medidor", self))
-        opciones.addAction(QtGui.QAction("Ajuste de adquisición", self))
+        meter_act = QtGui.QAction("Ajuste del medidor", self)
+        meter_act.triggered.connect(self._open_meter_settings)
+        opciones.addAction(meter_act)
+        acq_act = QtGui.QAction("Ajuste de adquisición", self)
+        acq_act.triggered.connect(self._open_acquisition_settings)
+        opciones.addAction(acq_act)
 
         # Actualizar -> único comando (acción textual)
         refresh_act = QtGui.QAction("Actualizar", self)
@@ -87,70 +115,275 @@ class MainLabVolt(QtWidgets.QMainWindow):
         self.tabs = QtWidgets.QTabWidget()
         layout.addWidget(self.tabs)
 
-        # 1) Aparatos de medición (nuestro widget 3x4)
-        channels = [
-            ("E1", "Va", "V"), ("E2", "Vb", "V"), ("E3", "Vc", "V"), ("T", "torque", "N.m"),
-            ("I1", "Ia", "A"), ("I2", "Ib", "A"), ("I3", "Ic", "A"), ("N", "speed", "r/min"),
-            ("PQS1", "pqs1", "W"), ("PQS2", "pqs2", "W"), ("PQS3", "pqs3", "W"), ("Pm", "pm", "W"),
-        ]
-        self.measurement_panel = MeasurementWidget(channels, compact=True)
+        # 1) Aparatos de medición (nuestro widget 3x4 + filas extra para EA-x)
+        self.measurement_panel = MeasurementWidget(REGISTRY.meter_defs(), compact=True)
         self.tabs.addTab(self.measurement_panel, "Aparatos de medición")
+        self._apply_registry()
+        REGISTRY.add_listener(self._apply_registry)
 
         # placeholders para las otras pestañas
 
-        #osc_tab = OscilloscopeWidget()
-        self.oscilloscope_widget = OscilloscopeWidget()
-
-        osc_tab = self.oscilloscope_widget
-
-        self.tabs.addTab(osc_tab, "Osciloscopio")
-        #osc_tab = QtWidgets.QWidget(); osc_tab.setLayout(QtWidgets.QVBoxLayout()); osc_tab.layout().addWidget(QtWidgets.QLabel("Osciloscopio - pendiente de integrar"))
-        #self.tabs.addTab(osc_tab, "Osciloscopio")
-        #ph_tab = QtWidgets.QWidget(); ph_tab.setLayout(QtWidgets.QVBoxLayout()); ph_tab.layout().addWidget(QtWidgets.QLabel("Analizador de fasores - pendiente"))
-        #self.tabs.addTab(ph_tab, "Analizador de fasores")
+        # el resto de las pestañas se arma recién cuando se muestran
+        self.oscilloscope_widget = None
+        self.phasor_widget = None
+        self.data_table_widget = None
+        self.trend_widget = None
+        self._lazy_tabs = {}
+        self._page_views = {}
+        self._add_lazy_tab("Osciloscopio", "oscilloscope_widget", self._make_oscilloscope)
         # -------------------------
         # Analizador de fasores REAL
         # -------------------------
-        self.phasor_widget = PhasorWidget()
-        self.tabs.addTab(self.phasor_widget, "Analizador de fasores")
+        self._add_lazy_tab("Analizador de fasores", "phasor_widget", self._make_phasor)
         sp_tab = QtWidgets.QWidget(); sp_tab.setLayout(QtWidgets.QVBoxLayout()); sp_tab.layout().addWidget(QtWidgets.QLabel("Analizador de espectro - pendiente"))
         self.tabs.addTab(sp_tab, "Analizador de espectro")
         harm_tab = QtWidgets.QWidget(); harm_tab.setLayout(QtWidgets.QVBoxLayout()); harm_tab.layout().addWidget(QtWidgets.QLabel("Analizador de armónicos - pendiente"))
         self.tabs.addTab(harm_tab, "Analizador de armónicos")
-        #table_tab = QtWidgets.QWidget(); table_tab.setLayout(QtWidgets.QVBoxLayout()); table_tab.layout().addWidget(QtWidgets.QLabel("Tabla de datos - pendiente"))
-        #self.tabs.addTab(table_tab, "Tabla de datos")
-        self.data_table_widget = DataTableWidget()
-        self.tabs.addTab(self.data_table_widget, "Tabla de datos")
+        self._add_lazy_tab("Tabla de datos", "data_table_widget", self._make_data_table)
+        self._add_lazy_tab("Tendencias", "trend_widget", self._make_trend)
 
         # estado
         self.setCentralWidget(central)
         self.statusBar().showMessage("Listo - pestaña 'Aparatos de medición' activa")
 
+    # ---------- pestañas diferidas ----------
+    def _add_lazy_tab(self, title, attr, factory):
+        """Agrega una pestaña vacía; el widget real lo crea 'factory' al activarla."""
+        page = QtWidgets.QWidget()
+        page_layout = QtWidgets.QVBoxLayout(page)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        self.tabs.addTab(page, title)
+        self._lazy_tabs[page] = (attr, factory)
+
+    def _ensure_tab(self, index):
+        """Construye el widget de la pestaña 'index' si todavía no existe."""
+        page = self.tabs.widget(index)
+        entry = self._lazy_tabs.pop(page, None)
+        if entry is None:
+            return
+        attr, factory = entry
+        view = factory()
+        page.layout().addWidget(view)
+        self._page_views[page] = view
+        setattr(self, attr, view)
+
+    def view(self, attr):
+        """Devuelve la vista 'attr' construyéndola si hace falta (sin cambiar de pestaña)."""
+        if getattr(self, attr, None) is None:
+            for page, (name, _) in list(self._lazy_tabs.items()):
+                if name == attr:
+                    self._ensure_tab(self.tabs.indexOf(page))
+        return getattr(self, attr)
+
+    def _current_view(self):
+        page = self.tabs.currentWidget()
+        return self._page_views.get(page, page)
+
+    def _make_oscilloscope(self):
+        from widgets.oscilloscope_widget import OscilloscopeWidget
+        osc = OscilloscopeWidget()
+        osc.set_sample_rate(self.daq.fs)
+        osc.demand_changed.connect(self._update_demand)
+        return osc
+
+    def _make_phasor(self):
+        from widgets.phasor_widget import PhasorWidget
+        phasor = PhasorWidget()
+        phasor.demand_changed.connect(self._update_demand)
+        return phasor
+
+    def _make_data_table(self):
+        from widgets.data_table_widget import DataTableWidget
+        table = DataTableWidget()
+        table.report_provider = self._report_snapshot
+        table.recording_changed.connect(self._update_demand)
+        return table
+
+    def _make_trend(self):
+        from widgets.trend_widget import TrendWidget
+        return TrendWidget(self.trends)
+
+    def _report_snapshot(self):
+        """Medidores y capturas de los gráficos ya abiertos, para el informe PDF."""
+        images = []
+        for attr in ("oscilloscope_widget", "phasor_widget"):
+            widget = getattr(self, attr)
+            if widget is not None:
+                images.append(widget.grab().toImage())
+        return self.measurement_panel.snapshot(), images
+
     @QtCore.Slot(dict)
     def on_data_ready(self, data):
         """Actualiza medidores con el bloque recibido desde DAQReader."""
         self._last_data = data
-        import numpy as _np
-        for (title, ch_name, unit) in self.measurement_panel.channels:
-            arr = data.get(ch_name)
-            if arr is None:
-                self.measurement_panel.set_value(ch_name, None)
-                continue
-            if ch_name in ("speed", "torque", "pm"):
-                val = float(_np.mean(_np.array(arr)))
-            else:
-                val = float(_np.sqrt(_np.mean(_np.array(arr)**2)))
-            self.measurement_panel.set_value(ch_name, val)
-
-        self.oscilloscope_widget.update_signals(data)
-
-        if hasattr(self, "oscilloscope_widget"):
-            self.oscilloscope_widget.update_signals(data)
-        
+        result = self.pipeline.process(data)
+
+        # medidores: solo los canales pedidos (None -> display apagado)
+        if result["readings"]:
+            self.measurement_panel.push_values(result["readings"])
+            self.trends.add(result["readings"], time.time())
+            # grabación y filas a pedido de la tabla de datos (aunque la pestaña no esté visible)
+            table = self.data_table_widget
+            if table is not None:
+                table.feed_readings(result["readings"])
+
+        current = self._current_view()
+        if current is self.oscilloscope_widget:
+            self.oscilloscope_widget.update_signals(result["signals"])
+
         #PARA CONECTAR PHASOR AL DAQ
-        if hasattr(self, "phasor_widget"):
-            self.phasor_widget.update_data(data)
+        if current is self.phasor_widget:
+            self.phasor_widget.update_phasors(result["phasors"])
+
+    def _update_demand(self, *_):
+        """Actualiza lo que pide cada vista según la pestaña visible y su configuración."""
+        current = self._current_view()
+
+        if current is self.measurement_panel:
+            meters = [ch.key for ch in REGISTRY.enabled() if ch.meter]
+            self.pipeline.set_demand("medidores", readings=meters)
+        else:
+            self.pipeline.clear_demand("medidores")
+
+        if current is self.oscilloscope_widget:
+            self.pipeline.set_demand("osciloscopio", waves=self.oscilloscope_widget.demand())
+        else:
+            self.pipeline.clear_demand("osciloscopio")
+
+        if current is self.phasor_widget:
+            self.pipeline.set_demand("fasores", phasors=self.phasor_widget.demand())
+        else:
+            self.pipeline.clear_demand("fasores")
+
+        # las tendencias se registran siempre, aunque no se vea ninguna vista
+        meters = [ch.key for ch in REGISTRY.enabled() if ch.meter]
+        self.pipeline.set_demand("tendencias", readings=meters)
+
+        table = self.data_table_widget
+        if table is not None and table.recording:
+            self.pipeline.set_demand("registro", readings=table.record_keys())
+        else:
+            self.pipeline.clear_demand("registro")
+
+
+    # ---------- capturas ----------
+    def _toggle_capture(self, checked):
+        if not checked:
+            path = self.daq.stop_capture()
+            self.statusBar().showMessage(f"Captura guardada: {path}" if path
+                                         else "Captura vacía (sin adquisición): no se guardó")
+            return
+        default = time.strftime("captura_%Y%m%d_%H%M%S.lvc")
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Grabar captura", default, "Captura (*.lvc)")
+        if not path:
+            self.act_capture.setChecked(False)
+            return
+        if not path.endswith(".lvc"):
+            path += ".lvc"
+        self.daq.start_capture(path)
+        self.statusBar().showMessage(f"Grabando captura en {path}")
+
+    def _open_capture(self):
+        """Abre una captura (o un CSV de save_to_csv) en el visor; la preparación va en segundo plano."""
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Abrir captura", "", "Captura (*.lvc);;CSV (*.csv)")
+        if not path:
+            return
+        from widgets.capture_viewer import CaptureOpenThread, CaptureWindow
+
+        progress = QtWidgets.QProgressDialog("Preparando vista general...", "Cancelar", 0, 100, self)
+        progress.setWindowTitle("Abrir captura")
+        progress.setMinimumDuration(300)
+        thread = CaptureOpenThread(path, self)
+        thread.progress.connect(progress.setValue)
+        thread.failed.connect(
+            lambda msg: QtWidgets.QMessageBox.warning(self, "Abrir captura", f"No se pudo abrir:\n{msg}"))
+        progress.canceled.connect(thread.cancel)
+
+        def finished():
+            progress.canceled.disconnect(thread.cancel)
+            progress.close()
+            if thread.ok and not thread.cancelled:
+                try:
+                    window = CaptureWindow(thread.path)
+                except Exception as e:
+                    QtWidgets.QMessageBox.warning(self, "Abrir captura", f"No se pudo abrir:\n{e}")
+                    thread.deleteLater()
+                    return
+                self._capture_windows.append(window)
+                window.destroyed.connect(lambda *_: self._capture_windows.remove(window))
+                window.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+                window.show()
+            thread.deleteLater()
+
+        thread.finished.connect(finished)
+        thread.start()
+
+    def _apply_registry(self):
+        """Muestra solo los medidores de los canales habilitados."""
+        for ch in REGISTRY:
+            self.measurement_panel.set_channel_visible(ch.key, ch.enabled)
+
+    def _open_meter_settings(self):
+        """Opciones -> Ajuste del medidor: frecuencia de refresco y promedio."""
+        panel = self.measurement_panel
+        dlg = QtWidgets.QDialog(self)
+        dlg.setWindowTitle("Ajuste del medidor")
+        form = QtWidgets.QFormLayout(dlg)
+
+        rate_combo = QtWidgets.QComboBox()
+        rates = [1, 2, 4, 5, 10]
+        rate_combo.addItems([f"{hz} Hz" for hz in rates])
+        if panel.refresh_hz in rates:
+            rate_combo.setCurrentIndex(rates.index(panel.refresh_hz))
+        form.addRow("Refresco del display", rate_combo)
+
+        mode_combo = QtWidgets.QComboBox()
+        modes = list(METER_MODES)
+        mode_combo.addItems([METER_MODES[m] for m in modes])
+        mode_combo.setCurrentIndex(modes.index(panel.averager.mode))
+        form.addRow("Promedio", mode_combo)
+
+        buttons = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel
+        )
+        buttons.accepted.connect(dlg.accept)
+        buttons.rejected.connect(dlg.reject)
+        form.addRow(buttons)
+
+        if dlg.exec() == QtWidgets.QDialog.Accepted:
+            panel.set_refresh_rate(rates[rate_combo.currentIndex()])
+            panel.set_averaging(modes[mode_combo.currentIndex()])
+
+    def _open_acquisition_settings(self):
+        """Opciones -> Ajuste de adquisición: habilitar/deshabilitar entradas."""
+        dlg = QtWidgets.QDialog(self)
+        dlg.setWindowTitle("Ajuste de adquisición")
+        layout = QtWidgets.QVBoxLayout(dlg)
+
+        group = QtWidgets.QGroupBox("Entradas adquiridas")
+        grid = QtWidgets.QGridLayout(group)
+        checks = {}
+        inputs = [ch for ch in REGISTRY if ch.source == "daq"]
+        for i, ch in enumerate(inputs):
+            chk = QtWidgets.QCheckBox(f"{ch.label} ({ch.unit})")
+            chk.setChecked(ch.enabled)
+            grid.addWidget(chk, i % 8, i // 8)
+            checks[ch.label] = chk
+        layout.addWidget(group)
+
+        buttons = QtWidgets.QDialogButtonBox(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel
+        )
+        buttons.accepted.connect(dlg.accept)
+        buttons.rejected.connect(dlg.reject)
+        layout.addWidget(buttons)
 
+        if dlg.exec() == QtWidgets.QDialog.Accepted:
+            for label, chk in checks.items():
+                REGISTRY.set_enabled(label, chk.isChecked())
+            n = len(REGISTRY.acquired_keys())
+            self.statusBar().showMessage(f"Adquisición: {n} entradas habilitadas")
 
     def _on_refresh(self):
         """Comando del menú Actualizar: recalcula usando último bloque si existe."""
@@ -0,0 +1,135 @@
+# tests/test_capture_file.py - capturas en disco: pirámide, ventanas y conversión de CSV
+import os
+import numpy as np
+import pytest
+from utils import table_io
+from utils.capture_file import (OVERVIEW_BASE, OVERVIEW_MIN, OVERVIEW_STEP, CaptureReader,
+                                CaptureWriter, csv_to_capture, meta_path, overview_path)
+
+FS = 2000.0
+KEYS = ["Va", "Ia"]
+
+
+def _write(path, n, block=1234):
+    """Captura de n muestras escrita en bloques irregulares (el último bucket queda parcial)."""
+    rng = np.random.default_rng(0)
+    raw = rng.standard_normal((n, len(KEYS))).astype(np.float32)
+    writer = CaptureWriter(str(path), KEYS, FS)
+    for r0 in range(0, n, block):
+        writer.append({k: raw[r0:r0 + block, j] for j, k in enumerate(KEYS)})
+    writer.close()
+    return raw
+
+
+def _brute(raw, starts, stop):
+    """Mín/máx de raw en [starts[i], starts[i+1]) (el último hasta stop)."""
+    ends = list(starts[1:]) + [stop]
+    lo = np.array([raw[a:b].min(axis=0) for a, b in zip(starts, ends)])
+    hi = np.array([raw[a:b].max(axis=0) for a, b in zip(starts, ends)])
+    return lo, hi
+
+
+@pytest.fixture(scope="module")
+def long_capture(tmp_path_factory):
+    # más de OVERVIEW_MIN * OVERVIEW_STEP buckets de nivel 0: hay al menos dos niveles
+    n = OVERVIEW_MIN * OVERVIEW_STEP * OVERVIEW_BASE + 3 * OVERVIEW_BASE + 77
+    path = tmp_path_factory.mktemp("cap") / "larga.lvc"
+    raw = _write(path, n, block=100_003)
+    return CaptureReader(str(path)), raw
+
+
+def test_overview_levels_match_brute_force(long_capture):
+    reader, raw = long_capture
+    assert reader.n_samples == len(raw)
+    assert len(reader.levels) >= 2
+    for k, (lo, hi) in enumerate(reader.levels):
+        factor = OVERVIEW_BASE * OVERVIEW_STEP ** k
+        starts = np.arange(0, len(raw), factor)
+        assert len(lo) == len(starts)       # el último bucket parcial también está
+        if k == 0:
+            blo, bhi = _brute(raw, starts, len(raw))
+            assert np.array_equal(lo, blo) and np.array_equal(hi, bhi)
+        else:
+            # los niveles gruesos se comparan en el tramo final (incluye el bucket parcial)
+            tail = starts[-5:]
+            blo, bhi = _brute(raw, tail, len(raw))
+            assert np.array_equal(lo[-5:], blo) and np.array_equal(hi[-5:], bhi)
+
+
+def test_window_raw_when_few_samples(long_capture):
+    reader, raw = long_capture
+    x, y = reader.window(10.0, 10.1, [0, 1], max_points=1000)
+    i0 = int(round(x[0] * FS))
+    assert np.allclose(np.diff(x), 1 / FS)
+    assert np.array_equal(y, raw[i0:i0 + len(x)].astype(float))
+
+
+def test_window_close_up_minmax_matches_raw(long_capture):
+    reader, raw = long_capture
+    max_points = 100
+    x, y = reader.window(5.0, 6.0, [1], max_points)       # 2000 muestras: sin nivel
+    i0 = int(round(x[0] * FS))
+    i1 = min(int(np.ceil(6.0 * FS)) + 2, len(raw))
+    per = int(np.ceil((i1 - i0) / max_points))
+    starts = np.arange(i0, i1, per)
+    blo, bhi = _brute(raw[:, [1]], starts, i1)
+    assert np.array_equal(y[0::2], blo) and np.array_equal(y[1::2], bhi)
+    assert np.allclose(x[0::2], starts / FS)
+
+
+@pytest.mark.parametrize("span", [200.0, 1000.0])
+def test_window_uses_coarsest_level_with_enough_points(long_capture, span):
+    reader, raw = long_capture
+    max_points = 500
+    t0 = reader.duration - span         # incluye el final (bucket parcial)
+    x, y = reader.window(t0, reader.duration, [0, 1], max_points)
+    step = (x[2] - x[0]) * FS
+    n = span * FS
+    expected = max(OVERVIEW_BASE * OVERVIEW_STEP ** k for k in range(len(reader.levels))
+                   if n / (OVERVIEW_BASE * OVERVIEW_STEP ** k) >= max_points)
+    assert step == pytest.approx(expected)
+    assert expected == OVERVIEW_BASE * (OVERVIEW_STEP if span > 500 else 1)
+    assert len(x) // 2 >= max_points
+    starts = np.round(x[0::2] * FS).astype(int)
+    blo, bhi = _brute(raw, starts, len(raw))
+    assert np.array_equal(y[0::2], blo) and np.array_equal(y[1::2], bhi)
+
+
+def test_has_overview_detects_stale_pyramid(tmp_path):
+    path = tmp_path / "c.lvc"
+    _write(path, 5000)
+    assert CaptureReader.has_overview(str(path))
+    with open(path, "ab") as f:
+        f.write(np.zeros((10, len(KEYS)), dtype=np.float32).tobytes())
+    assert not CaptureReader.has_overview(str(path))
+    os.remove(overview_path(str(path)))
+    assert not CaptureReader.has_overview(str(path))
+
+
+def test_csv_to_capture_cleans_up_on_cancel(tmp_path, monkeypatch):
+    csv_path = tmp_path / "s.csv"
+    t = np.arange(3200) / FS
+    with open(csv_path, "w") as f:
+        f.write("t,Va,Ia\n")
+        for ti in t:
+            f.write(f"{ti},{np.sin(ti)},{np.cos(ti)}\n")
+    original = table_io.iter_csv_chunks
+    monkeypatch.setattr(table_io, "iter_csv_chunks", lambda p, info=None: original(p, info, 1000))
+
+    path = str(tmp_path / "s.lvc")
+    calls = []
+    assert not csv_to_capture(str(csv_path), path, should_stop=lambda: calls.append(1) or len(calls) > 1)
+    assert not any(os.path.exists(p) for p in (path, meta_path(path), overview_path(path)))
+
+    assert csv_to_capture(str(csv_path), path)
+    reader = CaptureReader(path)
+    assert reader.n_samples == 3200 and reader.fs == FS and reader.keys == ["Va", "Ia"]
+
+
+def test_empty_capture(tmp_path):
+    path = str(tmp_path / "vacia.lvc")
+    CaptureWriter(path, KEYS, FS).close()
+    reader = CaptureReader(path)
+    assert reader.n_samples == 0
+    assert reader.overall_range([0]) is None
+    assert reader.window(0, 1, [0], 100)[1].shape == (0, 1)
@@ -0,0 +1,27 @@
+# tests/test_column_store.py - versiones por columna de ColumnStore (clave del cache de ajustes)
+from utils.column_store import ColumnStore
+
+
+def test_edits_bump_only_the_touched_columns():
+    store = ColumnStore.from_columns(["x", "y", "z"], [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]])
+    before = [store.column_version(c) for c in range(3)]
+
+    store.set_text(0, 2, "7")
+    store.set_block(1, 2, [["8"]])
+    store.clear_range(0, 2, 1, 2)
+    assert [store.column_version(c) for c in range(2)] == before[:2]
+    assert store.column_version(2) != before[2]
+
+    store.set_block(0, 3, [["a"]])      # columna nueva, mismas filas
+    assert [store.column_version(c) for c in range(2)] == before[:2]
+
+
+def test_row_changes_bump_every_column():
+    store = ColumnStore.from_columns(["x", "y"], [[1.0, 2.0], [3.0, 4.0]])
+    for change in (lambda: store.append_rows([[5.0, 6.0]]),
+                   lambda: store.set_text(9, 0, "1"),
+                   lambda: store.insert_rows(0),
+                   lambda: store.remove_rows(0)):
+        before = [store.column_version(c) for c in range(2)]
+        change()
+        assert all(store.column_version(c) != v for c, v in enumerate(before))
@@ -0,0 +1,73 @@
+# tests/test_math_channels.py - compilación y evaluación de canales matemáticos
+import numpy as np
+import pytest
+from utils.math_channels import MathChannel
+
+NAMES = ("E1", "E2", "I1", "T", "N")
+FS = 2000.0
+
+
+def _block(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    block = rng.standard_normal((len(NAMES), n))
+    return block, {name: i for i, name in enumerate(NAMES)}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("E1*I1", lambda d: d["E1"] * d["I1"]),
+    ("E1 − E2", lambda d: d["E1"] - d["E2"]),          # símbolos de la documentación
+    ("-E1 / 2 + 3 ^ 2", lambda d: -d["E1"] / 2 + 9),
+    ("(E1 + E2) × I1", lambda d: (d["E1"] + d["E2"]) * d["I1"]),
+    ("2 * 3", lambda d: np.full_like(d["E1"], 6.0)),    # solo constantes: igual da un buffer
+])
+def test_expressions_match_numpy(text, expected):
+    block, rows = _block()
+    channel = MathChannel(text, NAMES)
+    data = {name: block[i] for name, i in rows.items()}
+    np.testing.assert_allclose(channel.evaluate(block, rows, 1 / FS), expected(data))
+
+
+def test_inputs_in_order_of_appearance():
+    assert MathChannel("I1 * E1 + E1", NAMES).inputs == ["I1", "E1"]
+
+
+def test_buffers_are_reused_between_blocks():
+    block, rows = _block()
+    channel = MathChannel("E1*I1 + E2", NAMES)
+    out = channel.evaluate(block, rows, 1 / FS)
+    block2, _ = _block(seed=1)
+    out2 = channel.evaluate(block2, rows, 1 / FS)
+    assert out2 is out                                   # mismo buffer (out=)
+    np.testing.assert_allclose(out2, block2[0] * block2[2] + block2[1])
+
+
+def test_integ_and_deriv_continue_across_blocks():
+    t = np.arange(400) / FS
+    full = np.vstack([np.sin(2 * np.pi * 50 * t)] + [np.zeros(400)] * (len(NAMES) - 1))
+    rows = {name: i for i, name in enumerate(NAMES)}
+    integ, deriv = MathChannel("integ(E1)", NAMES), MathChannel("deriv(E1)", NAMES)
+    parts_i, parts_d = [], []
+    for k in range(2):
+        block = np.ascontiguousarray(full[:, k * 200:(k + 1) * 200])
+        parts_i.append(integ.evaluate(block, rows, 1 / FS).copy())
+        parts_d.append(deriv.evaluate(block, rows, 1 / FS).copy())
+    np.testing.assert_allclose(np.concatenate(parts_i), np.cumsum(full[0]) / FS, atol=1e-12)
+    np.testing.assert_allclose(np.concatenate(parts_d)[1:], np.diff(full[0]) * FS, atol=1e-9)
+
+
+@pytest.mark.parametrize("text", [
+    "__import__('os').system('echo x')",
+    "E1.__class__",
+    "E1.real",
+    "open('x')",
+    "[E1, E2]",
+    "E1 if E2 else I1",
+    "lambda: E1",
+    "E1 % 2",
+    "integ(E1, E2)",
+    "X9 * 2",
+    "E1 *",
+])
+def test_rejects_unsafe_or_unsupported(text):
+    with pytest.raises(ValueError):
+        MathChannel(text, NAMES)
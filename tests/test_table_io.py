@@ -0,0 +1,26 @@
+# tests/test_table_io.py - ida y vuelta de la tabla por CSV
+import numpy as np
+from utils.table_io import iter_csv_chunks, write_csv
+
+
+def test_csv_round_trip_with_several_text_cells(tmp_path):
+    nan = np.nan
+    columns = [np.array([nan, 2.5, nan]), np.array([1.0, nan, 3.0]), np.array([nan, 4.0, nan])]
+    strings = {(0, 0): "a,b", (0, 2): "hello, world", (1, 1): 'dice "hola"', (2, 0): "x"}
+    path = tmp_path / "tabla.csv"
+    assert write_csv(str(path), (["c1", "c2", "c3"], columns, strings))
+
+    (block, texts, _), = list(iter_csv_chunks(str(path)))
+    assert texts == strings
+    expected = np.column_stack(columns)
+    assert np.array_equal(np.isnan(block), np.isnan(expected))
+    assert np.allclose(block[~np.isnan(block)], expected[~np.isnan(expected)])
+
+
+def test_cancelled_csv_export_leaves_destination_untouched(tmp_path):
+    path = tmp_path / "tabla.csv"
+    path.write_text("anterior\n", encoding="utf-8")
+    snapshot = (["a"], [np.arange(10.0)], {})
+    assert not write_csv(str(path), snapshot, should_stop=lambda: True, chunk_rows=3)
+    assert path.read_text(encoding="utf-8") == "anterior\n"
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,110 @@
+# tests/test_trend_store.py - pirámide de tendencias: nivel elegido, agregados y anillo
+import math
+import warnings
+import numpy as np
+import pytest
+from utils.trend_store import TrendStore
+
+T0 = 1_000_000.0
+BLOCK = 0.1
+
+
+def _run(store, n_blocks, seed=0):
+    """Lecturas sintéticas; 'b' falta (None) en ~20% de los bloques y en un tramo entero."""
+    rng = np.random.default_rng(seed)
+    t = T0 + np.arange(n_blocks) * BLOCK
+    a = rng.normal(220.0, 5.0, n_blocks)
+    b = rng.normal(5.0, 1.0, n_blocks)
+    b[rng.random(n_blocks) < 0.2] = np.nan
+    b[300:420] = np.nan                   # 12 s sin lecturas de 'b'
+    for ti, ai, bi in zip(t, a, b):
+        store.add({"a": ai, "b": None if np.isnan(bi) else bi}, ti)
+    return t, np.column_stack([a, b])
+
+
+def _expected(t, x, period):
+    """mín/promedio/máx por intervalo cerrado, con NumPy sobre las lecturas crudas."""
+    bucket = np.floor(t / period)
+    out = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)     # intervalos sin lecturas de 'b'
+        for k in np.unique(bucket)[:-1]:                    # el último sigue abierto
+            rows = x[bucket == k]
+            out.append((k * period, np.nanmin(rows, axis=0), np.nanmean(rows, axis=0),
+                        np.nanmax(rows, axis=0)))
+    return out
+
+
+@pytest.fixture(scope="module")
+def run():
+    store = TrendStore(["a", "b"], block_period=BLOCK)
+    t, x = _run(store, 30 * 600)               # 30 min
+    return store, t, x
+
+
+@pytest.mark.parametrize("span, max_points, period", [
+    (60, 2000, None),        # bloques: 600 puntos y el anillo todavía los tiene
+    (1000, 2000, 1.0),       # en bloques serían 10000 puntos
+    (1000, 20000, 1.0),      # entrarían, pero el anillo de bloques ya perdió t0
+    (1800, 100, 60.0),       # 10 s daría 180 > 100
+])
+def test_query_picks_tier(run, span, max_points, period):
+    store, t, _ = run
+    last = store.last_time()
+    q = store.query(last - span, last, ["a"], max_points=max_points)
+    assert q["period"] == (period or BLOCK)
+    assert len(q["t"]) <= max_points + 3
+    assert q["t"][0] <= last - span + (period or BLOCK)
+
+
+@pytest.mark.parametrize("tier", [1, 2, 3])
+def test_rollups_match_numpy(run, tier):
+    store, t, x = run
+    period = store.tiers[tier].period
+    tt, lo, mean, hi = store.tiers[tier].series(partial=False)
+    expected = _expected(t, x, period)
+    assert len(tt) == len(expected)
+    for j, (et, elo, emean, ehi) in enumerate(expected):
+        assert tt[j] == pytest.approx(et)
+        np.testing.assert_allclose(lo[j], elo, equal_nan=True)
+        np.testing.assert_allclose(mean[j], emean, rtol=1e-12, equal_nan=True)
+        np.testing.assert_allclose(hi[j], ehi, equal_nan=True)
+    # el tramo sin 'b' queda vacío en el nivel de 1 s (no 0 ni un valor viejo)
+    if tier == 1:
+        gap = (tt >= t[300]) & (tt + period <= t[420])
+        assert gap.any() and np.isnan(mean[gap, 1]).all()
+
+
+def test_ring_wraparound():
+    store = TrendStore(["a", "b"], block_period=BLOCK, capacity=50)
+    t, x = _run(store, 2013)
+    tier0, tier1 = store.tiers[0], store.tiers[1]
+    assert tier0.size == 50 and tier0.head != 0
+
+    tt, lo, mean, hi = tier0.series()
+    np.testing.assert_allclose(tt, t[-50:])
+    np.testing.assert_allclose(mean, x[-50:], equal_nan=True)
+
+    # 3 s atrás: el anillo de bloques (5 s) todavía los tiene
+    last = store.last_time()
+    q = store.query(last - 3.0, last, ["b"], max_points=1000)
+    assert q["period"] == BLOCK
+    assert q["t"][0] <= last - 3.0              # más un punto antes de t0
+    shown = t >= q["t"][0] - 1e-6
+    np.testing.assert_allclose(q["t"], t[shown])
+    np.testing.assert_allclose(q["mean"][:, 0], x[shown, 1], equal_nan=True)
+
+    # 40 s atrás: el anillo de bloques (5 s) dio la vuelta, sale el de 1 s (50 s, también
+    # dio la vuelta pero todavía cubre t0)
+    q = store.query(last - 40.0, last, ["a"], max_points=1000)
+    assert q["period"] == 1.0
+    expected = [e for e in _expected(t, x, 1.0) if e[0] >= q["t"][0] - 1e-6]
+    assert len(expected) >= 40
+    np.testing.assert_allclose(q["t"][:len(expected)], [e[0] for e in expected])
+    np.testing.assert_allclose(q["mean"][:len(expected), 0], [e[2][0] for e in expected])
+    assert np.all(np.diff(q["t"]) > 0)
+
+    # 100 s atrás ya no lo cubre el de 1 s: pasa al de 10 s
+    q = store.query(last - 100.0, last, ["a"], max_points=1000)
+    assert q["period"] == 10.0
+    assert math.isfinite(tier1.oldest()) and tier1.oldest() > last - 100.0
@@ -0,0 +1,97 @@
+# utils/acquisition.py - disparo y modos de adquisición del osciloscopio
+# Promedio-N y Envolvente trabajan sobre barridos alineados al disparo con acumuladores
+# preasignados (suma, mínimo, máximo) que se actualizan in-place: la memoria es
+# O(largo del barrido) sin importar N y nunca se guarda una lista de barridos.
+import numpy as np
+
+MODES = ("normal", "average", "envelope")
+
+
+def find_trigger(sig, level, length, slope="rise"):
+    """
+    Primer cruce de 'level' (flanco ascendente o descendente) que deja al menos
+    'length' muestras hacia adelante. Devuelve el índice o None (sin disparo).
+    """
+    sig = np.asarray(sig, dtype=float)
+    last = len(sig) - int(length)
+    if last < 1:
+        return None
+    a = sig[:last]
+    b = sig[1:last + 1]
+    if slope == "rise":
+        hits = np.flatnonzero((a < level) & (b >= level))
+    else:
+        hits = np.flatnonzero((a > level) & (b <= level))
+    return int(hits[0]) + 1 if hits.size else None
+
+
+class SweepAccumulator:
+    """
+    Acumula barridos (canales x muestras) ya alineados.
+    - "average": suma corrida hasta N barridos, luego promedio exponencial de peso 1/N
+    - "envelope": mínimo y máximo de N barridos (al completar N vuelve a empezar)
+    """
+
+    def __init__(self, mode="normal", n=16):
+        self.mode = mode
+        self.n = n
+        self.reset()
+
+    def reset(self):
+        """Descarta lo acumulado (barato: los buffers se reasignan en el próximo barrido)."""
+        self.count = 0
+        self._shape = None
+        self.last = (None, None)
+
+    def set_mode(self, mode, n=None):
+        self.mode = mode
+        if n is not None:
+            self.n = max(1, int(n))
+        self.reset()
+
+    def _alloc(self, shape):
+        self._shape = shape
+        self._sum = np.zeros(shape)
+        self._avg = np.zeros(shape)
+        self._tmp = np.empty(shape)
+        self._min = np.empty(shape)
+        self._max = np.empty(shape)
+        self.count = 0
+
+    def add(self, sweeps):
+        """
+        Agrega un barrido. Devuelve (también queda en self.last):
+          average  -> (promedio, None)
+          envelope -> (máximo, mínimo)
+          normal   -> (sweeps, None)
+        """
+        x = np.asarray(sweeps, dtype=float)
+        if self.mode == "normal":
+            return x, None
+        if x.shape != self._shape:
+            self._alloc(x.shape)
+
+        if self.mode == "average":
+            if self.count < self.n:
+                self._sum += x
+                self.count += 1
+                np.divide(self._sum, self.count, out=self._avg)
+            else:
+                # avg += (x - avg) / N
+                np.subtract(x, self._avg, out=self._tmp)
+                self._tmp /= self.n
+                self._avg += self._tmp
+            self.last = (self._avg, None)
+            return self.last
+
+        # envelope
+        if self.count == 0 or self.count >= self.n:
+            self._min[...] = x
+            self._max[...] = x
+            self.count = 1
+        else:
+            np.minimum(self._min, x, out=self._min)
+            np.maximum(self._max, x, out=self._max)
+            self.count += 1
+        self.last = (self._max, self._min)
+        return self.last
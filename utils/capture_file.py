@@ -0,0 +1,272 @@
+# utils/capture_file.py - capturas largas en disco con pirámide de vista general
+# Una captura son tres archivos:
+#   nombre.lvc           muestras float32 (filas = muestras, columnas = canales)
+#   nombre.lvc.json      canales, fs y tipo de dato
+#   nombre.lvc.ovw.npz   pirámide mín/máx: nivel 0 = cada OVERVIEW_BASE muestras,
+#                        cada nivel siguiente junta OVERVIEW_STEP del anterior
+# El visor lee solo el nivel que corresponde al zoom o, de cerca, el tramo de muestras
+# visible (np.memmap: solo se tocan esas páginas del archivo).
+import json
+import os
+import numpy as np
+
+OVERVIEW_BASE = 256
+OVERVIEW_STEP = 8
+OVERVIEW_MIN = 1000         # el nivel más grueso queda con ~1000 intervalos
+SCAN_ROWS = 1 << 20         # muestras por tramo al armar la pirámide desde el archivo
+
+
+def meta_path(path):
+    return path + ".json"
+
+
+def overview_path(path):
+    return path + ".ovw.npz"
+
+
+def remove_capture(path):
+    """Borra los tres archivos de una captura (los que existan)."""
+    for name in (path, meta_path(path), overview_path(path)):
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
+
+
+def open_samples(path):
+    """(meta, muestras) de una captura; las muestras como np.memmap (filas x canales)."""
+    with open(meta_path(path), encoding="utf-8") as f:
+        meta = json.load(f)
+    n_keys = len(meta["keys"])
+    if os.path.getsize(path) == 0:
+        # np.memmap no acepta archivos vacíos
+        return meta, np.empty((0, n_keys), dtype=meta["dtype"])
+    return meta, np.memmap(path, dtype=meta["dtype"], mode="r").reshape(-1, n_keys)
+
+
+def _reduce_rows(block, base):
+    """Mín/máx de cada grupo de 'base' filas (el último grupo puede ser parcial)."""
+    starts = np.arange(0, len(block), base)
+    return np.fmin.reduceat(block, starts, axis=0), np.fmax.reduceat(block, starts, axis=0)
+
+
+def _write_overview(path, lo0, hi0, n_samples):
+    levels = {"lo0": lo0, "hi0": hi0}
+    lo, hi, k = lo0, hi0, 0
+    while len(lo) > OVERVIEW_MIN * OVERVIEW_STEP:
+        starts = np.arange(0, len(lo), OVERVIEW_STEP)
+        lo = np.fmin.reduceat(lo, starts, axis=0)
+        hi = np.fmax.reduceat(hi, starts, axis=0)
+        k += 1
+        levels[f"lo{k}"], levels[f"hi{k}"] = lo, hi
+    np.savez(overview_path(path), n_samples=np.int64(n_samples), base=np.int64(OVERVIEW_BASE),
+             step=np.int64(OVERVIEW_STEP), **levels)
+
+
+class CaptureWriter:
+    """
+    Escribe una captura bloque a bloque. La pirámide se arma mientras se graba
+    (nivel 0 en memoria: ~16 KB por minuto a 2 kHz x 8 canales) y se guarda en close().
+    """
+
+    def __init__(self, path, keys, fs):
+        self.path = path
+        self.keys = list(keys)
+        self.fs = fs
+        self.n_samples = 0
+        with open(meta_path(path), "w", encoding="utf-8") as f:
+            json.dump({"keys": self.keys, "fs": fs, "dtype": "float32"}, f)
+        self._file = open(path, "wb")
+        self._tail = np.empty((0, len(self.keys)), dtype=np.float32)
+        self._lo, self._hi = [], []
+
+    def append(self, data):
+        """data: {clave: array} de un bloque (las claves que falten quedan en NaN)."""
+        n = next((len(data[k]) for k in self.keys if k in data), 0)
+        if n == 0:
+            return
+        block = np.full((n, len(self.keys)), np.nan, dtype=np.float32)
+        for j, key in enumerate(self.keys):
+            if key in data:
+                block[:, j] = data[key]
+        self._file.write(block.tobytes())
+        self.n_samples += n
+
+        buf = np.concatenate([self._tail, block]) if len(self._tail) else block
+        m = len(buf) // OVERVIEW_BASE * OVERVIEW_BASE
+        if m:
+            lo, hi = _reduce_rows(buf[:m], OVERVIEW_BASE)
+            self._lo.append(lo)
+            self._hi.append(hi)
+        self._tail = buf[m:]
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        if len(self._tail):
+            lo, hi = _reduce_rows(self._tail, OVERVIEW_BASE)
+            self._lo.append(lo)
+            self._hi.append(hi)
+        empty = np.empty((0, len(self.keys)), dtype=np.float32)
+        lo = np.concatenate(self._lo) if self._lo else empty
+        hi = np.concatenate(self._hi) if self._hi else empty
+        _write_overview(self.path, lo, hi, self.n_samples)
+
+    def discard(self):
+        """Cierra sin guardar la pirámide y borra lo escrito (captura incompleta)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        remove_capture(self.path)
+
+
+def build_overview(path, progress=None, should_stop=None):
+    """Arma la pirámide de una captura que no la tiene (recorre el archivo por tramos)."""
+    _, raw = open_samples(path)
+    los, his = [], []
+    for r0 in range(0, len(raw), SCAN_ROWS):
+        if should_stop and should_stop():
+            return False
+        lo, hi = _reduce_rows(np.asarray(raw[r0:r0 + SCAN_ROWS]), OVERVIEW_BASE)
+        los.append(lo)
+        his.append(hi)
+        if progress:
+            progress(min((r0 + SCAN_ROWS) / len(raw), 1.0))
+    empty = np.empty((0, raw.shape[1]), dtype=np.float32)
+    _write_overview(path, np.concatenate(los) if los else empty,
+                    np.concatenate(his) if his else empty, len(raw))
+    return True
+
+
+def estimate_fs(t, default=2000.0):
+    """fs a partir de la columna 't' de save_to_csv (el tiempo vuelve a 0 en cada bloque)."""
+    dt = np.diff(np.asarray(t, dtype=float))
+    dt = dt[dt > 0]
+    return float(round(1.0 / np.median(dt))) if len(dt) else default
+
+
+def csv_to_capture(csv_path, path, progress=None, should_stop=None):
+    """
+    Convierte un CSV de DAQReader.save_to_csv (columna 't' por bloque + canales) en
+    captura. fs sale del paso de 't' dentro de los bloques. Si se corta o falla se
+    borra lo escrito: una captura a medias no debe pasar por completa.
+    """
+    from utils.table_io import iter_csv_chunks, sniff_csv
+
+    info = sniff_csv(csv_path)
+    headers = info["headers"] or [f"Col {c}" for c in range(info["n_cols"])]
+    t_col = headers.index("t") if "t" in headers else None
+    keys = [h for c, h in enumerate(headers) if c != t_col]
+    writer = None
+    done = False
+    try:
+        for block, _, fraction in iter_csv_chunks(csv_path, info):
+            if should_stop and should_stop():
+                return False
+            if writer is None:
+                fs = estimate_fs(block[:, t_col]) if t_col is not None else 2000.0
+                writer = CaptureWriter(path, keys, fs)
+            writer.append({k: block[:, c] for c, k in enumerate(headers) if c != t_col})
+            if progress:
+                progress(fraction)
+        done = True
+    finally:
+        if writer is not None:
+            if done:
+                writer.close()
+            else:
+                writer.discard()
+    return writer is not None
+
+
+class CaptureReader:
+    """Acceso de solo lectura a una captura: vista general + tramos de muestras."""
+
+    def __init__(self, path):
+        self.path = path
+        meta, self.raw = open_samples(path)
+        self.keys = meta["keys"]
+        self.fs = float(meta["fs"])
+        with np.load(overview_path(path)) as ovw:
+            self.base = int(ovw["base"])
+            self.step = int(ovw["step"])
+            self.levels = []
+            k = 0
+            while f"lo{k}" in ovw:
+                self.levels.append((ovw[f"lo{k}"], ovw[f"hi{k}"]))
+                k += 1
+
+    @property
+    def n_samples(self):
+        return len(self.raw)
+
+    @property
+    def duration(self):
+        return self.n_samples / self.fs
+
+    @staticmethod
+    def has_overview(path):
+        """True si la pirámide existe y corresponde al archivo de muestras actual."""
+        try:
+            with np.load(overview_path(path)) as ovw:
+                n = int(ovw["n_samples"])
+            with open(meta_path(path), encoding="utf-8") as f:
+                width = len(json.load(f)["keys"])
+            itemsize = 4
+            return n * width * itemsize == os.path.getsize(path)
+        except (OSError, KeyError, ValueError):
+            return False
+
+    def overall_range(self, cols):
+        """(mín, máx) de los canales 'cols' en toda la captura (nivel más grueso)."""
+        if not self.levels or not len(self.levels[-1][0]):
+            return None
+        lo, hi = self.levels[-1]
+        with np.errstate(invalid="ignore"):
+            vmin, vmax = np.nanmin(lo[:, cols]), np.nanmax(hi[:, cols])
+        return (float(vmin), float(vmax)) if np.isfinite(vmin) and np.isfinite(vmax) else None
+
+    def window(self, t0, t1, cols, max_points):
+        """
+        Datos para dibujar [t0, t1] s en 'max_points' píxeles. Devuelve (x en s, y)
+        con y de forma (n, len(cols)): muestras crudas si entran, si no pares mín/máx
+        intercalados tomados del nivel más grueso que todavía da >= max_points intervalos.
+        """
+        i0 = max(int(t0 * self.fs) - 1, 0)
+        i1 = min(int(np.ceil(t1 * self.fs)) + 2, self.n_samples)
+        if i1 <= i0:
+            return np.empty(0), np.empty((0, len(cols)))
+        n = i1 - i0
+        max_points = max(int(max_points), 1)
+
+        if n <= 2 * max_points:
+            x = np.arange(i0, i1) / self.fs
+            return x, np.asarray(self.raw[i0:i1, cols], dtype=float)
+
+        # nivel: factor de muestras por intervalo de cada nivel
+        factor, level = 1, None
+        for k in range(len(self.levels)):
+            f = self.base * self.step ** k
+            if n / f < max_points:
+                break
+            factor, level = f, k
+
+        if level is None:
+            # de cerca: tramo crudo reducido a mín/máx por píxel
+            block = np.asarray(self.raw[i0:i1, cols], dtype=float)
+            per = int(np.ceil(n / max_points))
+            lo, hi = _reduce_rows(block, per)
+            starts = i0 + np.arange(0, n, per)
+        else:
+            j0, j1 = i0 // factor, -(-i1 // factor)
+            lo = self.levels[level][0][j0:j1, cols]
+            hi = self.levels[level][1][j0:j1, cols]
+            starts = np.arange(j0, j0 + len(lo)) * factor
+
+        x = np.repeat(starts / self.fs, 2)
+        y = np.empty((2 * len(lo), len(cols)))
+        y[0::2] = lo
+        y[1::2] = hi
+        return x, y
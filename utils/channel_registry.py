@@ -0,0 +1,128 @@
+# utils/channel_registry.py - registro único de canales (entradas y magnitudes derivadas)
+# Se declara UNA vez y lo consultan DAQReader, el grabador, el osciloscopio, los
+# medidores y la tabla: nadie mantiene su propio mapa "E1" -> "Va".
+# Agregar un canal = agregar una línea en DEFAULT_CHANNELS.
+import math
+
+
+class ChannelDef:
+    """
+    Definición de un canal.
+    label   : nombre en pantalla / selector del osciloscopio ("E1", "EA-3")
+    key     : clave en el bloque de datos del DAQ ("Va", "ea3")
+    unit    : unidad base
+    kind    : "voltage", "current", "power", "torque", "speed" (define escalas y modos)
+    source  : "daq" (se adquiere) o "derived" (se calcula a partir de otros canales)
+    reading : lectura del medidor: "rms" o "mean"
+    meter   : título en el panel de medidores (None = sin medidor)
+    enabled : canal habilitado (si no, no se adquiere ni se procesa)
+    inputs  : (derivados) claves que se multiplican muestra a muestra
+    gain    : (derivados) factor constante del producto
+    """
+
+    def __init__(self, label, key, unit, kind, source="daq", reading="rms",
+                 meter=None, enabled=True, inputs=(), gain=1.0):
+        self.label = label
+        self.key = key
+        self.unit = unit
+        self.kind = kind
+        self.source = source
+        self.reading = reading
+        self.meter = meter if meter is not None else label
+        self.enabled = enabled
+        self.inputs = tuple(inputs)
+        self.gain = gain
+
+    def __repr__(self):
+        return f"ChannelDef({self.label!r}, {self.key!r}, enabled={self.enabled})"
+
+
+# el orden es el del panel de medidores (filas de 4)
+DEFAULT_CHANNELS = [
+    ChannelDef("E1", "Va", "V", "voltage"),
+    ChannelDef("E2", "Vb", "V", "voltage"),
+    ChannelDef("E3", "Vc", "V", "voltage"),
+    ChannelDef("T", "torque", "N.m", "torque", reading="mean"),
+    ChannelDef("I1", "Ia", "A", "current"),
+    ChannelDef("I2", "Ib", "A", "current"),
+    ChannelDef("I3", "Ic", "A", "current"),
+    ChannelDef("N", "speed", "r/min", "speed", reading="mean"),
+    # potencias instantáneas (su promedio es la potencia activa)
+    ChannelDef("P1", "pqs1", "W", "power", source="derived", reading="mean", meter="PQS1",
+               inputs=("Va", "Ia")),
+    ChannelDef("P2", "pqs2", "W", "power", source="derived", reading="mean", meter="PQS2",
+               inputs=("Vb", "Ib")),
+    ChannelDef("P3", "pqs3", "W", "power", source="derived", reading="mean", meter="PQS3",
+               inputs=("Vc", "Ic")),
+    # potencia mecánica: T [N.m] * N [r/min] * 2π/60
+    ChannelDef("Pm", "pm", "W", "power", source="derived", reading="mean",
+               inputs=("torque", "speed"), gain=2 * math.pi / 60),
+] + [
+    # entradas analógicas auxiliares (deshabilitadas hasta que se conecten)
+    ChannelDef(f"EA-{i}", f"ea{i}", "V", "voltage", enabled=False)
+    for i in range(1, 9)
+]
+
+
+class ChannelRegistry:
+    """Registro compartido con habilitación por canal y avisos de cambio."""
+
+    def __init__(self, channels):
+        self._channels = list(channels)
+        self._by_label = {ch.label: ch for ch in self._channels}
+        self._by_key = {ch.key: ch for ch in self._channels}
+        self._listeners = []
+
+    def __iter__(self):
+        return iter(self._channels)
+
+    def __len__(self):
+        return len(self._channels)
+
+    def get(self, label):
+        return self._by_label.get(label)
+
+    def by_key(self, key):
+        return self._by_key.get(key)
+
+    def key_for(self, label):
+        ch = self._by_label.get(label)
+        return ch.key if ch else None
+
+    def enabled(self, source=None):
+        """Canales habilitados (opcionalmente solo 'daq' o 'derived')."""
+        return [ch for ch in self._channels
+                if ch.enabled and (source is None or ch.source == source)]
+
+    def acquired_keys(self):
+        """Claves que el DAQ debe leer (entradas habilitadas)."""
+        return [ch.key for ch in self.enabled("daq")]
+
+    def scope_map(self):
+        """Selector del osciloscopio -> clave de datos (solo habilitados)."""
+        return {ch.label: ch.key for ch in self.enabled()}
+
+    def meter_defs(self):
+        """(título, clave, unidad) de todos los medidores, en orden de panel."""
+        return [(ch.meter, ch.key, ch.unit) for ch in self._channels if ch.meter]
+
+    # ---------- habilitación ----------
+    def set_enabled(self, label, enabled=True):
+        ch = self._by_label.get(label)
+        if ch is None or ch.enabled == bool(enabled):
+            return
+        ch.enabled = bool(enabled)
+        for callback in list(self._listeners):
+            callback()
+
+    def add_listener(self, callback):
+        """callback() se llama cuando cambia la habilitación de algún canal."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+
+# instancia compartida por toda la aplicación
+REGISTRY = ChannelRegistry(DEFAULT_CHANNELS)
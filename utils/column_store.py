@@ -0,0 +1,238 @@
+# utils/column_store.py - almacenamiento por columnas de la tabla de datos
+# Cada columna es un array float64 con capacidad de reserva (crece por duplicación);
+# una celda vacía es NaN. Los textos no numéricos (rótulos, notas) van en un
+# diccionario aparte {(fila, col): texto}, así la memoria es proporcional a los datos
+# y no a la cantidad de celdas que alguna vez se mostraron.
+import itertools
+import numpy as np
+
+_MIN_CAPACITY = 64
+# versión global: cambia con cada modificación de cualquier tabla (sirve de clave de cache);
+# cada columna guarda además la versión de su último cambio (col_versions)
+_VERSIONS = itertools.count(1)
+
+
+def parse_cell(text):
+    """Texto de una celda -> (número o NaN, texto no numérico o None)."""
+    text = text.strip()
+    if not text:
+        return np.nan, None
+    try:
+        return float(text), None
+    except ValueError:
+        pass
+    # coma decimal (planillas en castellano)
+    if text.count(",") == 1 and "." not in text:
+        try:
+            return float(text.replace(",", ".")), None
+        except ValueError:
+            pass
+    return np.nan, text
+
+
+def format_number(value):
+    """Formato de celda numérica (vacío si es NaN)."""
+    if value != value:
+        return ""
+    return f"{value:.10g}"
+
+
+class ColumnStore:
+    """Matriz de datos por columnas con filas/columnas que crecen según se necesite."""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.n_rows = 0
+        self._capacity = _MIN_CAPACITY
+        self.columns = []          # arrays float64 de largo _capacity
+        self.headers = []
+        self.strings = {}          # (fila, col) -> texto
+        self.col_versions = []     # versión del último cambio de cada columna
+        self._touch()
+
+    def _touch(self, cols=None):
+        """Marca el contenido como modificado (ver 'version'); cols: columnas tocadas (None = todas)."""
+        self.version = next(_VERSIONS)
+        for c in range(len(self.col_versions)) if cols is None else cols:
+            if c < len(self.col_versions):
+                self.col_versions[c] = self.version
+
+    def column_version(self, c):
+        """Versión del último cambio de la columna c (cambia también si cambian las filas)."""
+        return self.col_versions[c]
+
+    @property
+    def n_cols(self):
+        return len(self.columns)
+
+    # ---------- forma ----------
+    def _reserve(self, rows):
+        if rows <= self._capacity:
+            return
+        cap = self._capacity
+        while cap < rows:
+            cap *= 2
+        for i, col in enumerate(self.columns):
+            grown = np.full(cap, np.nan)
+            grown[:self.n_rows] = col[:self.n_rows]
+            self.columns[i] = grown
+        self._capacity = cap
+
+    def ensure_shape(self, rows, cols):
+        """Agranda la tabla para tener al menos rows x cols (celdas nuevas vacías)."""
+        # más filas cambian todas las columnas; si no, solo cuentan las nuevas
+        self._touch(None if rows > self.n_rows else ())
+        self._reserve(rows)
+        while len(self.columns) < cols:
+            self.columns.append(np.full(self._capacity, np.nan))
+            self.headers.append("")
+            self.col_versions.append(self.version)
+        self.n_rows = max(self.n_rows, rows)
+
+    def set_headers(self, headers):
+        self.ensure_shape(self.n_rows, len(headers))
+        for i, h in enumerate(headers):
+            self.headers[i] = str(h)
+
+    # ---------- lectura ----------
+    def column(self, c):
+        """Vista de la columna c (solo las filas usadas)."""
+        return self.columns[c][:self.n_rows]
+
+    def value(self, r, c):
+        if r >= self.n_rows or c >= self.n_cols:
+            return np.nan
+        return self.columns[c][r]
+
+    def text(self, r, c):
+        s = self.strings.get((r, c))
+        if s is not None:
+            return s
+        return format_number(self.value(r, c))
+
+    def snapshot(self):
+        """Copia (encabezados, columnas, textos) para exportar desde otro hilo."""
+        return (list(self.headers),
+                [col[:self.n_rows].copy() for col in self.columns],
+                dict(self.strings))
+
+    def text_block(self, r0, c0, r1, c1):
+        """Rango [r0..r1] x [c0..c1] como texto separado por tabs (copiar al portapapeles)."""
+        r1 = min(r1, self.n_rows - 1)
+        if r1 < r0:
+            return ""
+        cols = []
+        for c in range(c0, c1 + 1):
+            if c < self.n_cols:
+                cols.append([format_number(v) for v in self.columns[c][r0:r1 + 1].tolist()])
+            else:
+                cols.append([""] * (r1 - r0 + 1))
+        for (r, c), s in self.strings.items():
+            if r0 <= r <= r1 and c0 <= c <= c1:
+                cols[c - c0][r - r0] = s
+        return "".join("\t".join(row) + "\n" for row in zip(*cols))
+
+    @classmethod
+    def from_columns(cls, headers, columns, strings=None):
+        store = cls()
+        n = len(columns[0]) if columns else 0
+        store.ensure_shape(n, len(columns))
+        for i, col in enumerate(columns):
+            store.columns[i][:n] = col
+        store.set_headers(headers)
+        store.strings = dict(strings or {})
+        store._touch()
+        return store
+
+    # ---------- escritura ----------
+    def set_text(self, r, c, text):
+        """Escribe una celda desde texto (número -> columna, si no -> textos)."""
+        self.ensure_shape(r + 1, c + 1)
+        self._touch((c,))
+        value, string = parse_cell(text)
+        self.columns[c][r] = value
+        if string is None:
+            self.strings.pop((r, c), None)
+        else:
+            self.strings[(r, c)] = string
+
+    def _drop_strings(self, r0, c0, r1, c1):
+        if self.strings:
+            self.strings = {(r, c): s for (r, c), s in self.strings.items()
+                            if not (r0 <= r <= r1 and c0 <= c <= c1)}
+
+    def set_block(self, r0, c0, rows):
+        """
+        Escribe un bloque de textos (lista de filas, p. ej. pegado desde una planilla)
+        a partir de (r0, c0); la tabla crece lo necesario. Cada columna se convierte
+        de una vez y solo si falla se analiza celda por celda.
+        """
+        n_rows = len(rows)
+        n_cols = max((len(row) for row in rows), default=0)
+        if not n_rows or not n_cols:
+            return
+        self.ensure_shape(r0 + n_rows, c0 + n_cols)
+        self._touch(range(c0, c0 + n_cols))
+        self._drop_strings(r0, c0, r0 + n_rows - 1, c0 + n_cols - 1)
+        for j in range(n_cols):
+            texts = [row[j] if j < len(row) else "" for row in rows]
+            target = self.columns[c0 + j]
+            try:
+                target[r0:r0 + n_rows] = np.array(texts, dtype=float)
+                continue
+            except ValueError:
+                pass
+            for i, text in enumerate(texts):
+                value, string = parse_cell(text)
+                target[r0 + i] = value
+                if string is not None:
+                    self.strings[(r0 + i, c0 + j)] = string
+
+    def clear_range(self, r0, c0, r1, c1):
+        """Vacía las celdas del rango (incluidos los textos)."""
+        self._touch(range(c0, c1 + 1))
+        r1 = min(r1, self.n_rows - 1)
+        for c in range(c0, min(c1, self.n_cols - 1) + 1):
+            self.columns[c][r0:r1 + 1] = np.nan
+        self._drop_strings(r0, c0, r1, c1)
+
+    def append_rows(self, block):
+        """Agrega filas al final. block: matriz (filas x columnas) numérica."""
+        self._touch()
+        block = np.atleast_2d(np.asarray(block, dtype=float))
+        r0 = self.n_rows
+        self.ensure_shape(r0 + block.shape[0], block.shape[1])
+        for c in range(block.shape[1]):
+            self.columns[c][r0:r0 + block.shape[0]] = block[:, c]
+        return r0
+
+    def insert_rows(self, at, count=1):
+        """Inserta 'count' filas vacías antes de la fila 'at'."""
+        self._touch()
+        at = min(max(at, 0), self.n_rows)
+        n = self.n_rows
+        self._reserve(n + count)
+        for col in self.columns:
+            col[at + count:n + count] = col[at:n]
+            col[at:at + count] = np.nan
+        self.n_rows = n + count
+        self.strings = {(r + count if r >= at else r, c): s for (r, c), s in self.strings.items()}
+
+    def remove_rows(self, at, count=1):
+        """Elimina 'count' filas a partir de 'at'."""
+        self._touch()
+        if at < 0 or at >= self.n_rows:
+            return
+        count = min(count, self.n_rows - at)
+        n = self.n_rows
+        for col in self.columns:
+            col[at:n - count] = col[at + count:n]
+            col[n - count:n] = np.nan
+        self.n_rows = n - count
+        self.strings = {
+            (r - count if r >= at + count else r, c): s
+            for (r, c), s in self.strings.items()
+            if not at <= r < at + count
+        }
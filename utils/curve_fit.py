@@ -0,0 +1,96 @@
+# utils/curve_fit.py - curvas características (par-velocidad, V-I, ...) a partir de la tabla
+# Los puntos registrados son ruidosos y pueden ser decenas de miles: se promedian por
+# intervalos de X (np.bincount, sin lazos) y se ajusta un polinomio (mínimos cuadrados
+# sobre todos los puntos) o una spline cúbica natural por los promedios.
+import numpy as np
+
+# método -> texto en el gráfico
+METHODS = {
+    "none": "Sin ajuste",
+    "poly": "Polinomio",
+    "spline": "Spline (promedios)",
+}
+
+SPLINE_BINS = 20      # intervalos por defecto para la spline si no se eligieron
+GRID_POINTS = 400     # puntos de la curva ajustada
+
+
+def bin_average(x, y, n_bins):
+    """
+    Promedio de (x, y) en 'n_bins' intervalos iguales de X.
+    Devuelve (x medio, y medio, cantidad) solo de los intervalos con puntos.
+    """
+    lo, hi = x.min(), x.max()
+    if hi <= lo:
+        return np.array([lo]), np.array([y.mean()]), np.array([len(y)])
+    idx = np.minimum(((x - lo) * (n_bins / (hi - lo))).astype(np.int64), n_bins - 1)
+    count = np.bincount(idx, minlength=n_bins)
+    sx = np.bincount(idx, weights=x, minlength=n_bins)
+    sy = np.bincount(idx, weights=y, minlength=n_bins)
+    ok = count > 0
+    return sx[ok] / count[ok], sy[ok] / count[ok], count[ok]
+
+
+def natural_spline(xk, yk, x):
+    """Spline cúbica natural por los nodos (xk creciente) evaluada en x."""
+    n = len(xk)
+    if n < 3:
+        return np.interp(x, xk, yk)
+    h = np.diff(xk)
+    # segundas derivadas en los nodos interiores (M0 = Mn = 0)
+    A = np.zeros((n - 2, n - 2))
+    i = np.arange(n - 2)
+    A[i, i] = 2 * (h[:-1] + h[1:])
+    A[i[1:], i[1:] - 1] = h[1:-1]
+    A[i[:-1], i[:-1] + 1] = h[1:-1]
+    slope = np.diff(yk) / h
+    M = np.zeros(n)
+    M[1:-1] = np.linalg.solve(A, 6 * np.diff(slope))
+
+    k = np.clip(np.searchsorted(xk, x) - 1, 0, n - 2)
+    t0 = x - xk[k]
+    t1 = xk[k + 1] - x
+    hk = h[k]
+    return (M[k] * t1 ** 3 + M[k + 1] * t0 ** 3) / (6 * hk) \
+        + (yk[k] / hk - M[k] * hk / 6) * t1 + (yk[k + 1] / hk - M[k + 1] * hk / 6) * t0
+
+
+def fit_curve(x, y, method="poly", degree=2, bins=0):
+    """
+    Ajuste de la curva y(x). Devuelve dict:
+      bins  : (x, y) de los promedios por intervalo o None
+      curve : (x, y) de la curva ajustada o None
+      label : texto para la leyenda (con R² del ajuste sobre todos los puntos)
+    """
+    ok = np.isfinite(x) & np.isfinite(y)
+    x, y = x[ok], y[ok]
+    out = {"bins": None, "curve": None, "label": ""}
+    if len(x) < 2:
+        return out
+
+    if method == "spline" and not bins:
+        bins = SPLINE_BINS
+    if bins:
+        xb, yb, _ = bin_average(x, y, bins)
+        out["bins"] = (xb, yb)
+
+    grid = np.linspace(x.min(), x.max(), GRID_POINTS)
+    if method == "poly":
+        degree = min(degree, len(np.unique(x)) - 1)
+        poly = np.polynomial.Polynomial.fit(x, y, degree)
+        out["curve"] = (grid, poly(grid))
+        fitted = poly(x)
+        out["label"] = f"grado {degree}"
+    elif method == "spline" and out["bins"] is not None:
+        xb, yb = out["bins"]
+        out["curve"] = (grid, natural_spline(xb, yb, grid))
+        fitted = natural_spline(xb, yb, x)
+        out["label"] = f"spline {len(xb)} nodos"
+    else:
+        return out
+
+    ss_res = np.sum((y - fitted) ** 2)
+    ss_tot = np.sum((y - y.mean()) ** 2)
+    if ss_tot > 0:
+        out["label"] += f", R²={1 - ss_res / ss_tot:.4f}"
+    return out
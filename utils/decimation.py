@@ -0,0 +1,73 @@
+# utils/decimation.py - reducción de series largas a resolución de pantalla
+# Una serie de un millón de puntos en un gráfico de 800 px no necesita más de
+# ~2 puntos por píxel: se recorta primero al rango visible (con los datos completos)
+# y después se reduce con min/máx por píxel (conserva picos) o LTTB (conserva forma).
+import numpy as np
+
+METHODS = {
+    "minmax": "Mín/máx por píxel",
+    "lttb": "LTTB",
+}
+
+
+def is_monotonic(x):
+    """True si x no decrece (sirve searchsorted para recortar)."""
+    return len(x) < 2 or bool(np.all(x[1:] >= x[:-1]))
+
+
+def visible_range(x, x0, x1, monotonic=True):
+    """
+    Índices de las muestras dentro de [x0, x1] más una de cada lado (para que el
+    trazo llegue hasta el borde). Devuelve slice si x es monótona, si no una máscara.
+    """
+    if monotonic:
+        i0 = max(int(np.searchsorted(x, x0, side="left")) - 1, 0)
+        i1 = min(int(np.searchsorted(x, x1, side="right")) + 1, len(x))
+        return slice(i0, i1)
+    return (x >= x0) & (x <= x1)
+
+
+def minmax(x, y, n_bins):
+    """
+    Mínimo y máximo de cada uno de 'n_bins' tramos consecutivos (por índice): cada
+    tramo queda como un segmento vertical, así no se pierde ningún pico.
+    """
+    n = len(y)
+    if n_bins < 1 or n <= 2 * n_bins:
+        return x, y
+    starts = (np.arange(n_bins) * n) // n_bins
+    xs = np.repeat(x[starts], 2)
+    ys = np.empty(2 * n_bins)
+    ys[0::2] = np.minimum.reduceat(y, starts)
+    ys[1::2] = np.maximum.reduceat(y, starts)
+    return xs, ys
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: elige 'n_out' puntos que conservan la forma."""
+    n = len(y)
+    if n_out < 3 or n <= n_out:
+        return x, y
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        s, e = edges[i], max(edges[i + 1], edges[i] + 1)
+        # promedio del tramo siguiente (el último punto para el último tramo)
+        if i + 2 < len(edges):
+            nx, ny = x[e:edges[i + 2]].mean(), y[e:edges[i + 2]].mean()
+        else:
+            nx, ny = x[-1], y[-1]
+        area = np.abs((x[a] - nx) * (y[s:e] - y[a]) - (x[a] - x[s:e]) * (ny - y[a]))
+        a = s + int(np.argmax(area))
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+
+def decimate(x, y, width, method="minmax"):
+    """Reduce (x, y) para dibujar en 'width' píxeles."""
+    width = max(int(width), 1)
+    if method == "lttb":
+        return lttb(x, y, 2 * width)
+    return minmax(x, y, width)
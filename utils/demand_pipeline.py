@@ -0,0 +1,90 @@
+# utils/demand_pipeline.py - procesamiento por demanda de los bloques del DAQ
+# Cada vista declara qué necesita (formas de onda, lecturas de medidor, fasores) y el
+# pipeline calcula solo la unión de esas demandas: una vista oculta o un canal que
+# nadie mira no cuestan nada por bloque.
+import numpy as np
+from utils.channel_registry import REGISTRY
+from utils import signal_engine
+
+
+class DemandPipeline:
+    """
+    set_demand(vista, waves=..., readings=..., phasors=...) con claves de datos.
+    process(data) devuelve dict:
+      "signals"  : {clave: array} (entradas y derivados pedidos, más "t")
+      "readings" : {clave: valor} (rms o promedio según el registro)
+      "phasors"  : {clave: (rms, fase, frecuencia)}
+    """
+
+    def __init__(self, fs, registry=REGISTRY):
+        self.fs = fs
+        self.registry = registry
+        self._demands = {}
+        self._union = (frozenset(), frozenset(), frozenset())
+
+    def set_demand(self, view, waves=(), readings=(), phasors=()):
+        self._demands[view] = (frozenset(waves), frozenset(readings), frozenset(phasors))
+        self._update_union()
+
+    def clear_demand(self, view):
+        if self._demands.pop(view, None) is not None:
+            self._update_union()
+
+    def _update_union(self):
+        waves, reads, phs = set(), set(), set()
+        for w, r, p in self._demands.values():
+            waves |= w
+            reads |= r
+            phs |= p
+        self._union = (frozenset(waves), frozenset(reads), frozenset(phs))
+
+    def needed_keys(self):
+        """Claves que hay que tener como señal (pedidas + entradas de derivados)."""
+        waves, reads, phs = self._union
+        return waves | reads | phs
+
+    def _signal(self, key, data, signals):
+        """Señal de 'key' (del bloque o derivada); se calcula una vez por bloque."""
+        if key in signals:
+            return signals[key]
+        sig = data.get(key)
+        ch = self.registry.by_key(key)
+        if ch is not None and not ch.enabled:
+            sig = None
+        elif sig is None and ch is not None and ch.source == "derived":
+            sig = signal_engine.derive(ch, data)
+        signals[key] = sig
+        return sig
+
+    def process(self, data):
+        waves, reads, phs = self._union
+        signals = {}
+        for key in self.needed_keys():
+            self._signal(key, data, signals)
+
+        out_signals = {k: signals[k] for k in waves if signals.get(k) is not None}
+        if "t" in data:
+            out_signals["t"] = data["t"]
+
+        # lecturas: una sola pasada sobre la matriz de canales pedidos
+        read_keys = [k for k in reads if signals.get(k) is not None]
+        readings = {k: None for k in reads}
+        if read_keys:
+            modes = [self._reading_mode(k) for k in read_keys]
+            values = signal_engine.readings(np.vstack([signals[k] for k in read_keys]), modes)
+            readings.update(zip(read_keys, values.tolist()))
+
+        ph_keys = [k for k in phs if signals.get(k) is not None]
+        phasors = {}
+        if ph_keys:
+            rms, phase, freq = signal_engine.phasors(
+                np.vstack([signals[k] for k in ph_keys]), self.fs
+            )
+            for i, k in enumerate(ph_keys):
+                phasors[k] = (float(rms[i]), float(phase[i]), float(freq[i]))
+
+        return {"signals": out_signals, "readings": readings, "phasors": phasors}
+
+    def _reading_mode(self, key):
+        ch = self.registry.by_key(key)
+        return ch.reading if ch is not None else "rms"
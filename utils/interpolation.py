@@ -0,0 +1,58 @@
+# utils/interpolation.py - interpolación sin(x)/x (banda limitada) para el osciloscopio
+# Polifase con ventana de Lanczos: para cada factor de sobremuestreo L se arma una
+# tabla (L x taps) una sola vez y se reutiliza en todos los cuadros.
+import functools
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+HALF_TAPS = 8          # 16 coeficientes por fase
+MAX_RATIO = 64         # límite de sobremuestreo (evita tablas enormes)
+
+
+@functools.lru_cache(maxsize=32)
+def polyphase_table(ratio, half_taps=HALF_TAPS):
+    """Tabla (ratio, 2*half_taps) de coeficientes sinc con ventana Lanczos (solo lectura)."""
+    k = np.arange(-half_taps + 1, half_taps + 1)           # posiciones de las muestras vecinas
+    frac = np.arange(ratio) / ratio                        # fase fraccionaria de cada salida
+    d = frac[:, None] - k[None, :]                         # distancia salida -> muestra
+    table = np.sinc(d) * np.sinc(d / half_taps)
+    # ganancia unitaria en DC para cada fase
+    table /= table.sum(axis=1, keepdims=True)
+    table.setflags(write=False)
+    return table
+
+
+def ratio_for(samples_on_screen, width_px):
+    """Factor entero para llegar a ~1 punto por pixel (1 = no interpolar)."""
+    if samples_on_screen <= 0:
+        return 1
+    return int(min(MAX_RATIO, max(1, math.ceil(width_px / samples_on_screen))))
+
+
+def sinc_upsample(signal, i0, i1, ratio, half_taps=HALF_TAPS):
+    """
+    Sobremuestrea solo la ventana signal[i0:i1] por el factor 'ratio'.
+    Usa muestras fuera de la ventana como contexto del filtro (bordes replicados).
+    Devuelve (posiciones en muestras, valores) con len = (i1 - i0) * ratio.
+    """
+    sig = np.asarray(signal, dtype=float)
+    n = len(sig)
+    i0 = max(0, int(i0))
+    i1 = min(n, int(i1))
+    if i1 <= i0:
+        return np.empty(0), np.empty(0)
+
+    lo = i0 - half_taps + 1
+    hi = i1 + half_taps
+    seg = sig[max(0, lo):min(n, hi)]
+    pad_lo = max(0, -lo)
+    pad_hi = max(0, hi - n)
+    if pad_lo or pad_hi:
+        seg = np.pad(seg, (pad_lo, pad_hi), mode="edge")
+
+    # cada fila: las 2*half_taps muestras que rodean a una muestra de la ventana
+    windows = sliding_window_view(seg, 2 * half_taps)[:i1 - i0]
+    values = (windows @ polyphase_table(ratio, half_taps).T).ravel()
+    positions = i0 + np.arange(values.size) / ratio
+    return positions, values
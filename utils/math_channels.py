@@ -0,0 +1,142 @@
+# utils/math_channels.py - canales matemáticos del osciloscopio (E1*I1, E1-E2, integ(T), deriv(N))
+# La expresión se compila UNA vez a una lista de operaciones NumPy con buffers
+# preasignados; en cada bloque solo se ejecutan los ufuncs (con out=), sin parsear nada.
+import ast
+import numpy as np
+
+# operadores permitidos -> ufunc
+_BINOPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+    ast.Pow: np.power,
+}
+_UNARY = {
+    ast.USub: np.negative,
+    ast.UAdd: np.positive,
+}
+# funciones con estado entre bloques
+_FUNCS = ("integ", "deriv")
+
+# símbolos que los usuarios copian de la documentación LabVolt
+_SYMBOLS = {"×": "*", "·": "*", "−": "-", "÷": "/", "^": "**"}
+
+
+def _normalize(text):
+    for sym, op in _SYMBOLS.items():
+        text = text.replace(sym, op)
+    return text.strip()
+
+
+class MathChannel:
+    """
+    Canal matemático compilado. 'names' son las entradas válidas (E1, I1, T, N...).
+    evaluate(block, rows, dt) usa la matriz compartida del bloque (entradas x muestras)
+    y devuelve un buffer propio que se reutiliza en cada bloque.
+    """
+
+    def __init__(self, text, names):
+        self.text = text
+        self._names = set(names)
+        self.inputs = []          # entradas usadas (en orden de aparición)
+        self._ops = []            # (operación, operando a, operando b, slot destino)
+        self._n_slots = 0
+        self._buffers = []
+        self._state = {}
+
+        try:
+            tree = ast.parse(_normalize(text), mode="eval")
+        except SyntaxError:
+            raise ValueError(f"Expresión inválida: {text}")
+        result = self._compile(tree.body)
+        if result[0] != "slot":
+            # el resultado siempre vive en un buffer propio
+            result = self._emit("copy", result, None)
+        self._result = result[1]
+
+    # ---------- compilación ----------
+    def _emit(self, op, a, b):
+        slot = self._n_slots
+        self._n_slots += 1
+        self._ops.append((op, a, b, slot))
+        return ("slot", slot)
+
+    def _compile(self, node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return ("const", float(node.value))
+
+        if isinstance(node, ast.Name):
+            if node.id not in self._names:
+                raise ValueError(f"Canal desconocido: {node.id}")
+            if node.id not in self.inputs:
+                self.inputs.append(node.id)
+            return ("row", node.id)
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINOPS:
+            a = self._compile(node.left)
+            b = self._compile(node.right)
+            if a[0] == "const" and b[0] == "const":
+                return ("const", float(_BINOPS[type(node.op)](a[1], b[1])))
+            return self._emit(_BINOPS[type(node.op)], a, b)
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY:
+            a = self._compile(node.operand)
+            if a[0] == "const":
+                return ("const", float(_UNARY[type(node.op)](a[1])))
+            return self._emit(_UNARY[type(node.op)], a, None)
+
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+                and node.func.id in _FUNCS and len(node.args) == 1 and not node.keywords):
+            return self._emit(node.func.id, self._compile(node.args[0]), None)
+
+        raise ValueError(f"No soportado en canal matemático: {ast.unparse(node)}")
+
+    # ---------- ejecución ----------
+    def reset(self):
+        """Reinicia integrales y derivadas (estado entre bloques)."""
+        self._state = {}
+
+    def _value(self, operand, block, rows):
+        kind, v = operand
+        if kind == "row":
+            return block[rows[v]]
+        if kind == "slot":
+            return self._buffers[v]
+        return v
+
+    def evaluate(self, block, rows, dt):
+        """
+        block: matriz (entradas x muestras); rows: nombre -> fila; dt: 1/fs.
+        """
+        n = block.shape[1]
+        if not self._buffers or self._buffers[0].shape[0] != n:
+            self._buffers = [np.empty(n) for _ in range(self._n_slots)]
+            self._state = {}
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for op, a, b, slot in self._ops:
+                out = self._buffers[slot]
+                va = self._value(a, block, rows)
+
+                if op == "copy":
+                    out[...] = va
+                elif op == "integ":
+                    # integral acumulada (continúa entre bloques)
+                    np.cumsum(np.broadcast_to(va, out.shape), out=out)
+                    out *= dt
+                    out += self._state.get(slot, 0.0)
+                    self._state[slot] = out[-1]
+                elif op == "deriv":
+                    va = np.broadcast_to(va, out.shape)
+                    prev = self._state.get(slot, va[0])
+                    out[0] = va[0] - prev
+                    np.subtract(va[1:], va[:-1], out=out[1:])
+                    out /= dt
+                    self._state[slot] = va[-1]
+                elif b is None:
+                    op(va, out=out)
+                else:
+                    op(va, self._value(b, block, rows), out=out)
+
+        return self._buffers[self._result]
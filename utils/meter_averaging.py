@@ -0,0 +1,85 @@
+# utils/meter_averaging.py - promedio de lecturas entre refrescos de los medidores
+# Los bloques llegan cada ~100 ms pero el LCD se refresca a 2-5 Hz: entre refrescos
+# las lecturas se acumulan de forma incremental (sin guardar bloques) y al refrescar
+# se muestra un único valor por canal.
+import numpy as np
+
+# modo -> texto en "Ajuste del medidor"
+MODES = {
+    "mean": "Promedio de bloques",
+    "exp": "Exponencial",
+    "max": "Retención de máximo",
+    "min": "Retención de mínimo",
+}
+
+
+class MeterAverager:
+    """
+    add(lecturas) por bloque, flush() por refresco del display.
+    - mean: promedio de los bloques recibidos desde el último refresco
+    - exp : promedio exponencial (peso 'alpha' por bloque), continuo entre refrescos
+    - max / min: valor extremo retenido hasta reset()
+    Una lectura que falta (None) no cuenta; un canal sin ninguna lectura da None.
+    """
+
+    def __init__(self, mode="mean", alpha=0.2):
+        self.mode = mode
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self._keys = None
+        self._acc = None
+        self._count = None
+        self._pending = False
+
+    def set_mode(self, mode):
+        self.mode = mode
+        self.reset()
+
+    def add(self, readings):
+        # orden fijo: el mismo conjunto de canales puede llegar en otro orden
+        # (las demandas son frozensets) y eso no debe reiniciar el promedio
+        keys = tuple(sorted(readings))
+        x = np.array([np.nan if readings[k] is None else readings[k] for k in keys], dtype=float)
+        if keys != self._keys:
+            # cambió el conjunto de canales (demanda / registro): se empieza de nuevo
+            self.reset()
+            self._keys = keys
+
+        # una lectura que falta (None -> NaN) no cuenta: no debe borrar lo acumulado
+        ok = np.isfinite(x)
+        if self._acc is None:
+            self._acc = x.copy()
+            self._count = ok.astype(float)
+        elif self.mode == "mean":
+            self._acc[ok & (self._count == 0)] = 0.0
+            self._acc[ok] += x[ok]
+            self._count += ok
+        elif self.mode == "exp":
+            seed = ok & np.isnan(self._acc)
+            self._acc[seed] = x[seed]
+            upd = ok & ~seed
+            self._acc[upd] += self.alpha * (x[upd] - self._acc[upd])
+        elif self.mode == "max":
+            np.fmax(self._acc, x, out=self._acc)
+        else:
+            np.fmin(self._acc, x, out=self._acc)
+        self._pending = True
+
+    def flush(self):
+        """Valores a mostrar ({clave: valor o None}), o None si no llegó nada nuevo."""
+        if not self._pending:
+            return None
+        self._pending = False
+        if self.mode == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                values = np.where(self._count > 0, self._acc / self._count, np.nan)
+        else:
+            values = self._acc
+        out = {k: (None if np.isnan(v) else float(v)) for k, v in zip(self._keys, values)}
+        if self.mode == "mean":
+            # el próximo refresco promedia solo bloques nuevos
+            self._acc = None
+            self._count = None
+        return out
@@ -0,0 +1,62 @@
+# utils/meter_logger.py - registro de lecturas de los medidores para la tabla de datos
+# Las lecturas llegan por bloque (~100 ms); cada 'interval' segundos se arma una fila
+# [t, medidor1, medidor2, ...] con el promedio de los bloques desde la fila anterior.
+# Las filas se juntan acá y la tabla las inserta de a tandas (una inserción por refresco).
+import numpy as np
+from utils.meter_averaging import MeterAverager
+
+
+class MeterLogger:
+    """
+    start(ahora) -> add(lecturas, ahora) por bloque -> take() por refresco de la tabla.
+    sample(ahora) agrega una fila a pedido (botón "registrar fila").
+    El tiempo va en segundos desde start(); un medidor sin lectura queda vacío (NaN).
+    """
+
+    def __init__(self, keys, interval=1.0):
+        self.keys = list(keys)
+        self.interval = interval
+        self._averager = MeterAverager("mean")
+        self._rows = []
+        self._last = None
+        self._wanted = False
+        self._t0 = None
+        self._next = None
+
+    def start(self, now):
+        self._averager.reset()
+        self._rows = []
+        self._last = None
+        self._wanted = False
+        self._t0 = now
+        self._next = now
+
+    def add(self, readings, now):
+        self._averager.add({k: readings.get(k) for k in self.keys})
+        if self._wanted:
+            # fila pedida antes de que llegara alguna lectura
+            self.sample(now)
+        elif self.interval and now >= self._next:
+            self.sample(now)
+            self._next += self.interval
+            if self._next <= now:
+                # se atrasó (pausa larga): se sigue desde ahora sin filas de relleno
+                self._next = now + self.interval
+
+    def sample(self, now):
+        """Agrega una fila con lo promediado hasta ahora (o la última lectura)."""
+        values = self._averager.flush() or self._last
+        if values is None:
+            self._wanted = True
+            return
+        self._wanted = False
+        self._last = values
+        self._rows.append([now - self._t0] + [np.nan if values[k] is None else values[k] for k in self.keys])
+
+    def take(self):
+        """Filas pendientes como matriz (filas x (1 + medidores)), o None."""
+        if not self._rows:
+            return None
+        block = np.array(self._rows, dtype=float)
+        self._rows = []
+        return block
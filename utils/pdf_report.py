@@ -0,0 +1,143 @@
+# utils/pdf_report.py - informe PDF paginado de la tabla de datos
+# Se dibuja página por página con QPainter sobre un QPdfWriter: cada página formatea
+# solo sus filas y repite el encabezado, así el tiempo y la memoria crecen de forma
+# lineal con la cantidad de páginas. No usa widgets, puede correr en un hilo de trabajo.
+import datetime
+from PySide6 import QtCore, QtGui
+from utils.column_store import format_number
+
+RESOLUTION = 150        # puntos por pulgada del PDF (coordenadas de dibujo)
+MIN_COL_WIDTH = 110     # ancho mínimo de columna (px a RESOLUTION)
+FONT_PT = 8
+
+
+def _cell(columns, strings, r, c):
+    text = strings.get((r, c))
+    return text if text is not None else format_number(columns[c][r])
+
+
+def render_table_pdf(path, snapshot, title="Tabla de datos", meters=None, images=(),
+                     progress=None, should_stop=None):
+    """
+    snapshot: (encabezados, columnas, textos) de ColumnStore.snapshot().
+    meters  : {nombre: texto} para la primera página (lecturas de los medidores).
+    images  : QImage (gráficos) para la primera página.
+    Si hay más columnas de las que entran a lo ancho se parten en grupos de páginas.
+    Devuelve True si terminó (False si should_stop() cortó).
+    """
+    headers, columns, strings = snapshot
+    n_rows = len(columns[0]) if columns else 0
+    n_cols = len(columns)
+
+    writer = QtGui.QPdfWriter(path)
+    writer.setResolution(RESOLUTION)
+    writer.setPageSize(QtGui.QPageSize(QtGui.QPageSize.A4))
+    writer.setPageMargins(QtCore.QMarginsF(12, 12, 12, 12), QtGui.QPageLayout.Millimeter)
+    writer.setTitle(title)
+
+    painter = QtGui.QPainter(writer)
+    try:
+        font = QtGui.QFont("Arial", FONT_PT)
+        bold = QtGui.QFont("Arial", FONT_PT, QtGui.QFont.Bold)
+        painter.setFont(font)
+        metrics = QtGui.QFontMetrics(font, painter.device())
+        row_h = int(metrics.height() * 1.4)
+        page = painter.viewport()
+        width, height = page.width(), page.height()
+
+        # ---------- primera página: título, medidores y gráficos ----------
+        y = 0
+        painter.setFont(QtGui.QFont("Arial", 14, QtGui.QFont.Bold))
+        painter.drawText(0, y, width, row_h * 2, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter, title)
+        y += row_h * 2
+        painter.setFont(font)
+        stamp = datetime.datetime.now().strftime("%d/%m/%Y %H:%M")
+        painter.drawText(0, y, width, row_h, QtCore.Qt.AlignLeft, f"{stamp} - {n_rows} filas")
+        y += row_h * 2
+
+        if meters:
+            painter.setFont(bold)
+            painter.drawText(0, y, width, row_h, QtCore.Qt.AlignLeft, "Aparatos de medición")
+            y += row_h
+            painter.setFont(font)
+            per_row = 4
+            cell_w = width // per_row
+            for i, (name, value) in enumerate(meters.items()):
+                x = (i % per_row) * cell_w
+                painter.drawRect(x, y, cell_w, row_h)
+                painter.drawText(x + 6, y, cell_w - 12, row_h,
+                                 QtCore.Qt.AlignVCenter | QtCore.Qt.AlignLeft, f"{name}: {value}")
+                if i % per_row == per_row - 1:
+                    y += row_h
+            if len(meters) % per_row:
+                y += row_h
+            y += row_h
+
+        for image in images:
+            if image.isNull():
+                continue
+            # a tamaño de página; si no entra en lo que queda, va a una página nueva
+            scaled = image.scaled(width, height, QtCore.Qt.KeepAspectRatio,
+                                  QtCore.Qt.SmoothTransformation)
+            if y > 0 and y + scaled.height() > height:
+                writer.newPage()
+                y = 0
+            painter.drawImage(0, y, scaled)
+            y += scaled.height() + row_h
+
+        # ---------- tabla paginada ----------
+        if n_cols == 0 or n_rows == 0:
+            return True
+
+        cols_per_page = max(1, min(n_cols, width // MIN_COL_WIDTH))
+        groups = [range(c0, min(c0 + cols_per_page, n_cols)) for c0 in range(0, n_cols, cols_per_page)]
+        row_label_w = metrics.horizontalAdvance(str(n_rows)) + 12
+        rows_first = max(0, (height - y) // row_h - 1)
+        rows_per_page = max(1, height // row_h - 1)
+
+        # páginas totales (para el progreso)
+        pages = []
+        for group in groups:
+            r0 = 0
+            # si la primera página quedó llena (medidores y gráficos) la tabla empieza en otra
+            first = group is groups[0] and rows_first > 0
+            while r0 < n_rows:
+                count = rows_first if first else rows_per_page
+                pages.append((group, r0, min(r0 + count, n_rows), first))
+                first = False
+                r0 += count
+
+        for k, (group, r0, r1, on_first) in enumerate(pages):
+            if should_stop and should_stop():
+                return False
+            if not on_first:
+                writer.newPage()
+                y = 0
+            col_w = (width - row_label_w) // len(group)
+
+            # encabezado (se repite en cada página)
+            painter.setFont(bold)
+            painter.fillRect(0, y, width, row_h, QtGui.QColor("#c0c0c0"))
+            for j, c in enumerate(group):
+                x = row_label_w + j * col_w
+                label = headers[c] if c < len(headers) and headers[c] else f"Col {c}"
+                painter.drawText(x + 4, y, col_w - 8, row_h, QtCore.Qt.AlignVCenter | QtCore.Qt.AlignRight, label)
+            painter.drawRect(0, y, width, row_h)
+            y += row_h
+
+            # filas: solo se formatean las de esta página
+            painter.setFont(font)
+            for r in range(r0, r1):
+                painter.drawText(0, y, row_label_w - 4, row_h, QtCore.Qt.AlignVCenter | QtCore.Qt.AlignRight, str(r))
+                for j, c in enumerate(group):
+                    x = row_label_w + j * col_w
+                    painter.drawText(x + 4, y, col_w - 8, row_h, QtCore.Qt.AlignVCenter | QtCore.Qt.AlignRight,
+                                     _cell(columns, strings, r, c))
+                painter.drawLine(0, y + row_h, width, y + row_h)
+                y += row_h
+
+            if progress:
+                progress((k + 1) / len(pages))
+        return True
+    finally:
+        painter.end()
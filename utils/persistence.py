@@ -0,0 +1,124 @@
+# utils/persistence.py - persistencia tipo "fósforo digital" con histograma de impactos
+# Cada canal acumula en un array (alto x ancho) los pixeles que tocó la traza; en cada
+# cuadro se aplica un decaimiento exponencial y se colorea por intensidad. El costo por
+# cuadro depende solo del tamaño del widget, no de cuánta historia se conserva.
+import math
+import numpy as np
+
+MODES = ("off", "variable", "infinite")
+
+
+class PhosphorPersistence:
+    """
+    Histograma de impactos (n_channels x alto x ancho) en float32.
+    - "variable": decae con constante de tiempo 'decay_time' (segundos)
+    - "infinite": no decae (acumula hasta borrar)
+    """
+
+    def __init__(self, width, height, n_channels=8):
+        self.mode = "variable"
+        self.decay_time = 0.5
+        self.gamma = 0.5            # realza los impactos poco frecuentes
+        self.hit_rate = 10.0        # trazas acumuladas por segundo (bloques del DAQ)
+        self.n_channels = n_channels
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        self.width = max(1, int(width))
+        self.height = max(1, int(height))
+        self.hist = np.zeros((self.n_channels, self.height, self.width), dtype=np.float32)
+        self.alive = np.zeros(self.n_channels, dtype=bool)   # canales con algo acumulado
+        # imagen ARGB32 premultiplicada (la QImage la envuelve sin copiar)
+        self.rgba = np.zeros((self.height, self.width), dtype=np.uint32)
+        self._levels = np.zeros((self.n_channels, self.height, self.width), dtype=np.float32)
+        self._lut_key = None
+
+    def clear(self):
+        self.hist.fill(0)
+        self.alive.fill(False)
+        self.rgba.fill(0)
+
+    def decay(self, dt):
+        """Decaimiento exponencial in-place para un intervalo dt (segundos)."""
+        if self.mode != "variable" or not self.alive.any():
+            return
+        factor = math.exp(-max(dt, 0.0) / max(self.decay_time, 1e-3))
+        idx = np.flatnonzero(self.alive)
+        self.hist[idx] *= np.float32(factor)
+
+    def add_trace(self, ch, x, y):
+        """
+        Rasteriza la polilínea (x, y en pixeles) de forma vectorizada: cada segmento
+        se densifica a pasos <= 1 pixel y los impactos se cuentan con bincount.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        ok = np.isfinite(x) & np.isfinite(y)
+        x = x[ok]
+        y = y[ok]
+        if x.size == 0:
+            return
+
+        if x.size > 1:
+            dx = np.diff(x)
+            dy = np.diff(y)
+            steps = np.maximum(np.ceil(np.maximum(np.abs(dx), np.abs(dy))), 1).astype(np.int64)
+            seg = np.repeat(np.arange(steps.size), steps)
+            # fracción 0..1 dentro de cada segmento
+            first = np.cumsum(steps) - steps
+            frac = (np.arange(seg.size) - first[seg]) / steps[seg]
+            px = np.append(x[seg] + dx[seg] * frac, x[-1])
+            py = np.append(y[seg] + dy[seg] * frac, y[-1])
+        else:
+            px, py = x, y
+
+        xi = np.rint(px).astype(np.int64)
+        yi = np.rint(py).astype(np.int64)
+        inside = (xi >= 0) & (xi < self.width) & (yi >= 0) & (yi < self.height)
+        if not inside.any():
+            return
+        flat = yi[inside] * self.width + xi[inside]
+        hits = np.bincount(flat, minlength=self.width * self.height) > 0
+        self.hist[ch] += hits.reshape(self.height, self.width)
+        self.alive[ch] = True
+
+    def _luts(self, colors):
+        """Tabla nivel (0..255) -> ARGB premultiplicado por canal, con gamma (cacheada)."""
+        key = (tuple(colors), self.gamma)
+        if key != self._lut_key:
+            level = (np.arange(256) / 255.0) ** self.gamma
+            rgb = np.asarray(colors, dtype=float)[:, None, :] * level[None, :, None]
+            c = np.rint(rgb).astype(np.uint32)
+            alpha = np.rint(level * 255).astype(np.uint32)[None, :]
+            self._lut = (alpha << 24) | (c[..., 0] << 16) | (c[..., 1] << 8) | c[..., 2]
+            self._lut_key = key
+        return self._lut
+
+    def render(self, colors):
+        """
+        Colorea el histograma en self.rgba (ARGB32 premultiplicado) con una tabla
+        por canal; donde se superponen canales gana el de mayor intensidad.
+        colors: lista de (r, g, b) por canal.
+        """
+        idx = np.flatnonzero(self.alive)
+        if idx.size == 0:
+            self.rgba.fill(0)
+            return self.rgba
+
+        if self.mode == "infinite":
+            peak = np.maximum(self.hist[idx].reshape(idx.size, -1).max(axis=1), 1.0)
+        else:
+            # régimen permanente de un pixel impactado por todas las trazas
+            peak = np.full(idx.size, max(1.0, self.hit_rate * self.decay_time))
+
+        lut = self._luts(colors)
+        q = self._levels[:idx.size]
+        np.multiply(self.hist[idx], (255.0 / peak)[:, None, None].astype(np.float32), out=q)
+        np.minimum(q, 255, out=q)
+        levels = q.astype(np.uint8)
+
+        # el alfa ocupa el byte alto: el máximo del ARGB empaquetado es el canal más intenso
+        np.take(lut[idx[0]], levels[0], out=self.rgba)
+        for k in range(1, idx.size):
+            np.maximum(self.rgba, lut[idx[k]][levels[k]], out=self.rgba)
+        return self.rgba
@@ -0,0 +1,40 @@
+# utils/qt_arrays.py - puente NumPy <-> estructuras Qt sin copias por punto
+# Permite armar trazos (QPolygonF) directamente desde arrays, sin crear un QPointF por muestra.
+import numpy as np
+import shiboken6
+from PySide6 import QtGui
+
+
+def polygon_view(polygon):
+    """Vista (N, 2) float64 sobre la memoria interna de un QPolygonF."""
+    n = polygon.size()
+    if n == 0:
+        return np.empty((0, 2))
+    ptr = shiboken6.VoidPtr(polygon.data(), n * 2 * 8, True)
+    return np.frombuffer(ptr, dtype=np.float64).reshape((n, 2))
+
+
+def polygon_from_xy(x, y, polygon=None):
+    """
+    Carga x/y en un QPolygonF (reutiliza 'polygon' si se pasa: el cache evita
+    realocar memoria en cada cuadro).
+    """
+    n = min(len(x), len(y))
+    if polygon is None:
+        polygon = QtGui.QPolygonF()
+    if polygon.size() != n:
+        polygon.resize(n)
+    if n:
+        buf = polygon_view(polygon)
+        buf[:, 0] = x[:n]
+        buf[:, 1] = y[:n]
+    return polygon
+
+
+def qimage_from_array(rgba):
+    """
+    QImage ARGB32 premultiplicada que envuelve un array (alto x ancho) uint32 sin
+    copiarlo: los cambios en el array se ven en la imagen. El array debe seguir vivo.
+    """
+    h, w = rgba.shape
+    return QtGui.QImage(rgba.data, w, h, w * 4, QtGui.QImage.Format_ARGB32_Premultiplied)
@@ -0,0 +1,66 @@
+# utils/reference_memory.py - memorias de referencia del osciloscopio (R1..R4)
+# Cada memoria guarda el barrido visible de los canales activos como float32 junto con
+# la base de tiempo y la escala con que se capturó. En disco se usa un .npz (binario,
+# un array por traza + metadatos JSON), sin pasar por texto.
+import json
+import numpy as np
+
+SLOTS = ["R1", "R2", "R3", "R4"]
+
+
+def make_reference(traces, time_scale, fs):
+    """
+    traces: lista de dicts {"slot_index", "entry", "scale", "signal"} (signal = barrido visible).
+    Devuelve la memoria lista para superponer.
+    """
+    return {
+        "time_scale": float(time_scale),
+        "fs": float(fs),
+        "traces": [
+            {
+                "slot_index": int(tr["slot_index"]),
+                "entry": tr["entry"],
+                "scale": tr["scale"],
+                "signal": np.asarray(tr["signal"], dtype=np.float32).copy(),
+            }
+            for tr in traces
+        ],
+    }
+
+
+def save_references(path, references):
+    """Guarda las memorias no vacías en un .npz (float32 + metadatos)."""
+    arrays = {}
+    meta = {}
+    for slot, ref in references.items():
+        if not ref:
+            continue
+        meta[slot] = {
+            "time_scale": ref["time_scale"],
+            "fs": ref["fs"],
+            "traces": [
+                {"slot_index": tr["slot_index"], "entry": tr["entry"], "scale": tr["scale"]}
+                for tr in ref["traces"]
+            ],
+        }
+        for k, tr in enumerate(ref["traces"]):
+            arrays[f"{slot}_{k}"] = tr["signal"]
+    arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+    np.savez(path, **arrays)
+
+
+def load_references(path):
+    """Lee un .npz generado por save_references. Devuelve {slot: memoria}."""
+    references = {}
+    with np.load(path) as f:
+        meta = json.loads(f["meta"].tobytes().decode("utf-8"))
+        for slot, info in meta.items():
+            traces = []
+            for k, tr in enumerate(info["traces"]):
+                traces.append(dict(tr, signal=f[f"{slot}_{k}"].astype(np.float32)))
+            references[slot] = {
+                "time_scale": info["time_scale"],
+                "fs": info["fs"],
+                "traces": traces,
+            }
+    return references
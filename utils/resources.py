@@ -0,0 +1,87 @@
+# utils/resources.py - recursos compartidos por toda la aplicación (fuentes y estilos)
+# La fuente 7 segmentos se registra UNA vez por proceso y los QFont / hojas de estilo
+# se arman una sola vez y se reutilizan en todos los displays.
+# Requiere que exista la QApplication antes de pedir fuentes.
+import os
+from functools import lru_cache
+from PySide6 import QtGui
+
+# carpeta raíz del proyecto (utils/..)
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def resource_path(*parts):
+    """Ruta a un recurso del proyecto (fonts/, img/...) sin depender del directorio actual."""
+    return os.path.join(PACKAGE_DIR, *parts)
+
+
+@lru_cache(maxsize=None)
+def seven_segment_family():
+    """Registra fonts/digital-7.ttf (una vez) y devuelve su family, o None si no está."""
+    path = resource_path("fonts", "digital-7.ttf")
+    if not os.path.exists(path):
+        return None
+    font_id = QtGui.QFontDatabase.addApplicationFont(path)
+    if font_id == -1:
+        return None
+    families = QtGui.QFontDatabase.applicationFontFamilies(font_id)
+    return families[0] if families else None
+
+
+@lru_cache(maxsize=None)
+def font(family, size, bold=False, italic=False):
+    """QFont compartido (setFont copia el valor, así que el cacheado no se modifica)."""
+    f = QtGui.QFont(family, size, QtGui.QFont.Bold if bold else QtGui.QFont.Normal)
+    f.setItalic(italic)
+    return f
+
+
+def lcd_font():
+    """Fuente del LCD: 7 segmentos en cursiva, o Courier si la fuente no está."""
+    family = seven_segment_family()
+    if family:
+        return font(family, 45, italic=True)
+    return font("Courier", 40, bold=True, italic=True)
+
+
+# hojas de estilo (plantillas con parámetros)
+_STYLES = {
+    "panel": "QFrame { background: #E6E6E6; }",
+    "title": (
+        "QLabel { background: #f0f0f0; color: {color}; padding:2px; "
+        "border-top: 2px solid #ffffff; border-left: 2px solid #ffffff; "
+        "border-bottom: 2px solid #7a7a7a; border-right: 2px solid #7a7a7a; }"
+    ),
+    "edit": (
+        "QLineEdit { background: #f0f0f0; padding:2px; "
+        "border-top: 2px solid #ffffff; border-left: 2px solid #ffffff; "
+        "border-bottom: 2px solid #7a7a7a; border-right: 2px solid #7a7a7a; }"
+    ),
+    "lcd_on": (
+        "QLabel { color: #00ff66; "
+        "background: qlineargradient(x1:0,y1:0,x2:0,y2:1, stop:0 #006e2d, stop:1 #004616); "
+        "border-top: 2px solid #a8e0b8; border-left: 2px solid #a8e0b8; "
+        "border-bottom: 2px solid #08381f; border-right: 2px solid #08381f; padding:4px; }"
+    ),
+    "lcd_off": "QLabel { background: black; color: black; border:2px solid #111; }",
+    "mode_button": (
+        "QPushButton { background:#f0f0f0; border-top:2px solid #ffffff; border-left:2px solid #ffffff; "
+        "border-bottom:2px solid #7a7a7a; border-right:2px solid #7a7a7a; }"
+        "QPushButton:pressed { border-top:2px solid #7a7a7a; border-left:2px solid #7a7a7a; "
+        "border-bottom:2px solid #ffffff; border-right:2px solid #ffffff; }"
+    ),
+    "unit": (
+        "QLabel { background: #f0f0f0; padding-right:6px; "
+        "border-top: 2px solid #ffffff; border-left: 2px solid #ffffff; "
+        "border-bottom: 2px solid #7a7a7a; border-right: 2px solid #7a7a7a; }"
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def style(name, **params):
+    """Hoja de estilo 'name' con sus parámetros (misma cadena para todos los widgets)."""
+    css = _STYLES[name]
+    for key, value in params.items():
+        css = css.replace("{" + key + "}", str(value))
+    return css
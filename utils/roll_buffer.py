@@ -0,0 +1,116 @@
+# utils/roll_buffer.py - buffer circular min/max para el modo "roll" del osciloscopio
+# Cada columna de pantalla guarda el mínimo y el máximo de las muestras que le tocan,
+# así 100 s de historia (10 s/div) ocupan solo un par de arrays del ancho del widget.
+import math
+import numpy as np
+
+
+class MinMaxRing:
+    """
+    Ring de columnas (n_channels x columns) con min/max decimados.
+    samples_per_column puede ser fraccionario: la columna k abarca las muestras
+    absolutas [ceil(k*spc), ceil((k+1)*spc)).
+    """
+
+    def __init__(self, n_channels, columns, samples_per_column):
+        self.reset(n_channels, columns, samples_per_column)
+
+    def reset(self, n_channels, columns, samples_per_column):
+        self.n_channels = int(n_channels)
+        self.columns = max(1, int(columns))
+        self.spc = max(1.0, float(samples_per_column))
+        self.mins = np.full((self.n_channels, self.columns), np.nan)
+        self.maxs = np.full((self.n_channels, self.columns), np.nan)
+        self.written = 0                      # columnas completas escritas (total histórico)
+        self._pending = np.empty((self.n_channels, 0))
+        self._pending_start = 0               # índice absoluto de la primera muestra pendiente
+
+    def _column_start(self, k):
+        return int(math.ceil(k * self.spc))
+
+    def append(self, block):
+        """
+        Agrega un bloque (n_channels x n). Solo calcula las columnas que se
+        completan con este bloque; el resto queda pendiente. Devuelve cuántas
+        columnas nuevas hay.
+        """
+        block = np.asarray(block, dtype=float)
+        if block.ndim == 1:
+            block = block[None, :]
+        data = np.concatenate((self._pending, block), axis=1) if self._pending.size else block
+        end = self._pending_start + data.shape[1]
+
+        # columnas que terminan dentro de los datos disponibles
+        k0 = self.written
+        k1 = max(k0, int(end // self.spc))
+        while self._column_start(k1 + 1) <= end:
+            k1 += 1
+        while k1 > k0 and self._column_start(k1) > end:
+            k1 -= 1
+        new = k1 - k0
+        if new == 0:
+            self._pending = data
+            return 0
+
+        starts = np.ceil(np.arange(k0, k1 + 1) * self.spc).astype(int) - self._pending_start
+        used = data[:, :starts[-1]]
+        idx = starts[:-1]
+        col_min = np.minimum.reduceat(used, idx, axis=1)
+        col_max = np.maximum.reduceat(used, idx, axis=1)
+
+        # si llegan más columnas que el ring, solo interesan las últimas
+        if new > self.columns:
+            col_min = col_min[:, -self.columns:]
+            col_max = col_max[:, -self.columns:]
+        pos = (np.arange(k1 - col_min.shape[1], k1)) % self.columns
+        self.mins[:, pos] = col_min
+        self.maxs[:, pos] = col_max
+
+        self.written = k1
+        self._pending = data[:, starts[-1]:]
+        self._pending_start += starts[-1]
+        return new
+
+    def latest(self, n=None):
+        """Últimas n columnas en orden cronológico: (mins, maxs) de (n_channels x n)."""
+        n = min(self.columns, self.written if n is None else n, self.written)
+        if n <= 0:
+            empty = np.empty((self.n_channels, 0))
+            return empty, empty
+        pos = np.arange(self.written - n, self.written) % self.columns
+        return self.mins[:, pos], self.maxs[:, pos]
+
+
+class SampleRing:
+    """
+    Ring de muestras crudas (n_channels x capacity) para ventanas de historia
+    (modo XY). append escribe con a lo sumo dos copias por bloque.
+    """
+
+    def __init__(self, n_channels, capacity):
+        self.capacity = max(1, int(capacity))
+        self.data = np.zeros((int(n_channels), self.capacity))
+        self.head = 0          # próxima posición a escribir
+        self.size = 0
+
+    def append(self, block):
+        block = np.asarray(block, dtype=float)
+        if block.ndim == 1:
+            block = block[None, :]
+        n = block.shape[1]
+        if n >= self.capacity:
+            self.data[:] = block[:, -self.capacity:]
+            self.head = 0
+            self.size = self.capacity
+            return
+        first = min(n, self.capacity - self.head)
+        self.data[:, self.head:self.head + first] = block[:, :first]
+        self.data[:, :n - first] = block[:, first:]
+        self.head = (self.head + n) % self.capacity
+        self.size = min(self.capacity, self.size + n)
+
+    def latest(self):
+        """Contenido en orden cronológico (n_channels x size)."""
+        if self.size < self.capacity:
+            return self.data[:, :self.size]
+        return np.concatenate((self.data[:, self.head:], self.data[:, :self.head]), axis=1)
@@ -0,0 +1,72 @@
+# utils/signal_engine.py - cálculos por bloque: magnitudes derivadas, lecturas y fasores
+# Funciones puras sobre una matriz (canales x muestras), sin Qt: las usan la GUI
+# (a través de DemandPipeline) y las herramientas por lotes.
+import numpy as np
+
+
+def derive(channel, data):
+    """
+    Señal de un canal derivado (producto de sus entradas por 'gain').
+    Devuelve None si falta alguna entrada en 'data'.
+    """
+    if any(key not in data for key in channel.inputs):
+        return None
+    out = np.multiply(data[channel.inputs[0]], channel.gain)
+    for key in channel.inputs[1:]:
+        out *= data[key]
+    return out
+
+
+def readings(matrix, modes):
+    """
+    Lectura de medidor por fila: 'rms' o 'mean' (modes, una por fila).
+    Se calculan las dos en una pasada vectorizada y se elige por fila.
+    """
+    x = np.asarray(matrix, dtype=float)
+    if x.shape[0] == 0:
+        return np.empty(0)
+    n = x.shape[1]
+    mean = x.mean(axis=1)
+    rms = np.sqrt(np.einsum("ij,ij->i", x, x) / n)
+    return np.where(np.asarray(modes) == "mean", mean, rms)
+
+
+def phasors(matrix, fs):
+    """
+    Fasor de cada fila: (rms, fase en grados, frecuencia) de la componente dominante.
+    Una sola FFT real sobre toda la matriz.
+    """
+    x = np.asarray(matrix, dtype=float)
+    n_ch, n = x.shape
+    if n_ch == 0 or n < 2:
+        empty = np.empty(n_ch)
+        return empty, empty, empty
+    rms = np.sqrt(np.einsum("ij,ij->i", x, x) / n)
+    spec = np.fft.rfft(x, axis=1)
+    idx = np.abs(spec[:, 1:]).argmax(axis=1) + 1
+    rows = np.arange(n_ch)
+    phase = np.angle(spec[rows, idx], deg=True)
+    freq = idx * fs / n
+    return rms, phase, freq
+
+
+def harmonics(matrix, fs, n_harmonics=15):
+    """
+    Armónicos de cada fila: valor eficaz de la fundamental (pico dominante sin la
+    componente continua) y de sus múltiplos, (canales x n_harmonics), más la THD en %.
+    Una sola FFT real sobre toda la matriz; conviene una ventana de ciclos enteros.
+    Los armónicos por encima de fs/2 quedan en NaN.
+    """
+    x = np.asarray(matrix, dtype=float)
+    n_ch, n = x.shape
+    if n_ch == 0 or n < 4:
+        return np.full((n_ch, n_harmonics), np.nan), np.full(n_ch, np.nan)
+    spec = np.abs(np.fft.rfft(x - x.mean(axis=1, keepdims=True), axis=1)) * (np.sqrt(2) / n)
+    k1 = spec[:, 1:].argmax(axis=1) + 1
+    bins = k1[:, None] * np.arange(1, n_harmonics + 1)
+    valid = bins < spec.shape[1]
+    rows = np.arange(n_ch)[:, None]
+    h = np.where(valid, spec[rows, np.minimum(bins, spec.shape[1] - 1)], np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        thd = np.sqrt(np.nansum(h[:, 1:] ** 2, axis=1)) / h[:, 0] * 100
+    return h, thd
@@ -0,0 +1,206 @@
+# utils/table_io.py - lectura/escritura por bloques de la tabla de datos
+# Lectura: detecta separador y encabezado mirando las primeras líneas y después lee
+# con el motor C de pandas en bloques: cada bloque llega como matriz float64
+# (conversión vectorizada) más los textos no numéricos que haya.
+# Escritura: directo desde los arrays de columnas, en bloques (CSV) o en un .npz
+# columnar (binario, sin pasar por texto).
+import csv
+import json
+import os
+import re
+import numpy as np
+
+CHUNK_ROWS = 100_000
+_DECIMAL_COMMA = re.compile(r"^[-+]?\d+,\d+([eE][-+]?\d+)?$")
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return bool(_DECIMAL_COMMA.match(text.strip()))
+
+
+def sniff_csv(path, sample_lines=20):
+    """
+    Mira el comienzo del archivo. Devuelve dict con:
+      delimiter, decimal, has_header, headers (lista o None), n_cols
+    """
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        lines = [line for _, line in zip(range(sample_lines), f)]
+    sample = "".join(lines)
+    if not sample.strip():
+        return {"delimiter": ",", "decimal": ".", "has_header": False,
+                "headers": None, "n_cols": 0}
+
+    try:
+        delimiter = csv.Sniffer().sniff(sample, delimiters=",;\t").delimiter
+    except csv.Error:
+        delimiter = ","
+
+    rows = [r for r in csv.reader(lines, delimiter=delimiter) if r]
+    # coma decimal (planillas en castellano): solo si la coma no es el separador
+    decimal = "."
+    if delimiter != "," and any(_DECIMAL_COMMA.match(cell.strip()) for r in rows for cell in r):
+        decimal = ","
+    n_cols = max(len(r) for r in rows)
+    first = rows[0]
+    rest = rows[1:]
+    # encabezado: la primera fila tiene textos donde las siguientes tienen números
+    has_header = bool(rest) and any(
+        cell.strip() and not _is_number(cell)
+        and any(c < len(r) and _is_number(r[c]) for r in rest)
+        for c, cell in enumerate(first)
+    )
+    return {
+        "delimiter": delimiter,
+        "decimal": decimal,
+        "has_header": has_header,
+        "headers": [h.strip() for h in first] if has_header else None,
+        "n_cols": n_cols,
+    }
+
+
+def _split_chunk(df):
+    """DataFrame -> (matriz float64, {(fila, col): texto}) con filas relativas al bloque."""
+    import pandas as pd
+
+    n_rows, n_cols = df.shape
+    block = np.empty((n_rows, n_cols))
+    strings = {}
+    for c in range(n_cols):
+        col = df.iloc[:, c]
+        if col.dtype.kind in "fiub":
+            block[:, c] = col.to_numpy(dtype=float)
+            continue
+        numeric = pd.to_numeric(col, errors="coerce")
+        block[:, c] = numeric.to_numpy(dtype=float)
+        # lo que no es número ni vacío queda como texto
+        text_rows = np.flatnonzero(numeric.isna().to_numpy() & col.notna().to_numpy())
+        values = col.to_numpy()
+        for r in text_rows:
+            s = str(values[r]).strip()
+            if s:
+                strings[(int(r), c)] = s
+    return block, strings
+
+
+def iter_csv_chunks(path, info=None, chunk_rows=CHUNK_ROWS):
+    """
+    Genera (matriz, textos, fracción leída 0..1) por bloque de 'chunk_rows' filas.
+    'info' es el resultado de sniff_csv (se calcula si no se pasa).
+    """
+    import pandas as pd
+
+    info = info or sniff_csv(path)
+    size = max(os.path.getsize(path), 1)
+    with open(path, "rb") as f:
+        reader = pd.read_csv(
+            f,
+            sep=info["delimiter"],
+            decimal=info["decimal"],
+            header=None,
+            skiprows=1 if info["has_header"] else 0,
+            names=range(info["n_cols"]),
+            chunksize=chunk_rows,
+            engine="c",
+            low_memory=False,
+            skip_blank_lines=True,
+        )
+        for df in reader:
+            block, strings = _split_chunk(df)
+            yield block, strings, min(f.tell() / size, 1.0)
+
+
+_NAN_CELL = re.compile(r"(?<![^,\n])nan(?=[,\n])")
+
+
+def _csv_cell(text):
+    if any(ch in text for ch in ',"\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def _format_chunk(block, texts):
+    """
+    Matriz (filas x columnas) -> texto CSV. Todo el bloque se formatea con UNA sola
+    operación '%' sobre una plantilla repetida; las celdas vacías (NaN) se borran
+    después y las filas con textos se rehacen aparte desde sus propias celdas (una
+    línea ya formateada no se vuelve a partir: un texto puede tener comas).
+    """
+    n_rows, n_cols = block.shape
+    line = ",".join(["%.10g"] * n_cols) + "\n"
+    text = (line * n_rows) % tuple(block.ravel().tolist())
+    if np.isnan(block).any():
+        text = _NAN_CELL.sub("", text)
+    if texts:
+        by_row = {}
+        for r, c, cell in texts:
+            by_row.setdefault(r, {})[c] = cell
+        lines = text.split("\n")
+        for r, row_texts in by_row.items():
+            cells = ["" if np.isnan(v) else "%.10g" % v for v in block[r].tolist()]
+            for c, cell in row_texts.items():
+                cells[c] = _csv_cell(cell)
+            lines[r] = ",".join(cells)
+        text = "\n".join(lines)
+    return text
+
+
+def write_csv(path, snapshot, progress=None, should_stop=None, chunk_rows=CHUNK_ROWS):
+    """
+    Escribe un CSV desde un snapshot (encabezados, columnas, textos) de ColumnStore,
+    formateando por bloques de 'chunk_rows' filas. progress(fracción) se llama por
+    bloque; si should_stop() devuelve True se corta. Devuelve True si terminó.
+    Se escribe en un temporal que reemplaza al destino solo al terminar: si se corta
+    o falla, el destino queda como estaba.
+    """
+    headers, columns, strings = snapshot
+    n_rows = len(columns[0]) if columns else 0
+    # textos agrupados por bloque para no recorrer el diccionario entero cada vez
+    by_chunk = {}
+    for (r, c), text in strings.items():
+        if r < n_rows and c < len(columns):
+            by_chunk.setdefault(r // chunk_rows, []).append((r % chunk_rows, c, text))
+
+    tmp = path + ".tmp"
+    done = False
+    try:
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            if any(headers):
+                f.write(",".join(_csv_cell(h) for h in headers) + "\n")
+            for k, r0 in enumerate(range(0, n_rows, chunk_rows)):
+                if should_stop and should_stop():
+                    return False
+                block = np.column_stack([col[r0:r0 + chunk_rows] for col in columns])
+                f.write(_format_chunk(block, by_chunk.get(k)))
+                if progress:
+                    progress(min((r0 + chunk_rows) / n_rows, 1.0))
+        os.replace(tmp, path)
+        done = True
+    finally:
+        if not done and os.path.exists(tmp):
+            os.remove(tmp)
+    return True
+
+
+def save_binary(path, snapshot):
+    """Guarda el snapshot en un .npz columnar (float64 por columna + metadatos JSON)."""
+    headers, columns, strings = snapshot
+    meta = {
+        "headers": headers,
+        "strings": [[r, c, t] for (r, c), t in strings.items()],
+    }
+    arrays = {f"c{i}": col for i, col in enumerate(columns)}
+    arrays["meta"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+    np.savez(path, **arrays)
+
+
+def load_binary(path):
+    """Lee un .npz de save_binary. Devuelve (encabezados, columnas, textos)."""
+    with np.load(path) as f:
+        meta = json.loads(f["meta"].tobytes().decode("utf-8"))
+        columns = [f[f"c{i}"] for i in range(len(meta["headers"]))]
+    strings = {(r, c): t for r, c, t in meta["strings"]}
+    return meta["headers"], columns, strings
@@ -0,0 +1,145 @@
+# utils/trend_store.py - tendencias de larga duración de todas las lecturas
+# Cada bloque (~100 ms) deja una lectura por canal; se guarda en una pirámide de
+# niveles (bloque, 1 s, 10 s, 1 min, 10 min) con mín/promedio/máx por intervalo.
+# Cada nivel es un anillo NumPy de tamaño fijo: la memoria está acotada y una consulta
+# cuesta lo mismo a los 5 minutos que a las 8 horas de ensayo.
+import math
+import numpy as np
+
+TIER_PERIODS = (None, 1.0, 10.0, 60.0, 600.0)   # None = un punto por bloque
+TIER_CAPACITY = 4000                            # puntos por nivel
+
+
+class _Tier:
+    """
+    Un nivel de la pirámide: anillo de (t, mín, promedio, máx) más el intervalo en
+    curso que se va acumulando. push() devuelve el intervalo que se cerró (para el
+    nivel siguiente) o None.
+    """
+
+    def __init__(self, period, capacity, n_keys):
+        self.period = period
+        self.capacity = capacity
+        self.t = np.full(capacity, np.nan)
+        self.lo = np.full((capacity, n_keys), np.nan)
+        self.mean = np.full((capacity, n_keys), np.nan)
+        self.hi = np.full((capacity, n_keys), np.nan)
+        self.head = 0          # próxima posición a escribir
+        self.size = 0
+        self._bucket = None
+        self._reset_acc(n_keys)
+
+    def _reset_acc(self, n_keys):
+        self._acc_lo = np.full(n_keys, np.inf)
+        self._acc_hi = np.full(n_keys, -np.inf)
+        self._acc_sum = np.zeros(n_keys)
+        self._acc_n = np.zeros(n_keys)
+
+    def _write(self, t, lo, mean, hi):
+        i = self.head
+        self.t[i] = t
+        self.lo[i] = lo
+        self.mean[i] = mean
+        self.hi[i] = hi
+        self.head = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def _accumulated(self):
+        n = self._acc_n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, self._acc_sum / n, np.nan)
+        lo = np.where(n > 0, self._acc_lo, np.nan)
+        hi = np.where(n > 0, self._acc_hi, np.nan)
+        return self._bucket * self.period, lo, mean, hi, n.copy()
+
+    def push(self, t, lo, mean, hi, n):
+        if self.period is None:
+            self._write(t, lo, mean, hi)
+            return t, lo, mean, hi, n
+
+        closed = None
+        bucket = math.floor(t / self.period)
+        if self._bucket is not None and bucket != self._bucket:
+            closed = self._accumulated()
+            self._write(*closed[:4])
+            self._reset_acc(len(lo))
+        self._bucket = bucket
+        ok = n > 0
+        np.fmin(self._acc_lo, np.where(ok, lo, np.inf), out=self._acc_lo)
+        np.fmax(self._acc_hi, np.where(ok, hi, -np.inf), out=self._acc_hi)
+        self._acc_sum += np.where(ok, mean * n, 0.0)
+        self._acc_n += n
+        return closed
+
+    def oldest(self):
+        if self.size == 0:
+            return math.inf
+        return self.t[(self.head - self.size) % self.capacity]
+
+    def series(self, partial=True):
+        """(t, mín, promedio, máx) en orden temporal; con partial se suma el intervalo en curso."""
+        start = (self.head - self.size) % self.capacity
+        order = (np.arange(self.size) + start) % self.capacity
+        t, lo, mean, hi = self.t[order], self.lo[order], self.mean[order], self.hi[order]
+        if partial and self.period is not None and self._bucket is not None and self._acc_n.any():
+            pt, plo, pmean, phi, _ = self._accumulated()
+            t = np.append(t, pt)
+            lo = np.vstack([lo, plo])
+            mean = np.vstack([mean, pmean])
+            hi = np.vstack([hi, phi])
+        return t, lo, mean, hi
+
+
+class TrendStore:
+    """
+    add(lecturas, t) por bloque; query(t0, t1, max_points) elige el nivel más fino
+    que cubre [t0, t1] con no más de max_points puntos.
+    """
+
+    def __init__(self, keys, block_period=0.1, periods=TIER_PERIODS, capacity=TIER_CAPACITY):
+        self.keys = list(keys)
+        self._index = {k: i for i, k in enumerate(self.keys)}
+        self.block_period = block_period
+        self.tiers = [_Tier(p, capacity, len(self.keys)) for p in periods]
+
+    def clear(self):
+        self.tiers = [_Tier(t.period, t.capacity, len(self.keys)) for t in self.tiers]
+
+    def add(self, readings, t):
+        x = np.array([np.nan if readings.get(k) is None else readings[k] for k in self.keys], dtype=float)
+        n = np.isfinite(x).astype(float)
+        record = (t, x, x, x, n)
+        for tier in self.tiers:
+            record = tier.push(*record)
+            if record is None:
+                break
+
+    def last_time(self):
+        tier = self.tiers[0]
+        return tier.t[(tier.head - 1) % tier.capacity] if tier.size else None
+
+    def query(self, t0, t1, keys=None, max_points=2000):
+        """
+        Devuelve dict con t (n,), lo/mean/hi (n, len(keys)) y 'period' del nivel usado,
+        solo de los puntos en [t0, t1] (más uno de cada lado).
+        """
+        span = max(t1 - t0, 1e-9)
+        chosen = self.tiers[-1]
+        for tier in self.tiers:
+            period = tier.period or self.block_period
+            # el nivel sirve si no perdió nada anterior a t0 (todavía no dio la vuelta)
+            complete = tier.size < tier.capacity or tier.oldest() <= t0
+            if span / period <= max_points and complete:
+                chosen = tier
+                break
+        t, lo, mean, hi = chosen.series()
+        i0 = max(int(np.searchsorted(t, t0)) - 1, 0)
+        i1 = min(int(np.searchsorted(t, t1, side="right")) + 1, len(t))
+        cols = [self._index[k] for k in (keys if keys is not None else self.keys)]
+        return {
+            "t": t[i0:i1],
+            "lo": lo[i0:i1][:, cols],
+            "mean": mean[i0:i1][:, cols],
+            "hi": hi[i0:i1][:, cols],
+            "period": chosen.period or self.block_period,
+        }
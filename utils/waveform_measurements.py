@@ -0,0 +1,72 @@
+# utils/waveform_measurements.py - mediciones automáticas del osciloscopio
+# Todas las mediciones se hacen en una sola pasada sobre una matriz (canales x muestras):
+# agregar canales no agrega llamadas, solo filas.
+import numpy as np
+
+
+def _rising_crossings(centered, hyst):
+    """
+    Cruces ascendentes con histéresis (fila por fila, vectorizado).
+    Devuelve (cantidad, instante del primero, instante del último) en muestras.
+    """
+    n_ch, n = centered.shape
+    state = np.where(centered > hyst[:, None], 1, np.where(centered < -hyst[:, None], -1, 0))
+    # dentro de la banda de histéresis se mantiene el último estado (forward fill)
+    idx = np.where(state != 0, np.arange(n), 0)
+    np.maximum.accumulate(idx, axis=1, out=idx)
+    state = np.take_along_axis(state, idx, axis=1)
+
+    rising = (state[:, :-1] == -1) & (state[:, 1:] == 1)
+    count = rising.sum(axis=1)
+    first = rising.argmax(axis=1)
+    last = n - 2 - rising[:, ::-1].argmax(axis=1)
+
+    def _subsample(i):
+        # instante en que la señal cruza +hyst entre i e i+1 (interpolación lineal)
+        rows = np.arange(n_ch)
+        a = centered[rows, i]
+        b = centered[rows, i + 1]
+        den = np.where(b != a, b - a, 1.0)
+        return i + np.clip((hyst - a) / den, 0.0, 1.0)
+
+    return count, _subsample(first), _subsample(last)
+
+
+def measure_sweeps(sweeps, fs, cursors=()):
+    """
+    Mediciones de cada fila de 'sweeps' (canales x muestras, misma longitud).
+    cursors: posiciones en muestras (pueden ser fraccionarias).
+    Devuelve dict con arrays por canal: rms, mean, pk2pk, freq, y 'cursors'
+    (canales x len(cursors)). freq es NaN si no entran dos períodos completos.
+    """
+    x = np.asarray(sweeps, dtype=float)
+    if x.ndim == 1:
+        x = x[None, :]
+    n_ch, n = x.shape
+    if n == 0:
+        nan = np.full(n_ch, np.nan)
+        return {"rms": nan, "mean": nan, "pk2pk": nan, "freq": nan,
+                "cursors": np.full((n_ch, len(cursors)), np.nan)}
+
+    mean = x.mean(axis=1)
+    rms = np.sqrt(np.einsum("ij,ij->i", x, x) / n)
+    hi = x.max(axis=1)
+    lo = x.min(axis=1)
+    pk2pk = hi - lo
+
+    freq = np.full(n_ch, np.nan)
+    if n >= 3:
+        centered = x - ((hi + lo) / 2)[:, None]
+        hyst = np.maximum(0.1 * pk2pk / 2, 1e-12)
+        count, t_first, t_last = _rising_crossings(centered, hyst)
+        ok = (count >= 2) & (t_last > t_first)
+        freq[ok] = (count[ok] - 1) * fs / (t_last[ok] - t_first[ok])
+
+    # lectura de cursores con interpolación lineal
+    pos = np.clip(np.asarray(cursors, dtype=float), 0, n - 1)
+    i0 = np.minimum(np.floor(pos).astype(int), n - 1)
+    i1 = np.minimum(i0 + 1, n - 1)
+    frac = pos - i0
+    cursor_vals = x[:, i0] * (1 - frac) + x[:, i1] * frac
+
+    return {"rms": rms, "mean": mean, "pk2pk": pk2pk, "freq": freq, "cursors": cursor_vals}
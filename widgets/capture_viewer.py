@@ -0,0 +1,143 @@
+# widgets/capture_viewer.py - visor de capturas largas (horas de 8 canales)
+# Usa el mismo gráfico que GraphWindow (zoom con rueda, arrastre, doble clic = todo)
+# pero en cada repintado le pide a CaptureReader solo lo visible: el nivel de la
+# pirámide que corresponde o, de cerca, el tramo de muestras crudas.
+import os
+import numpy as np
+from PySide6 import QtWidgets, QtGui, QtCore
+from utils.capture_file import CaptureReader, build_overview, csv_to_capture
+from utils.qt_arrays import polygon_from_xy
+from widgets.graph_widget import GraphDisplay, SERIES_COLORS
+
+
+class CaptureOpenThread(QtCore.QThread):
+    """
+    Prepara una captura para verla: arma la pirámide si falta o convierte un CSV de
+    save_to_csv a captura (junto al CSV, con extensión .lvc). 'path' queda con la captura.
+    """
+    progress = QtCore.Signal(int)
+    failed = QtCore.Signal(str)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.cancelled = False
+        self.ok = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        report = lambda frac: self.progress.emit(int(frac * 100))
+        stop = lambda: self.cancelled
+        try:
+            if self.path.lower().endswith(".csv"):
+                csv_path, self.path = self.path, os.path.splitext(self.path)[0] + ".lvc"
+                fresh = (os.path.exists(self.path)
+                         and os.path.getmtime(self.path) >= os.path.getmtime(csv_path)
+                         and CaptureReader.has_overview(self.path))
+                self.ok = fresh or csv_to_capture(csv_path, self.path, report, stop)
+            elif not CaptureReader.has_overview(self.path):
+                self.ok = build_overview(self.path, report, stop)
+            else:
+                self.ok = True
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class CaptureDisplay(GraphDisplay):
+    """GraphDisplay que trae los datos de una captura según el rango visible."""
+
+    def __init__(self, reader):
+        super().__init__()
+        self.reader = reader
+        self.cols = []
+
+    def set_channels(self, cols):
+        self.cols = list(cols)
+        self.series = [(self.reader.keys[c], None, None, QtGui.QColor(SERIES_COLORS[c % len(SERIES_COLORS)]),
+                        True, "line") for c in self.cols]
+        self._invalidate()
+
+    def autoscale(self):
+        self.x_range = (0.0, max(self.reader.duration, 1.0 / self.reader.fs))
+        rng = self.reader.overall_range(self.cols) if self.cols else None
+        self.y_range = self._padded(*rng, 0.05) if rng else (0.0, 1.0)
+        self._invalidate()
+
+    def autoscale_y(self):
+        if not self.cols:
+            return
+        _, y = self.reader.window(*self.x_range, self.cols, max(int(self._plot_rect().width()), 1))
+        ok = y[np.isfinite(y)]
+        if ok.size:
+            self.y_range = self._padded(ok.min(), ok.max(), 0.05)
+        self._invalidate()
+
+    def _polylines(self, rect):
+        key = (self.x_range, self.y_range, rect.width(), rect.height(), tuple(self.cols))
+        if key == self._cache_key:
+            return self._cache
+        lines = []
+        if self.cols:
+            (x0, x1), (y0, y1) = self.x_range, self.y_range
+            x, y = self.reader.window(x0, x1, self.cols, max(int(rect.width()), 1))
+            px = rect.left() + (x - x0) * (rect.width() / (x1 - x0))
+            for j, (_, _, _, color, _, _) in enumerate(self.series):
+                py = rect.bottom() - (y[:, j] - y0) * (rect.height() / (y1 - y0))
+                ok = np.isfinite(py)
+                lines.append((color, "line", polygon_from_xy(px[ok], py[ok])))
+        self._cache_key, self._cache = key, lines
+        return lines
+
+
+class CaptureWindow(QtWidgets.QMainWindow):
+    """Ventana de revisión de una captura: canales a mostrar + gráfico."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.reader = CaptureReader(path)
+        self.setWindowTitle(f"Captura - {os.path.basename(path)}")
+        self.resize(1000, 560)
+        self._build_ui()
+
+    def _build_ui(self):
+        toolbar = self.addToolBar("Tools")
+        act_fit_y = toolbar.addAction("📊")
+        act_fit_y.setToolTip("Ajustar Y a lo visible")
+        act_fit_y.triggered.connect(lambda: self.graph.autoscale_y())
+        act_fit = toolbar.addAction("📈")
+        act_fit.setToolTip("Ver todo")
+        act_fit.triggered.connect(lambda: self.graph.autoscale())
+
+        central = QtWidgets.QWidget()
+        layout = QtWidgets.QHBoxLayout(central)
+        left = QtWidgets.QVBoxLayout()
+
+        group = QtWidgets.QGroupBox("Canales")
+        grid = QtWidgets.QGridLayout(group)
+        self.checks = []
+        for i, key in enumerate(self.reader.keys):
+            check = QtWidgets.QCheckBox(key)
+            check.setChecked(i == 0)
+            check.toggled.connect(self._update_channels)
+            grid.addWidget(check, i // 2, i % 2)
+            self.checks.append(check)
+        left.addWidget(group)
+
+        minutes, seconds = divmod(self.reader.duration, 60)
+        info = QtWidgets.QLabel(f"{self.reader.n_samples} muestras\n"
+                                f"{int(minutes)} min {seconds:.1f} s a {self.reader.fs:g} Hz")
+        left.addWidget(info)
+        left.addStretch()
+        layout.addLayout(left, 1)
+
+        self.graph = CaptureDisplay(self.reader)
+        layout.addWidget(self.graph, 4)
+        self.setCentralWidget(central)
+
+        self._update_channels()
+        self.graph.autoscale()
+
+    def _update_channels(self, *_):
+        self.graph.set_channels([i for i, check in enumerate(self.checks) if check.isChecked()])
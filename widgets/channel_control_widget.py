@@ -2,6 +2,10 @@
 # Control de canal del osciloscopio (estilo LabVolt / Windows 95)
 
 from PySide6 import QtWidgets, QtGui, QtCore
+from utils.channel_registry import REGISTRY
+
+# canales matemáticos (los define el osciloscopio)
+MATH_CHANNELS = ["M1", "M2", "M3", "M4"]
 
 
 class ChannelControlWidget(QtWidgets.QGroupBox):
@@ -43,29 +47,6 @@ class ChannelControlWidget(QtWidgets.QGroupBox):
         entry_row = QtWidgets.QHBoxLayout()
         entry_label = QtWidgets.QLabel("Entrada")
         self.entry_combo = QtWidgets.QComboBox()
-        self.entry_combo.addItems([
-            "Ninguna",
-            "E1",
-            "E2",
-            "E3",
-            "I1",
-            "I2",
-            "I3",
-            "P1",
-            "P2",
-            "P3",
-            "T",
-            "N",
-            "Pm",
-            "EA-1",
-            "EA-2",
-            "EA-3",
-            "EA-4",
-            "EA-5",
-            "EA-6",
-            "EA-7",
-            "EA-8"
-        ])
         entry_row.addWidget(entry_label)
         entry_row.addWidget(self.entry_combo)
         layout.addLayout(entry_row)
@@ -82,6 +63,11 @@ class ChannelControlWidget(QtWidgets.QGroupBox):
 
         self.entry_combo.currentTextChanged.connect(self.update_amplitude_options)
 
+        # las entradas salen del registro de canales y siguen sus cambios
+        self.refresh_entries()
+        REGISTRY.add_listener(self.refresh_entries)
+        self.destroyed.connect(lambda *_: REGISTRY.remove_listener(self.refresh_entries))
+
 
         # Botones DC / AC / GND
         btn_row = QtWidgets.QHBoxLayout()
@@ -140,12 +126,27 @@ class ChannelControlWidget(QtWidgets.QGroupBox):
         layout.addLayout(btn_row)
 
 
+    def refresh_entries(self):
+        """Arma la lista de entradas con los canales habilitados del registro."""
+        current = self.entry_combo.currentText()
+        entries = ["Ninguna"] + [ch.label for ch in REGISTRY.enabled()] + MATH_CHANNELS
+        self.entry_combo.blockSignals(True)
+        self.entry_combo.clear()
+        self.entry_combo.addItems(entries)
+        # si la entrada elegida se deshabilitó, el canal queda en "Ninguna"
+        self.entry_combo.setCurrentIndex(max(0, self.entry_combo.findText(current)))
+        self.entry_combo.blockSignals(False)
+        if self.entry_combo.currentText() != current:
+            self.update_amplitude_options(self.entry_combo.currentText())
+
     def update_amplitude_options(self, text):
 
             self.volt_combo.clear()
+            ch = REGISTRY.get(text)
+            kind = ch.kind if ch else None
 
     # ---------------- VOLTAJE ----------------
-            if text.startswith("E") or text.startswith("EA"):
+            if kind == "voltage":
                 self.volt_combo.addItems([
                     "2 V/div.",
                     "5 V/div.",
@@ -157,7 +158,7 @@ class ChannelControlWidget(QtWidgets.QGroupBox):
                 ])
 
     # ---------------- CORRIENTE ----------------
-            elif text.startswith("I"):
+            elif kind == "current":
                 self.volt_combo.addItems([
                     "0.05 A/div.",
                     "0.1 A/div.",
@@ -169,7 +170,7 @@ class ChannelControlWidget(QtWidgets.QGroupBox):
                 ])
 
     # ---------------- POTENCIA ----------------
-            elif text.startswith("P"):
+            elif kind == "power":
                 self.volt_combo.addItems([
                     "5 W/div.",
                     "10 W/div.",
@@ -181,7 +182,7 @@ class ChannelControlWidget(QtWidgets.QGroupBox):
                 ])
 
     # ---------------- TORQUE ----------------
-            elif text == "T":
+            elif kind == "torque":
                 self.volt_combo.addItems([
                     "0.1 N.m/div.",
                     "0.2 N.m/div.",
@@ -193,7 +194,7 @@ class ChannelControlWidget(QtWidgets.QGroupBox):
                 ])
 
     # ---------------- VELOCIDAD ----------------
-            elif text == "N":
+            elif kind == "speed":
                 self.volt_combo.addItems([
                     "20 rpm/div.",
                     "50 rpm/div.",
@@ -204,6 +205,18 @@ class ChannelControlWidget(QtWidgets.QGroupBox):
                     "2000 rpm/div."
                 ])
 
+    # ---------------- MATEMÁTICOS ----------------
+            elif text in MATH_CHANNELS:
+                self.volt_combo.addItems([
+                    "0.1 /div.",
+                    "1 /div.",
+                    "10 /div.",
+                    "100 /div.",
+                    "500 /div.",
+                    "1000 /div.",
+                    "5000 /div."
+                ])
+
     # ---------------- NINGUNA ----------------
             else:
                 self.volt_combo.addItem("Sin señal")
@@ -0,0 +1,140 @@
+# widgets/data_table_model.py - modelo Qt de la tabla de datos sobre un ColumnStore
+# La vista pide solo las celdas visibles y cada una se formatea al momento: no hay
+# un QTableWidgetItem por celda. Siempre se muestra al menos una grilla de
+# MIN_ROWS x MIN_COLS (como la tabla LabVolt); al escribir fuera de los datos crece.
+from PySide6 import QtCore
+from utils.column_store import ColumnStore
+
+
+class ColumnTableModel(QtCore.QAbstractTableModel):
+
+    MIN_ROWS = 50
+    MIN_COLS = 10
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store if store is not None else ColumnStore()
+
+    # ---------- forma ----------
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return max(self.store.n_rows, self.MIN_ROWS)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return max(self.store.n_cols, self.MIN_COLS)
+
+    # ---------- celdas ----------
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self.store.text(index.row(), index.column())
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if role != QtCore.Qt.EditRole or not index.isValid():
+            return False
+        rows, cols = self.rowCount(), self.columnCount()
+        self.store.set_text(index.row(), index.column(), str(value))
+        self._shape_changed(rows, cols)
+        self.dataChanged.emit(index, index, [QtCore.Qt.DisplayRole, QtCore.Qt.EditRole])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role != QtCore.Qt.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Horizontal:
+            return self.store.headers[section] if section < self.store.n_cols else ""
+        return str(section)
+
+    # ---------- operaciones sobre el almacenamiento ----------
+    def _shape_changed(self, old_rows, old_cols):
+        """Avisa a la vista si el almacenamiento creció más allá de la grilla mostrada."""
+        rows, cols = self.rowCount(), self.columnCount()
+        if rows > old_rows:
+            self.beginInsertRows(QtCore.QModelIndex(), old_rows, rows - 1)
+            self.endInsertRows()
+        if cols > old_cols:
+            self.beginInsertColumns(QtCore.QModelIndex(), old_cols, cols - 1)
+            self.endInsertColumns()
+
+    def reset_store(self, store=None):
+        """Reemplaza/recarga todo el contenido (una sola notificación a la vista)."""
+        self.beginResetModel()
+        if store is not None:
+            self.store = store
+        self.endResetModel()
+
+    def append_rows(self, block, strings=None):
+        """
+        Agrega filas al final en una sola inserción (import por bloques, registro).
+        strings: {(fila relativa al bloque, col): texto} para celdas no numéricas.
+        """
+        rows, cols = self.rowCount(), self.columnCount()
+        r0 = self.store.append_rows(block)
+        if strings:
+            self.store.strings.update({(r0 + r, c): t for (r, c), t in strings.items()})
+        if self.store.n_rows > rows or self.store.n_cols > cols:
+            self._shape_changed(rows, cols)
+        # filas que ya estaban en la grilla mínima y ahora tienen datos
+        last = min(self.store.n_rows, rows) - 1
+        if r0 <= last:
+            self.dataChanged.emit(self.index(r0, 0), self.index(last, self.columnCount() - 1))
+        return r0
+
+    def set_block(self, r0, c0, rows):
+        """Pega un bloque de textos en (r0, c0): una sola notificación a la vista."""
+        n_rows = len(rows)
+        n_cols = max((len(row) for row in rows), default=0)
+        if not n_rows or not n_cols:
+            return
+        old_rows, old_cols = self.rowCount(), self.columnCount()
+        self.store.set_block(r0, c0, rows)
+        self._shape_changed(old_rows, old_cols)
+        self.dataChanged.emit(self.index(r0, c0), self.index(r0 + n_rows - 1, c0 + n_cols - 1))
+
+    def clear_range(self, r0, c0, r1, c1):
+        """Vacía un rango de celdas (cortar / suprimir)."""
+        self.store.clear_range(r0, c0, r1, c1)
+        self.dataChanged.emit(self.index(r0, c0), self.index(r1, c1))
+
+    def insert_rows(self, at, count=1):
+        """Inserta filas vacías antes de 'at' (las filas de abajo bajan)."""
+        at = max(at, 0)
+        before = self.rowCount()
+        if at > self.store.n_rows:
+            self.store.ensure_shape(at, self.store.n_cols)
+        grown = max(self.store.n_rows + count, self.MIN_ROWS) - before
+        if grown > 0:
+            self.beginInsertRows(QtCore.QModelIndex(), at, at + grown - 1)
+        self.store.insert_rows(at, count)
+        if grown > 0:
+            self.endInsertRows()
+        self._changed_from(at)
+
+    def remove_rows(self, at, count=1):
+        """Elimina filas de datos a partir de 'at' (la grilla mínima se mantiene)."""
+        if at < 0 or at >= self.store.n_rows:
+            return
+        count = min(count, self.store.n_rows - at)
+        shrink = self.rowCount() - max(self.store.n_rows - count, self.MIN_ROWS)
+        if shrink > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), at, at + shrink - 1)
+        self.store.remove_rows(at, count)
+        if shrink > 0:
+            self.endRemoveRows()
+        self._changed_from(at)
+
+    def _changed_from(self, row):
+        """Las filas desde 'row' hasta el final pueden haber cambiado de contenido."""
+        last = self.rowCount() - 1
+        if row <= last:
+            self.dataChanged.emit(self.index(row, 0), self.index(last, self.columnCount() - 1))
@@ -1,10 +1,30 @@
+import time
 from PySide6 import QtWidgets, QtGui, QtCore
+from utils.column_store import ColumnStore
+from utils.channel_registry import REGISTRY
+from utils.meter_logger import MeterLogger
+from widgets.data_table_model import ColumnTableModel
+from widgets.table_workers import CsvImportThread, TableExportThread, PdfReportThread
+from utils.table_io import sniff_csv, load_binary
 
 
 class DataTableWidget(QtWidgets.QWidget):
 
+    # grabación de medidores: se pide/deja de pedir lecturas a la ventana principal
+    recording_changed = QtCore.Signal(bool)
+    RECORD_REFRESH_HZ = 4
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._import_thread = None
+        self._export_thread = None
+        self.logger = None
+        self._row_logger = None    # filas a pedido sin grabación en curso
+        self.record_timer = QtCore.QTimer(self)
+        self.record_timer.setInterval(int(1000 / self.RECORD_REFRESH_HZ))
+        self.record_timer.timeout.connect(self._flush_recording)
+        # callable opcional -> ({medidor: texto}, [QImage]) para el informe PDF
+        self.report_provider = None
         self._build_ui()
 
     def _build_ui(self):
@@ -89,18 +109,49 @@ class DataTableWidget(QtWidgets.QWidget):
         act_graph.triggered.connect(self.open_graph)
         toolbar.addAction(act_graph)
 
+        toolbar.addSeparator()
 
+        # ⏺ Grabar lecturas de los medidores
+        self.act_record = QtGui.QAction("⏺", self)
+        self.act_record.setCheckable(True)
+        self.act_record.setToolTip("Grabar lecturas de los medidores")
+        self.act_record.toggled.connect(self._on_record_toggled)
+        toolbar.addAction(self.act_record)
+
+        # registrar una fila a pedido
+        act_record_row = QtGui.QAction("⏺1", self)
+        act_record_row.setToolTip("Registrar una fila ahora")
+        act_record_row.triggered.connect(self.record_row)
+        toolbar.addAction(act_record_row)
+
+        # intervalo de grabación (0 = solo a pedido)
+        self.interval_spin = QtWidgets.QDoubleSpinBox()
+        self.interval_spin.setRange(0.0, 3600.0)
+        self.interval_spin.setDecimals(1)
+        self.interval_spin.setSingleStep(0.1)
+        self.interval_spin.setValue(1.0)
+        self.interval_spin.setSuffix(" s")
+        self.interval_spin.setToolTip("Intervalo de grabación (0 = solo a pedido)")
+        self.interval_spin.valueChanged.connect(self._on_interval_changed)
+        toolbar.addWidget(self.interval_spin)
 
         layout.addWidget(toolbar)
 
         # =========================
         # TABLA
         # =========================
-        self.table = QtWidgets.QTableWidget(50, 10)
+        # vista virtual sobre un modelo por columnas (NumPy): solo se formatean
+        # las celdas visibles
+        self.model = ColumnTableModel()
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.model)
+        # filas de alto fijo: la vista no mide cada fila al desplazarse
+        self.table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
 
         # estilo Win95
         self.table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background: #ffffff;
                 gridline-color: #a0a0a0;
                 border: 2px solid #808080;
@@ -112,13 +163,6 @@ class DataTableWidget(QtWidgets.QWidget):
             }
         """)
 
-        # encabezados
-        for col in range(10):
-            self.table.setHorizontalHeaderItem(col, QtWidgets.QTableWidgetItem(""))
-
-        for row in range(50):
-            self.table.setVerticalHeaderItem(row, QtWidgets.QTableWidgetItem(str(row)))
-
         self.table.horizontalHeader().setStretchLastSection(True)
 
         layout.addWidget(self.table)
@@ -139,7 +183,17 @@ class DataTableWidget(QtWidgets.QWidget):
         # =========================
         # EVENTO DE SELECCIÓN
         # =========================
-        self.table.currentCellChanged.connect(self.update_status)
+        self.table.selectionModel().currentChanged.connect(
+            lambda cur, _prev: self.update_status(cur.row(), cur.column())
+        )
+
+    @property
+    def store(self):
+        return self.model.store
+
+    @property
+    def recording(self):
+        return self.logger is not None
 
     def update_status(self, row, col, *_):
         self.status_label.setText(f"Fila: {row}   Col: {col}")
@@ -150,41 +204,124 @@ class DataTableWidget(QtWidgets.QWidget):
     # =========================
 
     def new_table(self):
-        self.table.clearContents()
+        self._row_logger = None
+        self.model.reset_store(ColumnStore())
 
 
     def open_file(self):
         path, _ = QtWidgets.QFileDialog.getOpenFileName(
-            self, "Abrir archivo", "", "CSV (*.csv);;Excel (*.xlsx)"
+            self, "Abrir archivo", "", "CSV (*.csv);;Binario columnar (*.npz);;Excel (*.xlsx)"
         )
         if not path:
             return
 
-        import csv
         if path.endswith(".csv"):
-            with open(path, newline="") as f:
-                reader = csv.reader(f)
-                for r, row in enumerate(reader):
-                    for c, val in enumerate(row):
-                        self.table.setItem(r, c, QtWidgets.QTableWidgetItem(val))
+            self.import_csv(path)
+        elif path.endswith(".npz"):
+            try:
+                store = ColumnStore.from_columns(*load_binary(path))
+            except Exception as e:
+                # .npz dañado o de otro tipo (por ejemplo, memorias del osciloscopio)
+                QtWidgets.QMessageBox.warning(self, "Abrir archivo", f"No se pudo leer el archivo:\n{e}")
+                return
+            self.model.reset_store(store)
+
+
+    def import_csv(self, path):
+        """
+        Importa un CSV en segundo plano: el hilo lee y convierte por bloques y cada
+        bloque se agrega al modelo en una sola inserción. Se puede cancelar (quedan
+        las filas ya leídas). La tabla actual se reemplaza recién con el primer bloque
+        bueno: si el archivo no se puede leer, queda como estaba.
+        """
+        if self._import_thread is not None:
+            return
+
+        info = sniff_csv(path)
+        store = ColumnStore()
+        if info["headers"]:
+            store.set_headers(info["headers"])
+        failed = []
+
+        def add_chunk(block, strings):
+            if self.model.store is not store:
+                self.model.reset_store(store)
+            self.model.append_rows(block, strings)
+
+        def on_failed(msg):
+            failed.append(msg)
+            QtWidgets.QMessageBox.warning(self, "Abrir archivo", f"No se pudo leer el archivo:\n{msg}")
+
+        progress = QtWidgets.QProgressDialog("Importando datos...", "Cancelar", 0, 100, self)
+        progress.setWindowTitle("Abrir archivo")
+        progress.setMinimumDuration(300)
+
+        thread = CsvImportThread(path, info, self)
+        thread.chunk_ready.connect(add_chunk)
+        thread.progress.connect(progress.setValue)
+        thread.failed.connect(on_failed)
+        progress.canceled.connect(thread.cancel)
+
+        def finished():
+            state = "fallida" if failed else "cancelada" if thread.cancelled else "completa"
+            progress.canceled.disconnect(thread.cancel)
+            progress.close()
+            if self.model.store is not store and not failed and not thread.cancelled:
+                # archivo sin filas (solo encabezados): igual es la tabla nueva
+                self.model.reset_store(store)
+            rows = store.n_rows if self.model.store is store else 0
+            self.status_label.setText(f"Importación {state}: {rows} filas")
+            self._import_thread = None
+            thread.deleteLater()
+
+        thread.finished.connect(finished)
+        self._import_thread = thread
+        thread.start()
 
 
     def save_file(self):
-        path, _ = QtWidgets.QFileDialog.getSaveFileName(
-            self, "Guardar archivo", "", "CSV (*.csv)"
+        path, selected = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Guardar archivo", "", "CSV (*.csv);;Binario columnar (*.npz)"
         )
         if not path:
             return
 
-        import csv
-        with open(path, "w", newline="") as f:
-            writer = csv.writer(f)
-            for r in range(self.table.rowCount()):
-                row_data = []
-                for c in range(self.table.columnCount()):
-                    item = self.table.item(r, c)
-                    row_data.append(item.text() if item else "")
-                writer.writerow(row_data)
+        binary = path.endswith(".npz") or (selected.startswith("Binario") and not path.endswith(".csv"))
+        if binary and not path.endswith(".npz"):
+            path += ".npz"
+        self.export_table(path, binary)
+
+
+    def export_table(self, path, binary=False):
+        """
+        Exporta la tabla en segundo plano. Se toma una copia de las columnas en el
+        momento (la tabla puede seguir cambiando mientras se escribe).
+        """
+        if self._export_thread is not None:
+            return
+
+        progress = QtWidgets.QProgressDialog("Guardando datos...", "Cancelar", 0, 100, self)
+        progress.setWindowTitle("Guardar archivo")
+        progress.setMinimumDuration(300)
+
+        thread = TableExportThread(path, self.store.snapshot(), binary, self)
+        thread.progress.connect(progress.setValue)
+        thread.failed.connect(
+            lambda msg: QtWidgets.QMessageBox.warning(self, "Guardar archivo", f"No se pudo guardar:\n{msg}")
+        )
+        progress.canceled.connect(thread.cancel)
+
+        def finished():
+            state = "cancelada" if thread.cancelled else "completa"
+            progress.canceled.disconnect(thread.cancel)
+            progress.close()
+            self.status_label.setText(f"Exportación {state}: {path}")
+            self._export_thread = None
+            thread.deleteLater()
+
+        thread.finished.connect(finished)
+        self._export_thread = thread
+        thread.start()
 
 
     def export_pdf(self):
@@ -193,78 +330,221 @@ class DataTableWidget(QtWidgets.QWidget):
         )
         if not path:
             return
+        if not path.endswith(".pdf"):
+            path += ".pdf"
+        self.export_report(path)
+
+
+    def export_report(self, path):
+        """
+        Informe PDF paginado en segundo plano (página por página, encabezado repetido).
+        Si hay report_provider, se agregan al principio las lecturas de los medidores
+        y las capturas de los gráficos en ese momento.
+        """
+        if self._export_thread is not None:
+            return
 
-        printer = QtGui.QPageLayout()
-        doc = QtGui.QTextDocument()
-
-        html = "<table border='1' cellspacing='0' cellpadding='2'>"
+        meters, images = self.report_provider() if self.report_provider else (None, ())
 
-        for r in range(self.table.rowCount()):
-            html += "<tr>"
-            for c in range(self.table.columnCount()):
-                item = self.table.item(r, c)
-                val = item.text() if item else ""
-                html += f"<td>{val}</td>"
-            html += "</tr>"
+        progress = QtWidgets.QProgressDialog("Generando informe...", "Cancelar", 0, 100, self)
+        progress.setWindowTitle("Exportar PDF")
+        progress.setMinimumDuration(300)
 
-        html += "</table>"
+        thread = PdfReportThread(path, self.store.snapshot(), meters, images, self)
+        thread.progress.connect(progress.setValue)
+        thread.failed.connect(
+            lambda msg: QtWidgets.QMessageBox.warning(self, "Exportar PDF", f"No se pudo generar el PDF:\n{msg}")
+        )
+        progress.canceled.connect(thread.cancel)
 
-        doc.setHtml(html)
+        def finished():
+            state = "cancelado" if thread.cancelled else "completo"
+            progress.canceled.disconnect(thread.cancel)
+            progress.close()
+            self.status_label.setText(f"Informe {state}: {path}")
+            self._export_thread = None
+            thread.deleteLater()
 
-        printer = QtGui.QPdfWriter(path)
-        doc.print(printer)
+        thread.finished.connect(finished)
+        self._export_thread = thread
+        thread.start()
 
 
     def insert_row(self):
-        row = self.table.currentRow()
-        self.table.insertRow(row + 1)
+        """Inserta debajo de la selección tantas filas como filas seleccionadas."""
+        selected = self._selected_range()
+        if selected:
+            r0, _, r1, _ = selected
+            self.model.insert_rows(r1 + 1, r1 - r0 + 1)
+        else:
+            self.model.insert_rows(self.table.currentIndex().row() + 1)
 
 
     def delete_row(self):
-        row = self.table.currentRow()
-        self.table.removeRow(row)
+        """Elimina las filas de todos los rangos seleccionados (un bloque por tramo)."""
+        ranges = self._selected_ranges()
+        if not ranges:
+            self.model.remove_rows(self.table.currentIndex().row())
+            return
+        # tramos de filas unidos y de abajo hacia arriba (así los índices no se corren)
+        spans = []
+        for r0, _, r1, _ in sorted(ranges):
+            if spans and r0 <= spans[-1][1] + 1:
+                spans[-1][1] = max(spans[-1][1], r1)
+            else:
+                spans.append([r0, r1])
+        for r0, r1 in reversed(spans):
+            self.model.remove_rows(r0, r1 - r0 + 1)
 
 
-    def copy_cells(self):
-        selected = self.table.selectedRanges()
-        if not selected:
-            return
+    def _selected_ranges(self):
+        """(fila0, col0, fila1, col1) de cada rango seleccionado (Ctrl+clic arma varios)."""
+        return [(rng.top(), rng.left(), rng.bottom(), rng.right())
+                for rng in self.table.selectionModel().selection()]
 
-        r = selected[0]
-        text = ""
+    def _selected_range(self):
+        """El primer rango seleccionado, o None (copiar lleva un solo bloque)."""
+        ranges = self._selected_ranges()
+        return ranges[0] if ranges else None
 
-        for i in range(r.topRow(), r.bottomRow() + 1):
-            row_text = []
-            for j in range(r.leftColumn(), r.rightColumn() + 1):
-                item = self.table.item(i, j)
-                row_text.append(item.text() if item else "")
-            text += "\t".join(row_text) + "\n"
 
-        QtWidgets.QApplication.clipboard().setText(text)
+    def copy_cells(self):
+        selected = self._selected_range()
+        if not selected:
+            return
+        QtWidgets.QApplication.clipboard().setText(self.store.text_block(*selected))
 
 
     def cut_cells(self):
+        """Copia el primer rango y vacía todos los seleccionados."""
+        ranges = self._selected_ranges()
+        if not ranges:
+            return
         self.copy_cells()
-        for item in self.table.selectedItems():
-            item.setText("")
+        for selected in ranges:
+            self.model.clear_range(*selected)
 
 
     def paste_cells(self):
+        """
+        Pega el portapapeles (una fila por línea, columnas separadas por tab) desde
+        la celda actual en una sola operación; si no entra, la tabla crece.
+        """
         text = QtWidgets.QApplication.clipboard().text()
-        row = self.table.currentRow()
-        col = self.table.currentColumn()
-
-        for r, line in enumerate(text.split("\n")):
-            for c, val in enumerate(line.split("\t")):
-                self.table.setItem(row + r, col + c, QtWidgets.QTableWidgetItem(val))
+        if not text:
+            return
+        lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        if lines and lines[-1] == "":
+            lines.pop()
+        current = self.table.currentIndex()
+        row = max(current.row(), 0)
+        col = max(current.column(), 0)
+        self.model.set_block(row, col, [line.split("\t") for line in lines])
 
 
     def clear_table(self):
-        self.table.clearContents()
+        self._row_logger = None
+        self.model.reset_store(ColumnStore())
+
+
+    # =========================
+    # GRABACIÓN DE MEDIDORES
+    # =========================
+
+    def record_keys(self):
+        """Claves de los medidores que se graban (canales habilitados, orden del panel)."""
+        return self.logger.keys if self.logger else [ch.key for ch in REGISTRY.enabled() if ch.meter]
+
+    def _on_record_toggled(self, checked):
+        if checked:
+            self.start_recording()
+        else:
+            self.stop_recording()
+
+    def _on_interval_changed(self, value):
+        if self.logger:
+            self.logger.interval = value
+
+    def start_recording(self, interval=None):
+        """
+        Empieza a grabar: una fila [t, medidores...] cada 'interval' segundos (por
+        defecto el del selector; 0 = solo a pedido) al final de la tabla. Si la tabla
+        está vacía se ponen los encabezados de los medidores.
+        """
+        if self.logger:
+            return
+        if interval is None:
+            interval = self.interval_spin.value()
+        self._row_logger = None
+        self.logger = self._new_logger(interval)
+        self.record_timer.start()
+        self.act_record.setChecked(True)
+        self.recording_changed.emit(True)
+
+    def stop_recording(self):
+        if not self.logger:
+            return
+        self.record_timer.stop()
+        self._flush_recording()
+        self.logger = None
+        self.act_record.setChecked(False)
+        self.status_label.setText(f"Grabación detenida: {self.store.n_rows} filas")
+        self.recording_changed.emit(False)
+
+    def _new_logger(self, interval):
+        """MeterLogger de los medidores habilitados; si la tabla está vacía, pone los encabezados."""
+        channels = [ch for ch in REGISTRY.enabled() if ch.meter]
+        if self.store.n_rows == 0:
+            self.store.set_headers(["t (s)"] + [f"{ch.meter} ({ch.unit})" for ch in channels])
+            self.model.headerDataChanged.emit(QtCore.Qt.Horizontal, 0, len(channels))
+        logger = MeterLogger([ch.key for ch in channels], interval)
+        logger.start(time.monotonic())
+        return logger
+
+    def feed_readings(self, readings):
+        """Lecturas de un bloque (desde la ventana principal); solo se acumulan."""
+        if self.logger:
+            self.logger.add(readings, time.monotonic())
+        elif self._row_logger:
+            # promedia hasta la próxima fila a pedido; una pedida sin lecturas entra ahora
+            self._row_logger.add(readings, time.monotonic())
+            self._append_logged(self._row_logger, "Fila registrada")
+
+    def record_row(self):
+        """
+        Registra una fila a pedido. Sin grabación en curso la fila se agrega sola (el
+        promedio desde la fila a pedido anterior, t desde la primera) y la grabación
+        sigue detenida.
+        """
+        if self.logger:
+            self.logger.sample(time.monotonic())
+            self._flush_recording()
+            return
+        if self._row_logger is None:
+            self._row_logger = self._new_logger(0)
+        self._row_logger.sample(time.monotonic())
+        self._append_logged(self._row_logger, "Fila registrada")
+
+    def _flush_recording(self):
+        """Inserta en la tabla todas las filas pendientes de una vez."""
+        if self.logger:
+            self._append_logged(self.logger, "Grabando")
+
+    def _append_logged(self, logger, state):
+        block = logger.take()
+        if block is None:
+            return
+        bar = self.table.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum()
+        self.model.append_rows(block)
+        # solo se sigue el final si el usuario no se fue a mirar otra parte
+        if at_bottom:
+            self.table.scrollToBottom()
+        self.status_label.setText(f"{state}: {self.store.n_rows} filas")
 
 
     def open_graph(self):
         from widgets.graph_widget import GraphWindow
 
-        self.graph_window = GraphWindow()
+        self.graph_window = GraphWindow(self.model)
         self.graph_window.show()
\ No newline at end of file
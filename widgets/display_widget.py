@@ -2,10 +2,7 @@
 # Display final 200x200 (LCD y dígitos mantienen tamaño actual), editable expandible,
 # unidad con misma anchura que editable (texto a la derecha), botón vacío para 'N'.
 from PySide6 import QtWidgets, QtGui, QtCore
-import os
-
-# Ruta absoluta a la fuente (confirmada por el usuario)
-_FONT_ABS_PATH = r"C:\Users\Tepsi\Documents\LabVolt_Project\fonts\digital-7.ttf"
+from utils.resources import font, lcd_font, style
 
 class ClickableLabel(QtWidgets.QLabel):
     """QLabel que emite clicked() al pulsar (usado para nombre del display)."""
@@ -14,20 +11,6 @@ class ClickableLabel(QtWidgets.QLabel):
         super().mousePressEvent(event)
         self.clicked.emit()
 
-def _load_7seg_font():
-    """Intenta cargar la fuente 7-seg desde la ruta absoluta. Devuelve family o None."""
-    try:
-        p = os.path.normpath(_FONT_ABS_PATH)
-        if os.path.exists(p):
-            font_id = QtGui.QFontDatabase.addApplicationFont(p)
-            if font_id != -1:
-                families = QtGui.QFontDatabase.applicationFontFamilies(font_id)
-                if families:
-                    return families[0]
-    except Exception:
-        pass
-    return None
-
 class DisplayWidget(QtWidgets.QFrame):
     """
     Display compacto cuadrado 200x200:
@@ -51,7 +34,9 @@ class DisplayWidget(QtWidgets.QFrame):
 
         # estado interno y modos disponibles
         self.value_visible = True
+        self._forced_off = False
         self._last_value = None
+        self._shown_text = None
         self._mode_index = 0
         self._modes = {
             "ca_cc": (["CA", "CC"], [self.unit_base, self.unit_base]),
@@ -61,9 +46,6 @@ class DisplayWidget(QtWidgets.QFrame):
             "none_with_button": ([""], [self.unit_base]),
         }
 
-        # cargo la fuente 7-seg (si existe)
-        self._seven_family = _load_7seg_font()
-
         # construyo UI y fijo tamaño cuadrado 200x200
         self._build_ui()
         self.setFixedSize(200, 200)
@@ -72,7 +54,7 @@ class DisplayWidget(QtWidgets.QFrame):
         # panel con fondo gris claro
         self.setFrameShape(QtWidgets.QFrame.Panel)
         self.setLineWidth(2)
-        self.setStyleSheet("QFrame { background: #E6E6E6; }")
+        self.setStyleSheet(style("panel"))
 
         # layout vertical principal
         vbox = QtWidgets.QVBoxLayout(self)
@@ -86,13 +68,8 @@ class DisplayWidget(QtWidgets.QFrame):
         # NAME: ancho fijo, clicable, estilo hundido
         self.name_label = ClickableLabel(self.id_label)
         self.name_label.setFixedWidth(44)
-        f_title = QtGui.QFont("Arial", 9, QtGui.QFont.Bold)
-        self.name_label.setFont(f_title)
-        self.name_label.setStyleSheet(
-            "QLabel { background: #f0f0f0; color: %s; padding:2px; "
-            "border-top: 2px solid #ffffff; border-left: 2px solid #ffffff; "
-            "border-bottom: 2px solid #7a7a7a; border-right: 2px solid #7a7a7a; }" % self.title_color
-        )
+        self.name_label.setFont(font("Arial", 9, bold=True))
+        self.name_label.setStyleSheet(style("title", color=self.title_color))
         self.name_label.setAlignment(QtCore.Qt.AlignCenter)
         self.name_label.clicked.connect(self._on_name_clicked)
 
@@ -103,11 +80,7 @@ class DisplayWidget(QtWidgets.QFrame):
         # expandible: ocupa el espacio restante de la fila superior
         self.edit_label.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
         self.edit_label.setAlignment(QtCore.Qt.AlignCenter)  # texto centrado
-        self.edit_label.setStyleSheet(
-            "QLineEdit { background: #f0f0f0; padding:2px; "
-            "border-top: 2px solid #ffffff; border-left: 2px solid #ffffff; "
-            "border-bottom: 2px solid #7a7a7a; border-right: 2px solid #7a7a7a; }"
-        )
+        self.edit_label.setStyleSheet(style("edit"))
 
         top_row.addWidget(self.name_label)
         top_row.addWidget(self.edit_label)   # expandible por defecto
@@ -118,24 +91,11 @@ class DisplayWidget(QtWidgets.QFrame):
         self.value_label = QtWidgets.QLabel(" 0.000 ", alignment=QtCore.Qt.AlignCenter)
         self.value_label.setFixedHeight(lcd_height)
 
-        # fuente: misma que ya tienes (mantener tamaño actual)
-        if self._seven_family:
-            lcd_font = QtGui.QFont(self._seven_family, 45)
-            # intento activar cursiva — la fuente puede o no soportarla
-            lcd_font.setItalic(True)
-        else:
-            lcd_font = QtGui.QFont("Courier", 40, QtGui.QFont.Bold)
-            lcd_font.setItalic(True)
-        self.value_label.setFont(lcd_font)
+        # fuente: misma que ya tienes (mantener tamaño actual), compartida entre displays
+        self.value_label.setFont(lcd_font())
 
         # estilo LCD verde con borde tipo inset
-        lcd_css = (
-            "QLabel { color: #00ff66; "
-            "background: qlineargradient(x1:0,y1:0,x2:0,y2:1, stop:0 #006e2d, stop:1 #004616); "
-            "border-top: 2px solid #a8e0b8; border-left: 2px solid #a8e0b8; "
-            "border-bottom: 2px solid #08381f; border-right: 2px solid #08381f; padding:4px; }"
-        )
-        self.value_label.setStyleSheet(lcd_css)
+        self.value_label.setStyleSheet(style("lcd_on"))
         vbox.addWidget(self.value_label, stretch=1)
 
         # ---------- BOTTOM ROW: [MODE BUTTON] [UNIT (same width as editable)] ----------
@@ -145,13 +105,8 @@ class DisplayWidget(QtWidgets.QFrame):
         # boton modo: ancho fijo (consistente con name_label)
         self.mode_button = QtWidgets.QPushButton()
         self.mode_button.setFixedSize(44, 22)
-        self.mode_button.setFont(QtGui.QFont("Arial", 8))
-        self.mode_button.setStyleSheet(
-            "QPushButton { background:#f0f0f0; border-top:2px solid #ffffff; border-left:2px solid #ffffff; "
-            "border-bottom:2px solid #7a7a7a; border-right:2px solid #7a7a7a; }"
-            "QPushButton:pressed { border-top:2px solid #7a7a7a; border-left:2px solid #7a7a7a; "
-            "border-bottom:2px solid #ffffff; border-right:2px solid #ffffff; }"
-        )
+        self.mode_button.setFont(font("Arial", 8))
+        self.mode_button.setStyleSheet(style("mode_button"))
         # Conexión del botón (salvo si es 'none_with_button')
         self.mode_button.clicked.connect(self._on_mode_clicked)
 
@@ -161,11 +116,7 @@ class DisplayWidget(QtWidgets.QFrame):
         self.unit_label.setFixedHeight(20)
         self.unit_label.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
         self.unit_label.setAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter)  # texto a la derecha
-        self.unit_label.setStyleSheet(
-            "QLabel { background: #f0f0f0; padding-right:6px; "
-            "border-top: 2px solid #ffffff; border-left: 2px solid #ffffff; "
-            "border-bottom: 2px solid #7a7a7a; border-right: 2px solid #7a7a7a; }"
-        )
+        self.unit_label.setStyleSheet(style("unit"))
 
         bottom_row.addWidget(self.mode_button)
         bottom_row.addWidget(self.unit_label)
@@ -189,32 +140,31 @@ class DisplayWidget(QtWidgets.QFrame):
         self.value_visible = not self.value_visible
         if not self.value_visible:
             # Apagar SOLO el LCD
-            self.value_label.setStyleSheet("QLabel { background: black; color: black; border:2px solid #111; }")
-            self.value_label.setText("")
+            self._lcd_off()
         else:
-            # Restaurar font y estilo LCD (mismo tamaño)
-            if self._seven_family:
-                f = QtGui.QFont(self._seven_family, 45)
-                f.setItalic(True)
-                self.value_label.setFont(f)
-            else:
-                f = QtGui.QFont("Courier", 40, QtGui.QFont.Bold)
-                f.setItalic(True)
-                self.value_label.setFont(f)
-            lcd_css = (
-                "QLabel { color: #00ff66; "
-                "background: qlineargradient(x1:0,y1:0,x2:0,y2:1, stop:0 #006e2d, stop:1 #004616); "
-                "border-top: 2px solid #a8e0b8; border-left: 2px solid #a8e0b8; "
-                "border-bottom: 2px solid #08381f; border-right: 2px solid #08381f; padding:4px; }"
-            )
-            self.value_label.setStyleSheet(lcd_css)
-            if self._last_value is None:
-                self.value_label.setText(" 0.000 ")
-            else:
-                try:
-                    self.value_label.setText(f"{self._last_value:7.3f}")
-                except Exception:
-                    self.value_label.setText(str(self._last_value))
+            self._lcd_on()
+
+    def _lcd_off(self):
+        self.value_label.setStyleSheet(style("lcd_off"))
+        self._set_text("")
+
+    def _lcd_on(self):
+        """Restaura estilo LCD (la fuente no cambia) y el último valor."""
+        self.value_label.setStyleSheet(style("lcd_on"))
+        self._set_text(" 0.000 " if self._last_value is None else self._format(self._last_value))
+
+    @staticmethod
+    def _format(value):
+        try:
+            return f"{value:7.3f}"
+        except Exception:
+            return str(value)
+
+    def _set_text(self, text):
+        """setText solo si el texto visible cambia."""
+        if text != self._shown_text:
+            self._shown_text = text
+            self.value_label.setText(text)
 
     def _on_mode_clicked(self):
         # Si es 'none_with_button' no hace nada
@@ -237,41 +187,23 @@ class DisplayWidget(QtWidgets.QFrame):
         if not getattr(self, "value_visible", True):
             return
         if self._last_value is None:
-            self.value_label.setText("   -   ")
+            self._set_text("   -   ")
         else:
-            try:
-                self.value_label.setText(f"{self._last_value:7.3f}")
-            except Exception:
-                self.value_label.setText(str(self._last_value))
+            self._set_text(self._format(self._last_value))
+
+    def shown_value(self):
+        """Valor que muestra el LCD (None si está apagado o sin lectura)."""
+        return None if self._forced_off else self._last_value
 
     def set_force_off(self, enable=True):
-        """Forzar LCD apagado/encendido."""
+        """Forzar LCD apagado/encendido (solo hace algo en la transición)."""
+        enable = bool(enable)
+        if enable == self._forced_off:
+            return
+        self._forced_off = enable
         if enable:
             self.value_visible = False
-            self.value_label.setStyleSheet("QLabel { background: black; color: black; border:2px solid #111; }")
-            self.value_label.setText("")
+            self._lcd_off()
         else:
             self.value_visible = True
-            if self._seven_family:
-                f = QtGui.QFont(self._seven_family, 45)
-                f.setItalic(True)
-                self.value_label.setFont(f)
-            else:
-                f = QtGui.QFont("Courier", 40, QtGui.QFont.Bold)
-                f.setItalic(True)
-                self.value_label.setFont(f)
-            lcd_css = (
-                "QLabel { color: #00ff66; "
-                "background: qlineargradient(x1:0,y1:0,x2:0,y2:1, stop:0 #006e2d, stop:1 #004616); "
-                "border-top: 2px solid #a8e0b8; border-left: 2px solid #a8e0b8; "
-                "border-bottom: 2px solid #08381f; border-right: 2px solid #08381f; padding:4px; }"
-            )
-            self.value_label.setStyleSheet(lcd_css)
-            if self._last_value is None:
-                self.value_label.setText(" 0.000 ")
-            else:
-                try:
-                    self.value_label.setText(f"{self._last_value:7.3f}")
-                except Exception:
-                    self.value_label.setText(str(self._last_value))
-
+            self._lcd_on()
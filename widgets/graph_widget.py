@@ -1,88 +1,292 @@
 from PySide6 import QtWidgets, QtGui, QtCore
 import math
+import numpy as np
+from utils import curve_fit
+from utils.decimation import METHODS, decimate, is_monotonic, visible_range
+from utils.qt_arrays import polygon_from_xy
+
+# colores de las series (fondo verde azulado estilo LabVolt)
+SERIES_COLORS = ["#ffff00", "#ff4040", "#40ff40", "#ffffff", "#ff80ff",
+                 "#80c0ff", "#ffa040", "#c0c0c0", "#00ffff", "#ff0080"]
+FIT_COLOR = "#000000"       # curva ajustada (contrasta con la nube de puntos)
+
+
+def nice_step(span, target=8):
+    """Paso 1-2-5 x 10^k para ~'target' divisiones en 'span'."""
+    if span <= 0 or not math.isfinite(span):
+        return 1.0
+    raw = span / target
+    base = 10 ** math.floor(math.log10(raw))
+    for m in (1, 2, 5, 10):
+        if raw <= m * base:
+            return m * base
+    return 10 * base
 
 
 class GraphDisplay(QtWidgets.QWidget):
+    """
+    Área del gráfico. Las series se guardan completas (sin NaN); en cada repintado
+    se recorta el rango visible y se reduce a resolución de pantalla (ver
+    utils/decimation.py), así zoom y desplazamiento re-deciman desde los datos
+    originales. Rueda: zoom en X (Ctrl: en Y); arrastrar: desplazar; doble clic: ver todo.
+    Estilos de serie: "line" (trazo), "points" (nube de puntos, uno por píxel ocupado)
+    y "markers" (puntos gruesos, para pocos puntos como los promedios por intervalo).
+    """
+    MARGIN = 40
 
     def __init__(self):
         super().__init__()
         self.setMinimumSize(500, 400)
-
+        self.series = []            # (nombre, x, y, color, x monótona, estilo)
+        self.method = "minmax"
+        self.x_range = (0.0, 1.0)
+        self.y_range = (0.0, 1.0)
+        self._drag = None
+        self._cache_key = None
+        self._cache = []
+
+    # ---------- datos ----------
+    def set_series(self, series, keep_view=False):
+        """
+        series: lista de (nombre, x, y, color[, estilo]). Se descartan las filas con
+        NaN. keep_view=True mantiene el zoom (datos que se actualizan solos).
+        """
+        self.series = []
+        for name, x, y, color, *style in series:
+            x = np.asarray(x, dtype=float)
+            y = np.asarray(y, dtype=float)
+            ok = np.isfinite(x) & np.isfinite(y)
+            if not ok.all():
+                x, y = x[ok], y[ok]
+            self.series.append((name, x, y, QtGui.QColor(color), is_monotonic(x), style[0] if style else "line"))
+        if keep_view:
+            self._invalidate()
+        else:
+            self.autoscale()
+
+    def set_method(self, method):
+        self.method = method
+        self._invalidate()
+
+    def autoscale(self):
+        """Ajusta X e Y a todos los datos."""
+        if self.series:
+            xs = [s[1] for s in self.series if len(s[1])]
+            if xs:
+                self.x_range = self._padded(min(x.min() for x in xs), max(x.max() for x in xs), 0.0)
+        self.autoscale_y()
+
+    def autoscale_y(self):
+        """Ajusta Y a lo que se ve en el rango X actual."""
+        lo, hi = math.inf, -math.inf
+        x0, x1 = self.x_range
+        for _, x, y, _, mono, _ in self.series:
+            ys = y[visible_range(x, x0, x1, mono)]
+            if len(ys):
+                lo, hi = min(lo, ys.min()), max(hi, ys.max())
+        self.y_range = self._padded(lo, hi, 0.05) if lo <= hi else (0.0, 1.0)
+        self._invalidate()
+
+    @staticmethod
+    def _padded(lo, hi, pad):
+        if hi <= lo:
+            lo, hi = lo - 0.5, hi + 0.5
+        extra = (hi - lo) * pad
+        return float(lo - extra), float(hi + extra)
+
+    def _invalidate(self):
+        self._cache_key = None
+        self.update()
+
+    # ---------- geometría ----------
+    def _plot_rect(self):
+        m = self.MARGIN
+        return QtCore.QRectF(m + 20, m, self.width() - 2 * m - 20, self.height() - 2 * m)
+
+    def _to_data(self, pos):
+        rect = self._plot_rect()
+        (x0, x1), (y0, y1) = self.x_range, self.y_range
+        fx = (pos.x() - rect.left()) / rect.width()
+        fy = (rect.bottom() - pos.y()) / rect.height()
+        return x0 + fx * (x1 - x0), y0 + fy * (y1 - y0)
+
+    def _polylines(self, rect):
+        """Trazos en píxeles de cada serie (cacheados mientras no cambie la vista)."""
+        key = (self.x_range, self.y_range, rect.width(), rect.height(), self.method, len(self.series))
+        if key == self._cache_key:
+            return self._cache
+        (x0, x1), (y0, y1) = self.x_range, self.y_range
+        sx = rect.width() / (x1 - x0)
+        sy = rect.height() / (y1 - y0)
+        lines = []
+        for name, x, y, color, mono, style in self.series:
+            sel = visible_range(x, x0, x1, mono)
+            xs, ys = x[sel], y[sel]
+            if style == "line":
+                xs, ys = decimate(xs, ys, rect.width(), self.method)
+            px = rect.left() + (xs - x0) * sx
+            py = rect.bottom() - (ys - y0) * sy
+            if style == "points" and len(px) > rect.width():
+                # un punto por píxel ocupado: la nube se ve igual con mucho menos trabajo
+                inside = (py >= rect.top()) & (py <= rect.bottom())
+                px, py = px[inside], py[inside]
+                cells = np.unique(py.astype(np.int64) * (int(self.width()) + 1) + px.astype(np.int64))
+                px = (cells % (int(self.width()) + 1)).astype(float)
+                py = (cells // (int(self.width()) + 1)).astype(float)
+            lines.append((color, style, polygon_from_xy(px, py)))
+        self._cache_key, self._cache = key, lines
+        return lines
+
+    # ---------- dibujo ----------
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
 
-        w = self.width()
-        h = self.height()
-
-        # Fondo gris exterior
+        # Fondo exterior y área del gráfico
         painter.fillRect(self.rect(), QtGui.QColor("#0a7f7f"))
+        rect = self._plot_rect()
+        (x0, x1), (y0, y1) = self.x_range, self.y_range
 
-        # Área de gráfico (verde)
-        margin = 40
-        rect = QtCore.QRect(margin, margin, w - 2*margin, h - 2*margin)
-
-        painter.fillRect(rect, QtGui.QColor("#0a7f7f"))
-
-        # Ejes
         pen = QtGui.QPen(QtGui.QColor("white"))
         pen.setWidth(1)
         painter.setPen(pen)
-
-        # eje X
-        painter.drawLine(rect.left(), rect.bottom(), rect.right(), rect.bottom())
-
-        # eje Y
-        painter.drawLine(rect.left(), rect.top(), rect.left(), rect.bottom())
-
-        # ticks X
-        for i in range(21):
-            x = rect.left() + i * rect.width() / 20
-            painter.drawLine(int(x), rect.bottom() - 5, int(x), rect.bottom() + 5)
-
-        # ticks Y
-        for i in range(26):
-            y = rect.bottom() - i * rect.height() / 25
-            painter.drawLine(rect.left() - 5, int(y), rect.left() + 5, int(y))
-
-        # números
         font = painter.font()
         font.setBold(True)
         painter.setFont(font)
 
-        # eje X números
-        for i in range(5):
-            x = rect.left() + i * rect.width() / 4
-            painter.drawText(int(x), rect.bottom() + 15, str(i))
-
-        # eje Y números
-        for i in range(6):
-            y = rect.bottom() - i * rect.height() / 5
-            painter.drawText(rect.left() - 25, int(y), f"{i*0.2:.1f}")
+        # Ejes
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+        painter.drawLine(rect.topLeft(), rect.bottomLeft())
+
+        # divisiones y números (paso 1-2-5)
+        step = nice_step(x1 - x0)
+        v = math.ceil(x0 / step) * step
+        while v <= x1:
+            x = rect.left() + (v - x0) / (x1 - x0) * rect.width()
+            painter.drawLine(QtCore.QPointF(x, rect.bottom() - 5), QtCore.QPointF(x, rect.bottom() + 5))
+            painter.drawText(QtCore.QPointF(x - 10, rect.bottom() + 18), f"{v:.6g}")
+            v += step
+        step = nice_step(y1 - y0)
+        v = math.ceil(y0 / step) * step
+        while v <= y1:
+            y = rect.bottom() - (v - y0) / (y1 - y0) * rect.height()
+            painter.drawLine(QtCore.QPointF(rect.left() - 5, y), QtCore.QPointF(rect.left() + 5, y))
+            painter.drawText(QtCore.QRectF(0, y - 8, rect.left() - 8, 16),
+                             QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter, f"{v:.6g}")
+            v += step
+
+        # series
+        painter.setClipRect(rect)
+        for color, style, polyline in self._polylines(rect):
+            if style == "line":
+                painter.setPen(QtGui.QPen(color, 1))
+                painter.drawPolyline(polyline)
+            else:
+                pen = QtGui.QPen(color, 6 if style == "markers" else 1)
+                pen.setCapStyle(QtCore.Qt.RoundCap)
+                painter.setPen(pen)
+                painter.drawPoints(polyline)
+        painter.setClipping(False)
+
+        # leyenda
+        names = [(name, color) for name, _, _, color, _, _ in self.series if name]
+        for i, (name, color) in enumerate(names):
+            painter.setPen(color)
+            painter.drawText(QtCore.QPointF(rect.left() + 10, rect.top() + 16 + 16 * i), name)
+
+    # ---------- zoom / desplazamiento ----------
+    def wheelEvent(self, event):
+        factor = 0.8 ** (event.angleDelta().y() / 120)
+        cx, cy = self._to_data(event.position())
+        if event.modifiers() & QtCore.Qt.ControlModifier:
+            y0, y1 = self.y_range
+            self.y_range = (cy - (cy - y0) * factor, cy + (y1 - cy) * factor)
+        else:
+            x0, x1 = self.x_range
+            self.x_range = (cx - (cx - x0) * factor, cx + (x1 - cx) * factor)
+        self._invalidate()
+
+    def mousePressEvent(self, event):
+        if event.button() == QtCore.Qt.LeftButton:
+            self._drag = (event.position(), self.x_range, self.y_range)
+
+    def mouseMoveEvent(self, event):
+        if self._drag is None:
+            return
+        start, (x0, x1), (y0, y1) = self._drag
+        rect = self._plot_rect()
+        dx = (event.position().x() - start.x()) / rect.width() * (x1 - x0)
+        dy = (event.position().y() - start.y()) / rect.height() * (y1 - y0)
+        self.x_range = (x0 - dx, x1 - dx)
+        self.y_range = (y0 + dy, y1 + dy)
+        self._invalidate()
+
+    def mouseReleaseEvent(self, event):
+        self._drag = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.autoscale()
 
 
 class GraphWindow(QtWidgets.QMainWindow):
-
-    def __init__(self):
+    """
+    Gráfico de columnas de la tabla de datos: Eje X = número de muestra u otra
+    columna, Eje Y = columnas marcadas. Con otra columna en X es un gráfico X-Y
+    (curva característica): nube de puntos, promedios por intervalo y ajuste.
+    Los ajustes se cachean por versión de la tabla: solo se recalculan si cambian
+    los datos (se revisa una vez por segundo, así sigue a una grabación en curso).
+    """
+    REFRESH_MS = 1000
+
+    def __init__(self, model=None):
         super().__init__()
 
         self.setWindowTitle("Gráfico")
         self.resize(800, 500)
+        self.model = model
+        self._fits = {}
+        self._shown_version = None
 
         self._build_ui()
 
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.timeout.connect(self._refresh)
+        self.refresh_timer.start(self.REFRESH_MS)
+
+    @property
+    def store(self):
+        return self.model.store if self.model is not None else None
+
+    def _column_names(self):
+        if self.store is None:
+            return []
+        return [h or f"Col {c}" for c, h in enumerate(self.store.headers)]
+
     def _build_ui(self):
         # Menú tipo Win95
         menubar = self.menuBar()
         menubar.addMenu("Archivo")
-        menubar.addMenu("Ver")
+        view_menu = menubar.addMenu("Ver")
         menubar.addMenu("Opciones")
         menubar.addMenu("Ayuda")
 
+        # Ver -> método de reducción de puntos
+        group = QtGui.QActionGroup(self)
+        for method, text in METHODS.items():
+            act = view_menu.addAction(text)
+            act.setCheckable(True)
+            act.setChecked(method == "minmax")
+            act.triggered.connect(lambda _=False, m=method: self.graph.set_method(m))
+            group.addAction(act)
+
         # Toolbar simple
         toolbar = self.addToolBar("Tools")
         toolbar.addAction("📂")
-        toolbar.addAction("📊")
-        toolbar.addAction("📈")
+        act_fit_y = toolbar.addAction("📊")
+        act_fit_y.setToolTip("Ajustar Y a lo visible")
+        act_fit_y.triggered.connect(lambda: self.graph.autoscale_y())
+        act_fit = toolbar.addAction("📈")
+        act_fit.setToolTip("Ver todo")
+        act_fit.triggered.connect(lambda: self.graph.autoscale())
 
         # Layout principal
         central = QtWidgets.QWidget()
@@ -95,26 +299,141 @@ class GraphWindow(QtWidgets.QMainWindow):
         group_x = QtWidgets.QGroupBox("Eje X")
         gx_layout = QtWidgets.QVBoxLayout(group_x)
 
-        combo = QtWidgets.QComboBox()
-        combo.addItems(["Nro. de muestra"])
-        gx_layout.addWidget(combo)
+        self.x_combo = QtWidgets.QComboBox()
+        self.x_combo.currentIndexChanged.connect(self.replot)
+        gx_layout.addWidget(self.x_combo)
 
         left_panel.addWidget(group_x)
 
-        # Eje Y
+        # Eje Y (las casillas las arma _sync_columns)
         group_y = QtWidgets.QGroupBox("Eje Y")
-        gy_layout = QtWidgets.QGridLayout(group_y)
-
-        for i in range(10):
-            gy_layout.addWidget(QtWidgets.QCheckBox(f""), i, 0)
-            gy_layout.addWidget(QtWidgets.QCheckBox(f""), i, 1)
+        self.gy_layout = QtWidgets.QGridLayout(group_y)
+        self.y_checks = []
+        self._shown_names = None
 
         left_panel.addWidget(group_y)
 
+        # Ajuste (solo X-Y)
+        self.group_fit = QtWidgets.QGroupBox("Ajuste (X-Y)")
+        gf_layout = QtWidgets.QFormLayout(self.group_fit)
+
+        self.fit_combo = QtWidgets.QComboBox()
+        for method, text in curve_fit.METHODS.items():
+            self.fit_combo.addItem(text, method)
+        self.fit_combo.currentIndexChanged.connect(self.replot)
+        gf_layout.addRow("Curva:", self.fit_combo)
+
+        self.degree_spin = QtWidgets.QSpinBox()
+        self.degree_spin.setRange(1, 9)
+        self.degree_spin.setValue(2)
+        self.degree_spin.valueChanged.connect(self.replot)
+        gf_layout.addRow("Grado:", self.degree_spin)
+
+        self.bins_spin = QtWidgets.QSpinBox()
+        self.bins_spin.setRange(0, 500)
+        self.bins_spin.setSpecialValueText("No")
+        self.bins_spin.valueChanged.connect(self.replot)
+        gf_layout.addRow("Promediar en:", self.bins_spin)
+
+        left_panel.addWidget(self.group_fit)
+        left_panel.addStretch()
+
         layout.addLayout(left_panel, 1)
 
         # Área de gráfico
         self.graph = GraphDisplay()
         layout.addWidget(self.graph, 3)
 
-        self.setCentralWidget(central)
\ No newline at end of file
+        self.setCentralWidget(central)
+
+        self._sync_columns()
+        # por defecto: primera columna con datos contra nro. de muestra
+        if self.y_checks:
+            self.y_checks[0].setChecked(True)
+        self.group_fit.setEnabled(False)
+
+    def _sync_columns(self):
+        """
+        Rearma el selector de X y las casillas de Y si cambiaron las columnas de la
+        tabla (grabación, importación, tabla nueva). Conserva lo elegido por nombre.
+        Devuelve True si cambió algo.
+        """
+        names = self._column_names()
+        if names == self._shown_names:
+            return False
+        x_name = self.x_combo.currentText()
+        checked = {check.text() for check in self.y_checks if check.isChecked()}
+
+        self.x_combo.blockSignals(True)
+        self.x_combo.clear()
+        self.x_combo.addItems(["Nro. de muestra"] + names)
+        self.x_combo.setCurrentIndex(max(self.x_combo.findText(x_name), 0))
+        self.x_combo.blockSignals(False)
+
+        for check in self.y_checks:
+            self.gy_layout.removeWidget(check)
+            check.deleteLater()
+        self.y_checks = []
+        for i, name in enumerate(names):
+            check = QtWidgets.QCheckBox(name)
+            check.setChecked(name in checked)
+            check.toggled.connect(self.replot)
+            self.gy_layout.addWidget(check, i // 2, i % 2)
+            self.y_checks.append(check)
+        self._shown_names = names
+        return True
+
+    def _fit(self, x_col, y_col, x, y):
+        """
+        Ajuste de la columna y_col contra x_col, cacheado por la versión de esas dos
+        columnas: editar otra columna no obliga a recalcularlo.
+        """
+        store = self.store
+        key = (store.column_version(x_col), store.column_version(y_col), x_col, y_col,
+               self.fit_combo.currentData(), self.degree_spin.value(), self.bins_spin.value())
+        if key not in self._fits:
+            # entradas de versiones anteriores de sus columnas ya no sirven
+            self._fits = {k: v for k, v in self._fits.items()
+                          if k[2] < store.n_cols and k[3] < store.n_cols
+                          and k[:2] == (store.column_version(k[2]), store.column_version(k[3]))}
+            self._fits[key] = curve_fit.fit_curve(x, y, key[4], key[5], key[6])
+        return self._fits[key]
+
+    def replot(self, *_, keep_view=False):
+        """Vuelve a armar las series con las columnas elegidas (datos completos)."""
+        if self.store is None:
+            return
+        store = self.store
+        self._shown_version = store.version
+        n = store.n_rows
+        x_col = self.x_combo.currentIndex() - 1
+        if x_col >= store.n_cols:
+            # la columna elegida ya no existe (tabla nueva o borrada): vuelve a nro. de muestra
+            x_col = -1
+        xy = x_col >= 0
+        self.group_fit.setEnabled(xy)
+        x = store.column(x_col) if xy else np.arange(n, dtype=float)
+
+        series = []
+        for c, check in enumerate(self.y_checks):
+            if not check.isChecked() or c >= store.n_cols:
+                continue
+            color = SERIES_COLORS[c % len(SERIES_COLORS)]
+            y = store.column(c)
+            if not xy:
+                series.append((check.text(), x, y, color))
+                continue
+            fit = self._fit(x_col, c, x, y)
+            series.append((check.text(), x, y, color, "points"))
+            if fit["bins"] is not None:
+                series.append(("", *fit["bins"], "#ffffff", "markers"))
+            if fit["curve"] is not None:
+                series.append((f"  {fit['label']}", *fit["curve"], FIT_COLOR, "line"))
+        self.graph.set_series(series, keep_view=keep_view)
+
+    def _refresh(self):
+        """Sigue a la tabla: vuelve a dibujar si cambió (por ejemplo, grabando)."""
+        if self.store is None:
+            return
+        if self._sync_columns() or self.store.version != self._shown_version:
+            self.replot(keep_view=True)
@@ -1,7 +1,9 @@
 # widgets/measurement_widget.py
 # Contenedor 3x4 con los DisplayWidget (200x200).
-from PySide6 import QtWidgets
+import math
+from PySide6 import QtWidgets, QtCore
 from .display_widget import DisplayWidget
+from utils.meter_averaging import MeterAverager
 
 class MeasurementWidget(QtWidgets.QWidget):
     """
@@ -9,18 +11,29 @@ class MeasurementWidget(QtWidgets.QWidget):
     fila1: E1, E2, E3, T
     fila2: I1, I2, I3, N
     fila3: PQS1, PQS2, PQS3, Pm
+    Si hay más canales (EA-1..EA-8, ...) se agregan filas de 4.
+    Las lecturas por bloque entran con push_values() y el LCD se refresca a
+    'refresh_hz' con el promedio elegido (ver utils/meter_averaging.py).
     """
+    REFRESH_HZ = 4
+
     def __init__(self, channels_def, compact=True, parent=None):
         super().__init__(parent)
         self.channels = channels_def
         self.compact = compact
         self._build_ui()
 
+        self.averager = MeterAverager()
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.timeout.connect(self._refresh)
+        self.set_refresh_rate(self.REFRESH_HZ)
+
     def _build_ui(self):
         grid = QtWidgets.QGridLayout()
         grid.setSpacing(10)
         grid.setContentsMargins(8,8,8,8)
-        rows, cols = 3, 4
+        cols = 4
+        rows = max(3, math.ceil(len(self.channels) / cols))
 
         color_map = {
             "E": "#0078ff", "I": "#ff3b3b", "PQS": "#b14cff",
@@ -76,6 +89,62 @@ class MeasurementWidget(QtWidgets.QWidget):
             disp.set_force_off(False)
             disp.set_value(value)
 
+    # ---------- refresco desacoplado ----------
+    def push_values(self, mapping):
+        """Lecturas de un bloque: se acumulan hasta el próximo refresco del LCD."""
+        self.averager.add(mapping)
+
+    def set_refresh_rate(self, hz):
+        self.refresh_hz = hz
+        self.refresh_timer.setInterval(int(1000 / hz))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()
+
+    def set_averaging(self, mode):
+        """mode: 'mean', 'exp', 'max' o 'min'."""
+        self.averager.set_mode(mode)
+
+    def _refresh(self):
+        values = self.averager.flush()
+        if values:
+            self.set_values(values)
+
+    def set_values(self, mapping):
+        """
+        Actualiza varios displays de una vez ({ch_name: valor o None}).
+        Cada display solo toca el texto si cambió y el estilo si pasa de apagado
+        a encendido (o al revés); todo se repinta una sola vez al final.
+        """
+        self.setUpdatesEnabled(False)
+        try:
+            for ch_name, value in mapping.items():
+                self.set_value(ch_name, value)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def set_channel_visible(self, ch_name, visible):
+        """Muestra u oculta el display de un canal (canal habilitado/deshabilitado)."""
+        disp = self.display_objs.get(ch_name)
+        if disp is not None:
+            disp.setVisible(visible)
+
+    def snapshot(self):
+        """Lecturas mostradas en este momento {"E1 Va": "120.000 V"} (displays visibles)."""
+        values = {}
+        for ch_name, disp in self.display_objs.items():
+            if disp.isHidden():
+                continue
+            value = disp.shown_value()
+            text = "-" if value is None else f"{value:.3f} {disp.unit_label.text()}"
+            values[f"{disp.id_label} {ch_name}"] = text
+        return values
+
     def force_all_off(self):
         """Apaga todos los displays (placeholder cuando no hay datos)."""
         for d in self.display_objs.values():
@@ -3,7 +3,30 @@
 
 from PySide6 import QtWidgets, QtGui, QtCore
 import math
-from widgets.channel_control_widget import ChannelControlWidget
+import time
+import numpy as np
+from widgets.channel_control_widget import ChannelControlWidget, MATH_CHANNELS
+from utils.channel_registry import REGISTRY
+from utils.interpolation import sinc_upsample, ratio_for
+from utils.qt_arrays import polygon_from_xy, qimage_from_array
+from utils.persistence import PhosphorPersistence, MODES as PERSISTENCE_MODES
+from utils.waveform_measurements import measure_sweeps
+from utils.math_channels import MathChannel
+from utils.acquisition import SweepAccumulator, find_trigger, MODES as ACQUISITION_MODES
+from utils.reference_memory import (
+    SLOTS as REF_SLOTS, make_reference, save_references, load_references
+)
+from utils.roll_buffer import MinMaxRing, SampleRing
+
+# columnas de la tabla "Datos Formas de ondas"
+MEAS_COLUMNS = ["Cursores", "EFI", "PRO", "P-P", "f (Hz)"]
+
+
+def _fmt(value, pattern="{:.4g}"):
+    """Número para la tabla de mediciones ('-' si no hay valor)."""
+    if value is None or not np.isfinite(value):
+        return "-"
+    return pattern.format(value)
 
 
 class OscilloscopeGrid(QtWidgets.QWidget):
@@ -13,51 +36,69 @@ class OscilloscopeGrid(QtWidgets.QWidget):
     - 5 subdivisiones por cuadro
     """
 
+    cursors_moved = QtCore.Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         self.phase = 0
         #self.time_scale = 1
-        self.time_scale = 0.001  # ejemplo: 1 ms/div
+        self.time_scale = 0.001  # segundos por división (1 ms/div)
+        self.fs = 2000           # frecuencia de muestreo del DAQ
+        self.sinc_interp = True  # interpolación sin(x)/x en bases de tiempo rápidas
+        self._polygons = {}      # QPolygonF reutilizado por canal
         self.channel_data = []
         #self.setMinimumSize(520, 420)
         #self.setStyleSheet("background: #008b8b;")
 
         self.trigger_level = 0
         self.trigger_enabled = True
+        self.trigger_index = 0        # inicio del barrido dentro del bloque (lo fija el disparo)
+
+        # modo XY: historia de los dos canales elegidos (la arma OscilloscopeWidget)
+        self.xy_data = None
+
+        # memorias de referencia (las administra OscilloscopeWidget)
+        self.references = {}
+        self.visible_refs = set()
+        self._ref_cache = {}
+        self._ref_versions = {}      # slot -> número de carga (clave del cache, no id())
+        self._ref_serial = 0
 
         self.cursor1 = 200
         self.cursor2 = 400
 
         self.real_signals = None
         
-        #BRILLO DE FOSFORO REAL
-        self.persistence_alpha = 40   # 0-255 (menos = más persistencia)
-        self.glow_intensity = 3       # grosor glow
+        #BRILLO DE FOSFORO REAL (histograma de impactos con decaimiento)
+        self.persistence = PhosphorPersistence(self.width(), self.height())
+        self.persistence.mode = "off"
+        self._persist_image = qimage_from_array(self.persistence.rgba)
+        self.new_block = False       # acumular solo cuando llega un bloque nuevo
+        self._last_frame = time.monotonic()
         self.xy_mode = False
 
-        self.buffer = QtGui.QPixmap(self.size())
-        self.buffer.fill(QtCore.Qt.black)
+        # MODO ROLL (bases de tiempo lentas): historia min/max + imagen desplazable
+        self.roll_mode = False
+        self.roll_buffer = None       # MinMaxRing que alimenta OscilloscopeWidget
+        self._roll_image = None       # trazos ya dibujados (se desplaza, no se recalcula)
+        self._roll_key = None
+        self._roll_drawn = 0          # columnas del ring ya volcadas a la imagen
+        self._roll_offsets = {}
+
     #BUFFER DE PERSISTENCIA (CLAVE)
     def resizeEvent(self, event):
-        self.buffer = QtGui.QPixmap(self.size())
-        self.buffer.fill(QtCore.Qt.black)
+        self.persistence.resize(self.width(), self.height())
+        self._persist_image = qimage_from_array(self.persistence.rgba)
    
     def paintEvent(self, event):
         painter = QtGui.QPainter(self)
         painter.fillRect(self.rect(), QtGui.QColor("#008b8b"))
 
-        # pintar buffer previo
-        #painter.drawPixmap(0, 0, self.buffer)
-
-        # painter sobre buffer
-        buf_painter = QtGui.QPainter(self.buffer)
-
-        # fade (persistencia)
-        fade_color = QtGui.QColor(0, 0, 0, self.persistence_alpha)
-        buf_painter.fillRect(self.rect(), fade_color)
-        #fade = QtGui.QColor(0, 40, 40, 40)
-        #painter.fillRect(self.rect(), fade)
+        # decaimiento de la persistencia según el tiempo real entre cuadros
+        now = time.monotonic()
+        self.persistence.decay(now - self._last_frame)
+        self._last_frame = now
 
         painter.setRenderHint(QtGui.QPainter.Antialiasing, False)
 
@@ -209,56 +250,20 @@ class OscilloscopeGrid(QtWidgets.QWidget):
 
             buf_painter.end()
             return"""
-        if self.xy_mode and len(self.channel_data) >= 2:
-
-            ch1 = self.channel_data[0]
-            ch2 = self.channel_data[1]
-
-            if ch1 and ch2 and "signal" in ch1 and "signal" in ch2:
-
-                import numpy as np
-
-                sigX = np.array(ch1["signal"])
-                sigY = np.array(ch2["signal"])
-
-                scaleX = self.parse_scale(ch1.get("scale"))
-                scaleY = self.parse_scale(ch2.get("scale"))
-
-                couplingX = ch1.get("coupling")
-                couplingY = ch2.get("coupling")
-
-                # aplicar acoplamiento
-                if couplingX == "⏚":
-                    sigX = np.zeros_like(sigX)
-                elif couplingX == "∿":
-                    sigX = sigX - np.mean(sigX)
-
-                if couplingY == "⏚":
-                    sigY = np.zeros_like(sigY)
-                elif couplingY == "∿":
-                    sigY = sigY - np.mean(sigY)
-
-                pen = QtGui.QPen(QtGui.QColor("green"))
-                pen.setWidth(2)
-                buf_painter.setPen(pen)
-
-                points = []
-
-                for i in range(min(len(sigX), len(sigY))):
-
-                    x = w/2 + (sigX[i] / scaleX) * (w/4)
-                    y = h/2 - (sigY[i] / scaleY) * (h/4)
-
-                    points.append(QtCore.QPointF(x, y))
-
-                buf_painter.drawPolyline(points)
-
-            buf_painter.end()
+        if self.xy_mode:
+            self._paint_xy(painter, w, h, colors)
             painter.end()
             return
 
+        # modo roll: la historia se desplaza desde la derecha
+        live_channels = self.channel_data
+        if self.roll_mode:
+            self._paint_roll(painter, w, h, colors)
+            live_channels = []
+
         #Acoplamiento real DC/AC/GND
-        for i, ch in enumerate(self.channel_data):
+        traces = []
+        for i, ch in enumerate(live_channels):
 
             if not ch:
                 continue
@@ -276,48 +281,51 @@ class OscilloscopeGrid(QtWidgets.QWidget):
             scale = self.parse_scale(ch["scale"])
             coupling = ch["coupling"]
 
-            if signal is None:
-                continue
-
             # aplicar AC/DC/GND
-            import numpy as np
-            sig = np.array(signal)
+            sig = np.asarray(signal, dtype=float)
+            low = ch.get("envelope_min")
 
             if coupling == "⏚":  # GND
                 sig = np.zeros_like(sig)
+                low = None
 
             elif coupling == "∿":  # AC
-                sig = sig - np.mean(sig)
+                offset = np.mean(sig)
+                sig = sig - offset
+                if low is not None:
+                    low = low - offset
 
             # DC → no se modifica
 
-            """pen = QtGui.QPen(colors[i])
-            pen.setWidth(2)
-            painter.setPen(pen)"""
-            
-            # GLOW
-            for g in range(self.glow_intensity, 0, -1):
-                glow_pen = QtGui.QPen(colors[i])
-                glow_pen.setWidth(2 + g*2)
-                glow_pen.setColor(QtGui.QColor(colors[i].red(), colors[i].green(), colors[i].blue(), 30))
-                buf_painter.setPen(glow_pen)
-                buf_painter.drawPolyline(points)
-
-            # señal principal
-            pen = QtGui.QPen(colors[i])
-            pen.setWidth(2)
-            buf_painter.setPen(pen)
-            buf_painter.drawPolyline(points)
-
+            # traza vectorizada según base de tiempo (polígono cacheado por canal)
+            xs, vals = self.sweep_xy(sig, w)
+            ys = center - (vals / scale) * amplitude
+            points = polygon_from_xy(xs, ys, self._polygons.get(i))
+            self._polygons[i] = points
+            traces.append((i, xs, ys, points))
 
-            points = []
+            # modo envolvente: la traza inferior se dibuja con el mismo color
+            if low is not None:
+                xs, vals = self.sweep_xy(np.asarray(low, dtype=float), w)
+                ys = center - (vals / scale) * amplitude
+                points = polygon_from_xy(xs, ys, self._polygons.get((i, "min")))
+                self._polygons[(i, "min")] = points
+                traces.append((i, xs, ys, points))
 
-            for x in range(min(len(sig), w)):
+        # persistencia: acumular el bloque nuevo y pintar la imagen debajo de las trazas
+        if self.persistence.mode != "off" and not self.roll_mode:
+            self._paint_persistence(painter, traces, colors)
 
-                y = center - (sig[x] / scale) * amplitude
+        # memorias de referencia debajo de las trazas en vivo
+        if self.visible_refs and not self.roll_mode:
+            self._paint_references(painter, w, h, colors)
 
-                points.append(QtCore.QPointF(x, y))
+        for i, xs, ys, points in traces:
 
+            # señal principal
+            pen = QtGui.QPen(colors[i])
+            pen.setWidth(2)
+            painter.setPen(pen)
             painter.drawPolyline(points)
 
 
@@ -347,19 +355,21 @@ class OscilloscopeGrid(QtWidgets.QWidget):
 
         dx = abs(self.cursor2 - self.cursor1)
 
-        # tiempo (necesita time_scale)
-        dt = dx * self.time_scale / w
+        # tiempo (time_scale en s/div, 10 divisiones)
+        dt = dx * 10 * self.time_scale / w
 
         if self.channel_data and self.channel_data[0]:
 
             ch = self.channel_data[0]
 
-            if "signal" in ch and ch["signal"]:
+            if ch.get("signal") is not None:
 
                 sig = ch["signal"]
 
-                i1 = int(self.cursor1 / w * len(sig))
-                i2 = int(self.cursor2 / w * len(sig))
+                # posición de cada cursor en muestras según la base de tiempo
+                start, _, span = self.visible_window(len(sig))
+                i1 = start + int(self.cursor1 / w * span)
+                i2 = start + int(self.cursor2 / w * span)
 
                 if 0 <= i1 < len(sig) and 0 <= i2 < len(sig):
 
@@ -371,8 +381,6 @@ class OscilloscopeGrid(QtWidgets.QWidget):
                     painter.drawText(10, 20, text)
 
 
-        buf_painter.end()
-
         """# -------------------------
         # Medición Δt y ΔV
         # -------------------------
@@ -391,6 +399,224 @@ class OscilloscopeGrid(QtWidgets.QWidget):
         painter.setPen(QtGui.QColor("white"))
         painter.drawText(10, 20, text)"""
 
+    def _paint_persistence(self, painter, traces, colors):
+        """Suma las trazas del bloque nuevo al histograma y dibuja la imagen coloreada."""
+        if self.new_block:
+            for i, xs, ys, points in traces:
+                self.persistence.add_trace(i, xs, ys)
+            self.new_block = False
+
+        self.persistence.render([(c.red(), c.green(), c.blue()) for c in colors])
+        painter.drawImage(0, 0, self._persist_image)
+
+    def _paint_xy(self, painter, w, h, colors):
+        """
+        Modo XY sobre la ventana de historia (lazos V-I de muchos ciclos): mapeo
+        vectorizado a pixeles, polilínea diezmada para dibujar y, si hay persistencia,
+        las muestras nuevas a resolución completa en el histograma.
+        """
+        xy = self.xy_data
+        if not xy or xy["x"].size < 2:
+            return
+
+        def couple(sig, cfg):
+            if cfg.get("coupling") == "⏚":
+                return np.zeros_like(sig)
+            if cfg.get("coupling") == "∿":
+                return sig - np.mean(sig)
+            return sig
+
+        sx = couple(xy["x"], xy["x_cfg"])
+        sy = couple(xy["y"], xy["y_cfg"])
+        px = w / 2 + (sx / self.parse_scale(xy["x_cfg"].get("scale"))) * (w / 4)
+        py = h / 2 - (sy / self.parse_scale(xy["y_cfg"].get("scale"))) * (h / 4)
+        color = colors[xy["color_index"]]
+
+        if self.persistence.mode != "off":
+            if self.new_block:
+                new = min(px.size, xy["new"] + 1)
+                self.persistence.add_trace(xy["color_index"], px[-new:], py[-new:])
+                self.new_block = False
+            self.persistence.render([(c.red(), c.green(), c.blue()) for c in colors])
+            painter.drawImage(0, 0, self._persist_image)
+            # la historia la muestra el fósforo: la traza viva es solo el último bloque
+            px = px[-(xy["new"] + 1):]
+            py = py[-(xy["new"] + 1):]
+
+        # más puntos que ~4 por pixel de contorno no se distinguen
+        step = max(1, int(math.ceil(px.size / (4 * (w + h)))))
+        points = polygon_from_xy(px[::step], py[::step], self._polygons.get("xy"))
+        self._polygons["xy"] = points
+
+        pen = QtGui.QPen(color)
+        pen.setWidth(2)
+        painter.setPen(pen)
+        painter.drawPolyline(points)
+
+    def set_reference(self, slot, ref):
+        """Carga una memoria en 'slot' (su cache de polígonos se rearma)."""
+        self.references[slot] = ref
+        self._ref_serial += 1
+        self._ref_versions[slot] = self._ref_serial
+        self._drop_ref_cache(slot)
+
+    def clear_reference(self, slot):
+        self.references.pop(slot, None)
+        self._ref_versions.pop(slot, None)
+        self._drop_ref_cache(slot)
+
+    def _drop_ref_cache(self, slot):
+        for key in [key for key in self._ref_cache if key[0] == slot]:
+            del self._ref_cache[key]
+
+    def _paint_references(self, painter, w, h, colors):
+        """
+        Superpone las memorias visibles. Cada traza usa el mismo camino de polígono
+        cacheado que las trazas en vivo y solo se recalcula si cambia el tamaño o la
+        base de tiempo: repintar una referencia es un drawPolyline.
+        """
+        for slot in REF_SLOTS:
+            ref = self.references.get(slot)
+            if not ref or slot not in self.visible_refs:
+                continue
+
+            for k, tr in enumerate(ref["traces"]):
+                key = (self._ref_versions.get(slot), w, h, self.time_scale)
+                cached = self._ref_cache.get((slot, k))
+
+                if cached is None or cached[0] != key:
+                    sig = tr["signal"]
+                    xs = np.arange(len(sig)) / ref["fs"] / (10 * self.time_scale) * w
+                    # solo lo que entra en pantalla (+1 punto para llegar al borde)
+                    stop = min(len(sig), int(np.searchsorted(xs, w)) + 1)
+                    ys = h / 2 - (sig[:stop] / self.parse_scale(tr["scale"])) * (h / 4)
+                    polygon = polygon_from_xy(xs[:stop], ys, cached[1] if cached else None)
+                    cached = (key, polygon)
+                    self._ref_cache[(slot, k)] = cached
+
+                color = QtGui.QColor(colors[tr["slot_index"] % len(colors)])
+                color.setAlpha(150)
+                pen = QtGui.QPen(color)
+                pen.setWidth(1)
+                painter.setPen(pen)
+                painter.drawPolyline(cached[1])
+
+                if cached[1].size():
+                    first = cached[1].at(0)
+                    painter.drawText(4, int(first.y()) - 4, f"{slot} {tr['entry']}")
+
+    def clear_persistence(self):
+        self.persistence.clear()
+        self.update()
+
+    def _paint_roll(self, painter, w, h, colors):
+        """
+        Vuelca el ring min/max sobre una imagen cacheada: en cada cuadro solo se
+        desplaza la imagen y se dibujan las columnas nuevas del borde derecho.
+        """
+        ring = self.roll_buffer
+        if ring is None or ring.written == 0:
+            return
+
+        config = tuple(
+            (ch.get("scale"), ch.get("coupling"), ch.get("signal") is not None) if ch else None
+            for ch in self.channel_data
+        )
+        key = (id(ring), w, h, config, ring.written // ring.columns)
+        new = ring.written - self._roll_drawn
+
+        img = self._roll_image
+        full = img is None or img.size() != self.size() or key != self._roll_key or new >= w
+
+        if full:
+            img = QtGui.QPixmap(self.size())
+            img.fill(QtCore.Qt.transparent)
+            mins, maxs = ring.latest(w)
+            # offset AC: media de la historia visible (se recalcula una vez por barrido)
+            mid = (mins + maxs) / 2
+            count = np.maximum((~np.isnan(mid)).sum(axis=1), 1)
+            self._roll_offsets = dict(enumerate(np.nansum(mid, axis=1) / count))
+        elif new > 0:
+            img.scroll(-new, 0, img.rect())
+            mins, maxs = ring.latest(new + 1)
+        else:
+            mins = None
+
+        if mins is not None and mins.shape[1]:
+            p = QtGui.QPainter(img)
+            if not full:
+                # limpiar la franja que quedó expuesta a la derecha
+                p.setCompositionMode(QtGui.QPainter.CompositionMode_Source)
+                p.fillRect(w - new, 0, new, h, QtCore.Qt.transparent)
+                p.setCompositionMode(QtGui.QPainter.CompositionMode_SourceOver)
+            self._draw_roll_columns(p, mins, maxs, w, h, colors)
+            p.end()
+
+        self._roll_image = img
+        self._roll_key = key
+        self._roll_drawn = ring.written
+        painter.drawPixmap(0, 0, img)
+
+    def _draw_roll_columns(self, p, mins, maxs, w, h, colors):
+        """Una polilínea en zigzag (min, max) por canal: columnas verticales conectadas."""
+        n = mins.shape[1]
+        # una columna más a la izquierda para empalmar con lo ya dibujado
+        x = np.repeat(np.arange(w - n, w, dtype=float), 2)
+        center = h / 2
+        amplitude = h / 4
+
+        for i, ch in enumerate(self.channel_data):
+
+            if not ch or ch.get("signal") is None or i >= mins.shape[0]:
+                continue
+
+            scale = self.parse_scale(ch["scale"])
+            coupling = ch["coupling"]
+
+            lo = mins[i]
+            hi = maxs[i]
+            if coupling == "⏚":
+                lo = hi = np.zeros(n)
+            elif coupling == "∿":
+                off = self._roll_offsets.get(i, 0.0)
+                lo = lo - off
+                hi = hi - off
+
+            vals = np.column_stack((lo, hi)).ravel()
+            ys = center - (vals / scale) * amplitude
+            ok = ~np.isnan(ys)
+            if not ok.any():
+                continue
+
+            pen = QtGui.QPen(colors[i])
+            pen.setWidth(1)
+            p.setPen(pen)
+            p.drawPolyline(polygon_from_xy(x[ok], ys[ok]))
+
+    def visible_window(self, n):
+        """(inicio, fin, muestras por pantalla) del barrido visible en un bloque de n muestras."""
+        span = 10 * self.time_scale * self.fs      # muestras que entran en pantalla
+        start = self.trigger_index if self.trigger_index < n else 0
+        stop = min(n, start + int(math.ceil(span)) + 1)
+        return start, stop, span
+
+    def sweep_xy(self, sig, w):
+        """
+        Ventana visible según la base de tiempo: devuelve (x en pixeles, valores).
+        Con menos de una muestra cada 2 pixeles interpola sin(x)/x solo esa ventana
+        (tablas polifase cacheadas por factor), así 0.2 ms/div no queda en rectas.
+        """
+        start, stop, span = self.visible_window(len(sig))
+
+        if self.sinc_interp and span * 2 < w and stop - start >= 2:
+            pos, vals = sinc_upsample(sig, start, stop, ratio_for(span, w))
+        else:
+            pos = np.arange(start, stop)
+            vals = sig[start:stop]
+
+        xs = (pos - start) * (w / span)
+        return xs, vals
+
     def mouseMoveEvent(self,event):
 
         if event.buttons() & QtCore.Qt.LeftButton:
@@ -399,6 +625,7 @@ class OscilloscopeGrid(QtWidgets.QWidget):
         if event.buttons() & QtCore.Qt.RightButton:
             self.cursor2 = int(event.position().x())
 
+        self.cursors_moved.emit()
         self.update()
 
     #Escala real (volt/div,A/div)
@@ -419,13 +646,35 @@ class OscilloscopeWidget(QtWidgets.QWidget):
     Widget principal del osciloscopio LabVolt
     """
 
+    # a partir de esta base de tiempo (s/div) el barrido pasa a modo roll
+    ROLL_THRESHOLD = 0.2
+    # período de refresco de la tabla "Datos Formas de ondas"
+    MEAS_INTERVAL_MS = 250
+
+    # cambió lo que el osciloscopio necesita recibir (ver demand())
+    demand_changed = QtCore.Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
         # estado del osciloscopio
         self.phase = 0
         self.time_scale = 1
+        self.fs = 2000
         self.coupling_mode = "DC"
+        self._last_data = None
+        self._roll_entries = None
+        self.math_channels = {name: None for name in MATH_CHANNELS}
+        self._math_signals = {}
+        self._processed = []
+        self.acquisition = SweepAccumulator()
+        self._acq_entries = None
+        self._sweep_ring = None       # historia para alinear barridos más largos que un bloque
+        self._sweep_key = None
+        self._sweep_total = 0         # muestras agregadas al ring desde que se creó
+        self._sweep_next = 0          # primera muestra (absoluta) donde puede rearmarse el disparo
+        self._xy_ring = None
+        self._xy_entries = None
 
         # canales activos
         self.active_channels = {
@@ -435,27 +684,22 @@ class OscilloscopeWidget(QtWidgets.QWidget):
 
         self._build_ui()
 
-        # timer animación
-        self.timer = QtCore.QTimer()
+        # timer animación (corre solo mientras el osciloscopio está visible)
+        self.timer = QtCore.QTimer(self)
         self.timer.timeout.connect(self.animate)
-        self.timer.start(30)
 
-        self.signal_map = {
-            "E1": "Va",
-            "E2": "Vb",
-            "E3": "Vc",
-            "I1": "Ia",
-            "I2": "Ib",
-            "I3": "Ic",
-            "P1": "pqs1",
-            "P2": "pqs2",
-            "P3": "pqs3",
-            "T": "torque",
-            "N": "speed",
-            "Pm": "pm",
-        }
+        # entrada -> clave de datos, tomado del registro de canales (solo habilitados)
+        self.signal_map = REGISTRY.scope_map()
+        REGISTRY.add_listener(self._on_registry_changed)
+        self.destroyed.connect(lambda *_: REGISTRY.remove_listener(self._on_registry_changed))
  
         self.xy_mode = False
+        self.update_timebase(self.time_combo.currentText())
+
+        # mediciones automáticas: refresco limitado (no en cada bloque)
+        self._meas_pending = False
+        self.meas_timer = QtCore.QTimer(self)
+        self.meas_timer.timeout.connect(self.refresh_measurements)
 
     def _build_ui(self):
         main_layout = QtWidgets.QVBoxLayout(self)
@@ -489,6 +733,7 @@ class OscilloscopeWidget(QtWidgets.QWidget):
         for i, (name, color) in enumerate(channel_defs):
 
             ch = ChannelControlWidget(name, color)
+            ch.entry_combo.currentTextChanged.connect(self.demand_changed)
 
             self.channels.append(ch)
 
@@ -506,9 +751,10 @@ class OscilloscopeWidget(QtWidgets.QWidget):
         data_group = QtWidgets.QGroupBox("Datos Formas de ondas")
         data_layout = QtWidgets.QVBoxLayout(data_group)
 
-        table = QtWidgets.QTableWidget(9, 4)
-        table.setHorizontalHeaderLabels(["Cursores", "EFI", "PRO", "f (Hz)"])
-        table.verticalHeader().setVisible(False)
+        table = QtWidgets.QTableWidget(9, len(MEAS_COLUMNS))
+        table.setHorizontalHeaderLabels(MEAS_COLUMNS)
+        table.setVerticalHeaderLabels([f"Can{i + 1}" for i in range(8)] + ["Δ"])
+        table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         table.setStyleSheet(
             """
             QTableWidget {
@@ -518,6 +764,14 @@ class OscilloscopeWidget(QtWidgets.QWidget):
             """
         )
         data_layout.addWidget(table)
+
+        # celdas creadas una sola vez: el refresco solo cambia textos
+        for r in range(table.rowCount()):
+            for c in range(table.columnCount()):
+                table.setItem(r, c, QtWidgets.QTableWidgetItem(""))
+        self.meas_table = table
+        self._meas_cells = {}
+        self.scope_grid.cursors_moved.connect(self._on_cursors_moved)
         bottom_layout.addWidget(data_group, stretch=1)
 
         # Derecha: base de tiempo
@@ -549,6 +803,49 @@ class OscilloscopeWidget(QtWidgets.QWidget):
 
         bottom_layout.addWidget(time_group, stretch=1)
 
+        # Canales matemáticos (M1..M4): expresiones sobre las entradas
+        math_group = QtWidgets.QGroupBox("Canales matemáticos")
+        math_layout = QtWidgets.QFormLayout(math_group)
+
+        self.math_edits = {}
+        for name, example in zip(MATH_CHANNELS, ["E1*I1", "E1-E2", "integ(T)", "deriv(N)"]):
+            edit = QtWidgets.QLineEdit()
+            edit.setPlaceholderText(example)
+            edit.editingFinished.connect(lambda name=name: self.set_math_expression(name))
+            math_layout.addRow(name, edit)
+            self.math_edits[name] = edit
+
+        bottom_layout.addWidget(math_group, stretch=1)
+
+        # Memorias de referencia (R1..R4)
+        ref_group = QtWidgets.QGroupBox("Memorias de referencia")
+        ref_layout = QtWidgets.QGridLayout(ref_group)
+
+        self.ref_checks = {}
+        for r, slot in enumerate(REF_SLOTS):
+            btn_store = QtWidgets.QPushButton(f"Guardar {slot}")
+            chk_show = QtWidgets.QCheckBox("Ver")
+            chk_show.setEnabled(False)
+            btn_clear = QtWidgets.QPushButton("Borrar")
+
+            btn_store.clicked.connect(lambda _=False, slot=slot: self.store_reference(slot))
+            chk_show.toggled.connect(lambda on, slot=slot: self.show_reference(slot, on))
+            btn_clear.clicked.connect(lambda _=False, slot=slot: self.clear_reference(slot))
+
+            ref_layout.addWidget(btn_store, r, 0)
+            ref_layout.addWidget(chk_show, r, 1)
+            ref_layout.addWidget(btn_clear, r, 2)
+            self.ref_checks[slot] = chk_show
+
+        btn_export = QtWidgets.QPushButton("Exportar...")
+        btn_import = QtWidgets.QPushButton("Importar...")
+        btn_export.clicked.connect(self.export_references)
+        btn_import.clicked.connect(self.import_references)
+        ref_layout.addWidget(btn_export, len(REF_SLOTS), 0)
+        ref_layout.addWidget(btn_import, len(REF_SLOTS), 1, 1, 2)
+
+        bottom_layout.addWidget(ref_group, stretch=1)
+
         main_layout.addLayout(bottom_layout)
 
 
@@ -562,6 +859,130 @@ class OscilloscopeWidget(QtWidgets.QWidget):
 
         self.btn_xy.toggled.connect(self.toggle_xy_mode)
 
+        # Par X/Y y ventana de historia del modo XY
+        xy_row = QtWidgets.QHBoxLayout()
+
+        self.xy_x_combo = QtWidgets.QComboBox()
+        self.xy_y_combo = QtWidgets.QComboBox()
+        for combo in (self.xy_x_combo, self.xy_y_combo):
+            combo.addItems([f"Can{i + 1}" for i in range(8)])
+        self.xy_y_combo.setCurrentIndex(1)
+
+        self.xy_hist_combo = QtWidgets.QComboBox()
+        self.xy_hist_combo.addItems(["0.1 s", "0.5 s", "1 s", "2 s", "5 s"])
+
+        xy_row.addWidget(QtWidgets.QLabel("X"))
+        xy_row.addWidget(self.xy_x_combo)
+        xy_row.addWidget(QtWidgets.QLabel("Y"))
+        xy_row.addWidget(self.xy_y_combo)
+        xy_row.addWidget(self.xy_hist_combo)
+        time_layout.addLayout(xy_row)
+
+        for combo in (self.xy_x_combo, self.xy_y_combo, self.xy_hist_combo):
+            combo.currentIndexChanged.connect(self._reset_xy)
+
+        # Interpolación sin(x)/x para bases de tiempo rápidas
+        self.chk_sinc = QtWidgets.QCheckBox("Sin(x)/x")
+        self.chk_sinc.setChecked(True)
+        time_layout.addWidget(self.chk_sinc)
+
+        self.chk_sinc.toggled.connect(self.toggle_sinc_interp)
+
+        # Disparo (flanco ascendente del Can1) y modo de adquisición
+        trigger_row = QtWidgets.QHBoxLayout()
+        self.chk_trigger = QtWidgets.QCheckBox("Disparo Can1 ↑")
+        self.chk_trigger.setChecked(True)
+        self.trigger_label = QtWidgets.QLabel("")
+        self.trigger_label.setStyleSheet("color: #a00000;")
+        trigger_row.addWidget(self.chk_trigger)
+        trigger_row.addWidget(self.trigger_label)
+        time_layout.addLayout(trigger_row)
+
+        acq_row = QtWidgets.QHBoxLayout()
+
+        self.acq_combo = QtWidgets.QComboBox()
+        self.acq_combo.addItems(["Normal", "Promedio", "Envolvente"])
+
+        self.acq_n_combo = QtWidgets.QComboBox()
+        self.acq_n_combo.addItems(["2", "4", "8", "16", "32", "64", "128", "256"])
+        self.acq_n_combo.setCurrentText("16")
+
+        acq_row.addWidget(self.acq_combo)
+        acq_row.addWidget(QtWidgets.QLabel("N"))
+        acq_row.addWidget(self.acq_n_combo)
+        time_layout.addLayout(acq_row)
+
+        self.acq_combo.currentIndexChanged.connect(self.set_acquisition_mode)
+        self.acq_n_combo.currentTextChanged.connect(self.set_acquisition_mode)
+
+        # Persistencia (fósforo digital)
+        persist_row = QtWidgets.QHBoxLayout()
+
+        self.persist_combo = QtWidgets.QComboBox()
+        self.persist_combo.addItems([
+            "Sin persistencia",
+            "Persistencia variable",
+            "Persistencia infinita"
+        ])
+
+        self.decay_combo = QtWidgets.QComboBox()
+        self.decay_combo.addItems(["0.1 s", "0.2 s", "0.5 s", "1 s", "2 s", "5 s"])
+        self.decay_combo.setCurrentText("0.5 s")
+        self.decay_combo.setEnabled(False)
+
+        self.btn_clear_persist = QtWidgets.QPushButton("Borrar")
+
+        persist_row.addWidget(self.persist_combo)
+        persist_row.addWidget(self.decay_combo)
+        persist_row.addWidget(self.btn_clear_persist)
+        time_layout.addLayout(persist_row)
+
+        self.persist_combo.currentIndexChanged.connect(self.set_persistence_mode)
+        self.decay_combo.currentTextChanged.connect(self.set_persistence_decay)
+        self.btn_clear_persist.clicked.connect(self.scope_grid.clear_persistence)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.timer.start(30)
+        self.meas_timer.start(self.MEAS_INTERVAL_MS)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+        self.meas_timer.stop()
+
+    def set_acquisition_mode(self, *_):
+        """Normal / Promedio-N / Envolvente-N (cambiar solo reinicia los acumuladores)."""
+
+        mode = ACQUISITION_MODES[self.acq_combo.currentIndex()]
+        self.acquisition.set_mode(mode, int(self.acq_n_combo.currentText()))
+
+    def set_persistence_mode(self, index):
+
+        mode = PERSISTENCE_MODES[index]
+        self.scope_grid.persistence.mode = mode
+        if mode == "off":
+            self.scope_grid.persistence.clear()
+        self.decay_combo.setEnabled(mode == "variable")
+        self.scope_grid.update()
+
+    def set_persistence_decay(self, text):
+
+        try:
+            self.scope_grid.persistence.decay_time = float(text.split()[0])
+        except ValueError:
+            pass
+
+    def toggle_sinc_interp(self, enabled):
+
+        self.scope_grid.sinc_interp = enabled
+        self.scope_grid.update()
+
+    def set_sample_rate(self, fs):
+        """Frecuencia de muestreo del DAQ (necesaria para ubicar las muestras en el tiempo)."""
+        self.fs = fs
+        self.scope_grid.fs = fs
+
     def toggle_xy_mode(self, enabled):
 
         self.xy_mode = enabled
@@ -569,48 +990,83 @@ class OscilloscopeWidget(QtWidgets.QWidget):
         if hasattr(self, "scope_grid"):
             self.scope_grid.xy_mode = enabled    
 
-    def update_timebase(self, text):
+        self._reset_xy()
+
+    def _reset_xy(self, *_):
+        """Historia XY nueva (cambió el par de canales o la ventana)."""
+
+        self._xy_ring = None
+        self.scope_grid.xy_data = None
+        self.scope_grid.persistence.clear()
+        self.scope_grid.update()
+
+    def _feed_xy(self, processed):
+        """Agrega el bloque de los canales X/Y a la historia y arma los datos del grid."""
 
-        mapping = {
-            "0.2 ms/div.": 6,
-            "0.5 ms/div.": 4,
-            "1 ms/div.": 2,
-            "5 ms/div.": 1,
-            "10 ms/div.": 0.8,
-            "20 ms/div.": 0.6,
-            "50 ms/div.": 0.4,
-            "100 ms/div.": 0.2,
-            "0.2 s/div.": 0.1,
-            "0.5 s/div.": 0.05,
-            "1 s/div.": 0.02
+        xi = self.xy_x_combo.currentIndex()
+        yi = self.xy_y_combo.currentIndex()
+        x_cfg = processed[xi] if xi < len(processed) else None
+        y_cfg = processed[yi] if yi < len(processed) else None
+        if not x_cfg or not y_cfg or x_cfg.get("signal") is None or y_cfg.get("signal") is None:
+            self.scope_grid.xy_data = None
+            return
+
+        sig_x = np.asarray(x_cfg["signal"], dtype=float)
+        sig_y = np.asarray(y_cfg["signal"], dtype=float)
+        n = min(len(sig_x), len(sig_y))
+
+        entries = (self.channels[xi].get_entry(), self.channels[yi].get_entry())
+        if self._xy_ring is None or entries != self._xy_entries:
+            seconds = float(self.xy_hist_combo.currentText().split()[0])
+            self._xy_ring = SampleRing(2, max(n, int(seconds * self.fs)))
+            self._xy_entries = entries
+
+        self._xy_ring.append(np.vstack((sig_x[:n], sig_y[:n])))
+        hist = self._xy_ring.latest()
+
+        self.scope_grid.xy_data = {
+            "x": hist[0],
+            "y": hist[1],
+            "x_cfg": x_cfg,
+            "y_cfg": y_cfg,
+            "color_index": xi,
+            "new": n,
         }
 
-        self.time_scale = mapping.get(text, 1)
+    @staticmethod
+    def parse_timebase(text):
+        """'0.2 ms/div.' -> 0.0002 (segundos por división)."""
+        try:
+            value, unit = text.split()[:2]
+            factor = 1e-3 if unit.startswith("ms") else 1.0
+            return float(value) * factor
+        except ValueError:
+            return 1e-3
 
-    def animate(self):
+    def update_timebase(self, text):
 
-        self.phase += 0.1
+        self.time_scale = self.parse_timebase(text)
+        self.scope_grid.time_scale = self.time_scale
 
-        # leer configuración de canales
-        channel_data = []
+        # modo roll automático en bases de tiempo lentas (historia nueva por cambio)
+        self.scope_grid.roll_mode = self.time_scale >= self.ROLL_THRESHOLD
+        self.scope_grid.roll_buffer = None
 
-        for ch in self.channels:
+    def animate(self):
 
-            entry = ch.get_entry()
-            scale = ch.get_scale()
-            coupling = ch.get_coupling()
+        self.phase += 0.1
 
-            channel_data.append({
-            "entry": entry,
-            "scale": scale,
-            "coupling": coupling
-            })
-        
         self.scope_grid.xy_mode = self.xy_mode
 
         self.scope_grid.phase = self.phase
         self.scope_grid.time_scale = self.time_scale
-        self.scope_grid.channel_data = channel_data
+        self.scope_grid.fs = self.fs
+        # aplicar escala/acoplamiento actuales sin perder las señales del último bloque
+        for ch, processed in zip(self.channels, self._processed):
+            if processed:
+                processed["scale"] = ch.get_scale()
+                processed["coupling"] = ch.get_coupling()
+        self.scope_grid.channel_data = self._processed
 
         self.scope_grid.update()  
 
@@ -622,6 +1078,334 @@ class OscilloscopeWidget(QtWidgets.QWidget):
     #Pasar señales reales al Grid
     def update_signals(self, data):
 
+        self._last_data = data
+        self._eval_math(data)
+        processed = self._read_channels(data)
+
+        if self.xy_mode:
+            self._feed_xy(processed)
+        elif self.scope_grid.roll_mode:
+            self._feed_roll(processed)
+        else:
+            processed = self._align_sweeps(processed)
+
+        self._processed = processed
+        self.scope_grid.channel_data = processed
+        self.scope_grid.new_block = True
+        self._meas_pending = True
+
+        self.scope_grid.update()
+
+    def _align_sweeps(self, processed):
+        """
+        Busca el disparo (flanco ascendente del Can1) y, en Promedio/Envolvente, acumula
+        el barrido alineado de todos los canales activos (una matriz, un solo acumulador).
+        En Normal el disparo se busca dentro del bloque; para acumular se busca en un
+        SampleRing con el bloque actual más un barrido de historia, así también funciona
+        cuando el barrido es más largo que el bloque (10 ms/div en adelante).
+        """
+
+        grid = self.scope_grid
+        grid.trigger_index = 0
+        active = [i for i, ch in enumerate(processed) if ch and ch.get("signal") is not None]
+        if not active:
+            self._set_trigger_status("")
+            return processed
+
+        n = min(len(processed[i]["signal"]) for i in active)
+        length = int(math.ceil(10 * self.time_scale * self.fs)) + 1
+        triggered = self.chk_trigger.isChecked()
+        # el disparo es siempre del Can1: si está apagado no hay disparo
+        source = active.index(0) if 0 in active else None
+
+        if self.acquisition.mode == "normal":
+            start = None
+            if triggered and source is not None:
+                start = find_trigger(processed[0]["signal"], grid.trigger_level, min(n, length))
+            grid.trigger_index = start or 0
+            self._set_trigger_status(self._no_trigger_text(triggered, source, start))
+            return processed
+
+        entries = tuple(ch.get_entry() for ch in self.channels)
+        if entries != self._acq_entries:
+            self.acquisition.reset()
+            self._acq_entries = entries
+
+        if not triggered or source is None:
+            # sin disparo no se acumula (promediar barridos desalineados borra la señal)
+            self._set_trigger_status(self._no_trigger_text(triggered, source, None)
+                                     or "disparo apagado: no se acumula")
+            return processed
+
+        key = (tuple(active), entries, length, n)
+        if key != self._sweep_key:
+            self._sweep_ring = SampleRing(len(active), length + n)
+            self._sweep_key = key
+            self._sweep_total = 0
+            self._sweep_next = 0
+        ring = self._sweep_ring
+        ring.append(np.vstack([np.asarray(processed[i]["signal"][:n], dtype=float) for i in active]))
+        self._sweep_total += n
+
+        hist = ring.latest()
+        first = self._sweep_total - hist.shape[1]       # posición absoluta de hist[:, 0]
+        skip = max(self._sweep_next - first, 0)
+        start = find_trigger(hist[source, skip:], grid.trigger_level, length)
+        self._set_trigger_status(self._no_trigger_text(True, source, start))
+
+        if start is None:
+            if self.acquisition.count == 0:
+                return processed
+            upper, lower = self.acquisition.last
+        else:
+            start += skip
+            # se rearma al terminar el barrido (como un osciloscopio real)
+            self._sweep_next = first + start + length
+            upper, lower = self.acquisition.add(hist[:, start:start + length])
+
+        for k, i in enumerate(active):
+            processed[i] = dict(
+                processed[i],
+                signal=upper[k],
+                envelope_min=lower[k] if lower is not None else None,
+            )
+        return processed
+
+    @staticmethod
+    def _no_trigger_text(triggered, source, start):
+        if not triggered:
+            return ""
+        if source is None:
+            return "sin disparo (Can1 apagado)"
+        return "sin disparo" if start is None else ""
+
+    def _set_trigger_status(self, text):
+        if self.trigger_label.text() != text:
+            self.trigger_label.setText(text)
+
+    def _feed_roll(self, processed):
+        """Agrega el bloque al ring min/max (incremental: solo columnas nuevas)."""
+
+        signals = [ch.get("signal") if ch else None for ch in processed]
+        n = next((len(sig) for sig in signals if sig is not None), 0)
+        if n == 0:
+            return
+
+        columns = max(1, self.scope_grid.width())
+        spc = 10 * self.time_scale * self.fs / columns
+        entries = tuple(ch.get_entry() for ch in self.channels)
+
+        ring = self.scope_grid.roll_buffer
+        if ring is None or ring.columns != columns or entries != self._roll_entries:
+            ring = MinMaxRing(len(signals), columns, spc)
+            self.scope_grid.roll_buffer = ring
+            self._roll_entries = entries
+
+        block = np.full((len(signals), n), np.nan)
+        for i, sig in enumerate(signals):
+            if sig is not None:
+                block[i] = sig
+        ring.append(block)
+
+    def _on_registry_changed(self):
+        """Se habilitó/deshabilitó un canal: nuevo mapa y recompilar canales matemáticos."""
+        self.signal_map = REGISTRY.scope_map()
+        for name in self.math_edits:
+            self.set_math_expression(name)
+
+    def set_math_expression(self, name):
+        """Compila la expresión del canal matemático (una vez, no por bloque)."""
+
+        edit = self.math_edits[name]
+        text = edit.text().strip()
+
+        if not text:
+            self.math_channels[name] = None
+            edit.setStyleSheet("")
+            edit.setToolTip("")
+            self.demand_changed.emit()
+            return
+
+        try:
+            self.math_channels[name] = MathChannel(text, self.signal_map.keys())
+            edit.setStyleSheet("")
+            edit.setToolTip(f"{name} = {text}")
+        except ValueError as e:
+            self.math_channels[name] = None
+            edit.setStyleSheet("QLineEdit { background: #ffd0d0; }")
+            edit.setToolTip(str(e))
+        self.demand_changed.emit()
+
+    def demand(self):
+        """Claves de datos que necesitan los canales seleccionados (y sus matemáticos)."""
+        keys = set()
+        for ch in self.channels:
+            entry = ch.get_entry()
+            m = self.math_channels.get(entry)
+            names = m.inputs if m else [entry]
+            keys.update(self.signal_map[n] for n in names if n in self.signal_map)
+        return keys
+
+    def _eval_math(self, data):
+        """
+        Evalúa los canales matemáticos seleccionados sobre la matriz compartida
+        del bloque (una fila por entrada usada).
+        """
+
+        self._math_signals = {}
+        entries = {ch.get_entry() for ch in self.channels}
+        wanted = [(name, m) for name, m in self.math_channels.items() if m and name in entries]
+        if not wanted:
+            return
+
+        names = []
+        for _, m in wanted:
+            for inp in m.inputs:
+                if inp not in names:
+                    names.append(inp)
+        keys = [self.signal_map[n] for n in names]
+        if any(k not in data for k in keys):
+            return
+
+        block = np.vstack([data[k] for k in keys]) if keys else np.empty((0, len(data.get("t", []))))
+        rows = {n: i for i, n in enumerate(names)}
+
+        for name, m in wanted:
+            self._math_signals[name] = m.evaluate(block, rows, 1.0 / self.fs)
+
+    def store_reference(self, slot):
+        """Congela el barrido visible de los canales activos en la memoria 'slot'."""
+
+        grid = self.scope_grid
+        traces = []
+        for i, ch in enumerate(grid.channel_data):
+            if not ch or ch.get("signal") is None:
+                continue
+            sig = np.asarray(ch["signal"], dtype=float)
+            if ch.get("coupling") == "⏚":
+                sig = np.zeros_like(sig)
+            elif ch.get("coupling") == "∿":
+                sig = sig - np.mean(sig)
+            start, stop, _ = grid.visible_window(len(sig))
+            traces.append({
+                "slot_index": i,
+                "entry": self.channels[i].get_entry(),
+                "scale": ch.get("scale"),
+                "signal": sig[start:stop],
+            })
+
+        if not traces:
+            return
+
+        grid.set_reference(slot, make_reference(traces, self.time_scale, self.fs))
+        self.ref_checks[slot].setEnabled(True)
+        self.ref_checks[slot].setChecked(True)
+        grid.update()
+
+    def show_reference(self, slot, visible):
+
+        if visible:
+            self.scope_grid.visible_refs.add(slot)
+        else:
+            self.scope_grid.visible_refs.discard(slot)
+        self.scope_grid.update()
+
+    def clear_reference(self, slot):
+
+        self.scope_grid.clear_reference(slot)
+        self.ref_checks[slot].setChecked(False)
+        self.ref_checks[slot].setEnabled(False)
+        self.scope_grid.update()
+
+    def export_references(self):
+
+        if not any(self.scope_grid.references.values()):
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Exportar memorias", "", "Memorias de referencia (*.npz)"
+        )
+        if not path:
+            return
+        save_references(path, self.scope_grid.references)
+
+    def import_references(self):
+
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(
+            self, "Importar memorias", "", "Memorias de referencia (*.npz)"
+        )
+        if not path:
+            return
+        try:
+            refs = load_references(path)
+        except (OSError, ValueError, KeyError) as e:
+            QtWidgets.QMessageBox.warning(self, "Memorias", f"No se pudo leer el archivo:\n{e}")
+            return
+        for slot, ref in refs.items():
+            if slot in self.ref_checks:
+                self.scope_grid.set_reference(slot, ref)
+                self.ref_checks[slot].setEnabled(True)
+                self.ref_checks[slot].setChecked(True)
+        self.scope_grid.update()
+
+    def _on_cursors_moved(self):
+
+        self._meas_pending = True
+
+    def refresh_measurements(self):
+        """
+        EFI / PRO / P-P / f y lectura de cursores de todos los canales activos en una
+        sola pasada vectorizada sobre el barrido visible; solo se tocan las celdas que cambian.
+        """
+        if not self._meas_pending:
+            return
+        self._meas_pending = False
+
+        grid = self.scope_grid
+        rows = []
+        sweeps = []
+        for i, ch in enumerate(grid.channel_data):
+            if not ch or ch.get("signal") is None:
+                continue
+            sig = np.asarray(ch["signal"], dtype=float)
+            if ch.get("coupling") == "⏚":
+                sig = np.zeros_like(sig)
+            elif ch.get("coupling") == "∿":
+                sig = sig - np.mean(sig)
+            rows.append(i)
+            sweeps.append(sig)
+
+        w = max(1, grid.width())
+        span = 10 * grid.time_scale * grid.fs
+        texts = {}
+
+        if sweeps:
+            n = min(len(sig) for sig in sweeps)
+            start, stop, _ = grid.visible_window(n)
+            block = np.vstack([sig[start:stop] for sig in sweeps])
+            cursors = [grid.cursor1 / w * span, grid.cursor2 / w * span]
+            res = measure_sweeps(block, grid.fs, cursors)
+
+            for k, row in enumerate(rows):
+                c1, c2 = res["cursors"][k]
+                texts[(row, 0)] = f"{_fmt(c1)} / {_fmt(c2)}"
+                texts[(row, 1)] = _fmt(res["rms"][k])
+                texts[(row, 2)] = _fmt(res["mean"][k])
+                texts[(row, 3)] = _fmt(res["pk2pk"][k])
+                texts[(row, 4)] = _fmt(res["freq"][k], "{:.2f}")
+
+        dt = abs(grid.cursor2 - grid.cursor1) * 10 * grid.time_scale / w
+        texts[(8, 0)] = f"Δt: {_fmt(dt * 1000)} ms"
+
+        for r in range(self.meas_table.rowCount()):
+            for c in range(self.meas_table.columnCount()):
+                text = texts.get((r, c), "")
+                if self._meas_cells.get((r, c)) != text:
+                    self.meas_table.item(r, c).setText(text)
+                    self._meas_cells[(r, c)] = text
+
+    def _read_channels(self, data):
+        """Configuración actual de cada canal + su señal en el bloque (si hay datos)."""
+
         processed = []
 
         for ch in self.channels:
@@ -630,12 +1414,21 @@ class OscilloscopeWidget(QtWidgets.QWidget):
             scale_text = ch.get_scale()
             coupling = ch.get_coupling()
 
-            if entry == "Ninguna":
+            if entry == "Ninguna" or data is None:
                 #processed.append(None)
                 processed.append({
                     "signal": None,
-                    "scale": None,
-                    "coupling": None
+                    "scale": scale_text,
+                    "coupling": coupling
+                })
+                continue
+
+            if entry in self.math_channels:
+                signal = self._math_signals.get(entry)
+                processed.append({
+                    "signal": signal,
+                    "scale": scale_text,
+                    "coupling": coupling
                 })
                 continue
 
@@ -653,5 +1446,4 @@ class OscilloscopeWidget(QtWidgets.QWidget):
                 "coupling": coupling
             })
 
-        self.scope_grid.channel_data = processed
-        self.scope_grid.update()
\ No newline at end of file
+        return processed
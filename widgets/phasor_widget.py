@@ -1,8 +1,20 @@
 from PySide6 import QtWidgets, QtGui, QtCore
+from utils.channel_registry import REGISTRY
 import math
 import numpy as np
 
 
+# fasores del analizador (etiqueta del registro, color de dibujo)
+PHASOR_COLORS = [
+    ("E1", "red"),
+    ("E2", "lime"),
+    ("E3", "blue"),
+    ("I1", "yellow"),
+    ("I2", "cyan"),
+    ("I3", "magenta"),
+]
+
+
 # =========================================================
 # WIDGET DE DIBUJO (CÍRCULO DE FASORES)
 # =========================================================
@@ -131,10 +143,22 @@ class PhasorDisplay(QtWidgets.QWidget):
 # =========================================================
 class PhasorWidget(QtWidgets.QWidget):
 
+    # cambiaron los fasores marcados o la referencia (ver demand())
+    demand_changed = QtCore.Signal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._build_ui()
 
+        self.checks = {
+            "E1": self.chk_e1, "E2": self.chk_e2, "E3": self.chk_e3,
+            "I1": self.chk_i1, "I2": self.chk_i2, "I3": self.chk_i3,
+        }
+        for chk in self.checks.values():
+            chk.setChecked(True)
+            chk.toggled.connect(self.demand_changed)
+        self.ref_combo.currentTextChanged.connect(self.demand_changed)
+
     def _build_ui(self):
         main_layout = QtWidgets.QHBoxLayout(self)
 
@@ -245,61 +269,49 @@ class PhasorWidget(QtWidgets.QWidget):
         right_layout.addStretch()
         main_layout.addLayout(right_layout, stretch=2)
 
+    # -------------------------------------------------
+    # Demanda: solo se calculan los fasores marcados
+    # -------------------------------------------------
+    def _checked(self):
+        """(etiqueta, color) de los fasores marcados."""
+        return [(label, color) for label, color in PHASOR_COLORS
+                if self.checks[label].isChecked()]
+
+    def demand(self):
+        """Claves de datos de los fasores marcados (más el de referencia)."""
+        labels = {label for label, _ in self._checked()}
+        if labels:
+            labels.add(self.ref_combo.currentText())
+        return {REGISTRY.key_for(label) for label in labels}
+
     #FUNCION PARA RECIBIR DATOS
-    def update_data(self, data):
-        import numpy as np
+    def update_phasors(self, results):
+        """results: {clave: (rms, fase, frecuencia)} ya calculados por el pipeline."""
+        ref = results.get(REGISTRY.key_for(self.ref_combo.currentText()))
+        ref_phase = ref[1] if ref else 0.0
 
         phasors = []
+        checked = {label for label, _ in self._checked()}
 
-        def calc_phasor(signal):
-            sig = np.array(signal)
-
-            # RMS
-            rms = np.sqrt(np.mean(sig**2))
-
-            # frecuencia (aprox por FFT)
-            fft = np.fft.fft(sig)
-            freqs = np.fft.fftfreq(len(sig), d=1/2000)  # fs=2000
-
-            idx = np.argmax(np.abs(fft[1:])) + 1
-            freq = abs(freqs[idx])
-
-            # fase
-            phase = np.angle(fft[idx], deg=True)
-
-            return rms, phase, freq
+        for i, (label, color) in enumerate(PHASOR_COLORS):
+            value = results.get(REGISTRY.key_for(label)) if label in checked else None
 
-        mapping = [
-            ("Va", "red"),
-            ("Vb", "lime"),
-            ("Vc", "blue"),
-            ("Ia", "yellow"),
-            ("Ib", "cyan"),
-            ("Ic", "magenta"),
-        ]
-
-        table_data = []
-
-        for key, color in mapping:
-            sig = data.get(key)
-
-            if sig is None:
-                phasors.append((0, 0, color))
-                table_data.append((0, 0, 0))
+            if value is None:
+                for col in range(3):
+                    self.table.setItem(i, col, QtWidgets.QTableWidgetItem("-"))
                 continue
 
-            rms, phase, freq = calc_phasor(sig)
+            rms, phase, freq = value
+            # fase relativa al fasor de referencia, en (-180, 180]
+            phase = (phase - ref_phase + 180.0) % 360.0 - 180.0
 
             # normalizar magnitud para dibujar
             phasors.append((rms / 300, phase, color))
-            table_data.append((rms, phase, freq))
+
+            self.table.setItem(i, 0, QtWidgets.QTableWidgetItem(f"{rms:.2f}"))
+            self.table.setItem(i, 1, QtWidgets.QTableWidgetItem(f"{phase:.1f}°"))
+            self.table.setItem(i, 2, QtWidgets.QTableWidgetItem(f"{freq:.1f}"))
 
         # actualizar display
         self.display.phasors = phasors
         self.display.update()
-
-        # actualizar tabla
-        for i, (rms, phase, freq) in enumerate(table_data):
-            self.table.setItem(i, 0, QtWidgets.QTableWidgetItem(f"{rms:.2f}"))
-            self.table.setItem(i, 1, QtWidgets.QTableWidgetItem(f"{phase:.1f}°"))
-            self.table.setItem(i, 2, QtWidgets.QTableWidgetItem(f"{freq:.1f}"))
\ No newline at end of file
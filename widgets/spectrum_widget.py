@@ -1,6 +1,5 @@
 # widgets/spectrum_widget.py - analizador de espectro con display de frecuencia
 from PySide6 import QtWidgets
-import pyqtgraph as pg
 import numpy as np
 
 class SpectrumWidget(QtWidgets.QWidget):
@@ -10,6 +9,8 @@ class SpectrumWidget(QtWidgets.QWidget):
         self._build_ui()
 
     def _build_ui(self):
+        # pyqtgraph es pesado: se importa recién al construir el widget
+        import pyqtgraph as pg
         h = QtWidgets.QHBoxLayout(self)
         self.plot = pg.PlotWidget(title="Analizador de espectro")
         self.plot.getViewBox().setBackgroundColor((6,27,24))
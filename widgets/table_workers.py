@@ -0,0 +1,85 @@
+# widgets/table_workers.py - hilos de trabajo de la tabla de datos (importar / exportar)
+# El trabajo pesado corre fuera del hilo de la GUI; los resultados vuelven por señales
+# (Qt los encola al hilo principal) y cada hilo se puede cancelar con cancel().
+from PySide6 import QtCore
+from utils.table_io import iter_csv_chunks, write_csv, save_binary
+from utils.pdf_report import render_table_pdf
+
+
+class CsvImportThread(QtCore.QThread):
+    """Lee un CSV por bloques y emite cada bloque ya convertido a números."""
+    chunk_ready = QtCore.Signal(object, object)   # (matriz float64, textos)
+    progress = QtCore.Signal(int)                 # 0..100
+    failed = QtCore.Signal(str)
+
+    def __init__(self, path, info, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.info = info
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            for block, strings, fraction in iter_csv_chunks(self.path, self.info):
+                if self.cancelled:
+                    return
+                self.chunk_ready.emit(block, strings)
+                self.progress.emit(int(fraction * 100))
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class TableExportThread(QtCore.QThread):
+    """Exporta un snapshot de la tabla a CSV (por bloques) o a .npz columnar."""
+    progress = QtCore.Signal(int)
+    failed = QtCore.Signal(str)
+
+    def __init__(self, path, snapshot, binary=False, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.snapshot = snapshot
+        self.binary = binary
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            if self.binary:
+                save_binary(self.path, self.snapshot)
+                self.progress.emit(100)
+            else:
+                write_csv(self.path, self.snapshot,
+                          progress=lambda frac: self.progress.emit(int(frac * 100)),
+                          should_stop=lambda: self.cancelled)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class PdfReportThread(QtCore.QThread):
+    """Arma el informe PDF paginado fuera del hilo de la GUI."""
+    progress = QtCore.Signal(int)
+    failed = QtCore.Signal(str)
+
+    def __init__(self, path, snapshot, meters=None, images=(), parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.snapshot = snapshot
+        self.meters = meters
+        self.images = list(images)
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            render_table_pdf(self.path, self.snapshot, meters=self.meters, images=self.images,
+                             progress=lambda frac: self.progress.emit(int(frac * 100)),
+                             should_stop=lambda: self.cancelled)
+        except Exception as e:
+            self.failed.emit(str(e))
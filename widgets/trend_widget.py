@@ -0,0 +1,229 @@
+# widgets/trend_widget.py - registrador gráfico (strip chart) de las tendencias
+# Dibuja mín/máx como banda y el promedio como trazo de los canales elegidos, pidiendo
+# al TrendStore el nivel de la pirámide que corresponde al zoom (≈ un punto por píxel).
+import time
+import numpy as np
+from PySide6 import QtWidgets, QtGui, QtCore
+from utils.channel_registry import REGISTRY
+from utils.qt_arrays import polygon_from_xy
+from widgets.graph_widget import SERIES_COLORS, nice_step
+
+# texto -> segundos (None = todo lo registrado)
+SPANS = {"1 min": 60, "10 min": 600, "1 h": 3600, "8 h": 8 * 3600, "Todo": None}
+TIME_STEPS = (1, 2, 5, 10, 15, 30, 60, 120, 300, 600, 900, 1800, 3600, 7200, 14400, 21600, 43200, 86400)
+
+
+class TrendChart(QtWidgets.QWidget):
+    """
+    Área del registrador. 'follow' mantiene el final en el último dato; rueda: zoom
+    en el tiempo, arrastrar: desplazar (deja de seguir), doble clic: volver a seguir.
+    """
+    MARGIN = 40
+    follow_changed = QtCore.Signal(bool)
+
+    def __init__(self, trends, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(500, 300)
+        self.trends = trends
+        self.channels = []          # (clave, nombre, color)
+        self.span = 600.0
+        self.t_end = None
+        self.follow = True
+        self._drag = None
+
+    def _plot_rect(self):
+        m = self.MARGIN
+        return QtCore.QRectF(m + 20, m, self.width() - 2 * m - 20, self.height() - 2 * m)
+
+    def _window(self):
+        last = self.trends.last_time()
+        if last is None:
+            now = time.time()
+            return now - self.span, now
+        if self.follow or self.t_end is None:
+            self.t_end = last
+        return self.t_end - self.span, self.t_end
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        painter.fillRect(self.rect(), QtGui.QColor("#0a7f7f"))
+        rect = self._plot_rect()
+        painter.setPen(QtGui.QPen(QtGui.QColor("white"), 1))
+        font = painter.font()
+        font.setBold(True)
+        painter.setFont(font)
+        painter.drawLine(rect.bottomLeft(), rect.bottomRight())
+        painter.drawLine(rect.topLeft(), rect.bottomLeft())
+
+        t0, t1 = self._window()
+        keys = [key for key, _, _ in self.channels]
+        q = self.trends.query(t0, t1, keys, max_points=max(int(rect.width()), 1)) if keys else None
+
+        # escala Y según lo visible
+        y0, y1 = 0.0, 1.0
+        if q is not None:
+            lo, hi = q["lo"][np.isfinite(q["lo"])], q["hi"][np.isfinite(q["hi"])]
+            if lo.size and hi.size:
+                pad = (hi.max() - lo.min()) * 0.05 or 0.5
+                y0, y1 = lo.min() - pad, hi.max() + pad
+
+        # eje de tiempo (hora local)
+        span = t1 - t0
+        step = next((s for s in TIME_STEPS if span / s <= 8), TIME_STEPS[-1])
+        fmt = "%H:%M:%S" if step < 60 else "%H:%M"
+        v = np.ceil(t0 / step) * step
+        while v <= t1:
+            x = rect.left() + (v - t0) / span * rect.width()
+            painter.drawLine(QtCore.QPointF(x, rect.bottom() - 5), QtCore.QPointF(x, rect.bottom() + 5))
+            painter.drawText(QtCore.QPointF(x - 25, rect.bottom() + 18), time.strftime(fmt, time.localtime(v)))
+            v += step
+        ystep = nice_step(y1 - y0)
+        v = np.ceil(y0 / ystep) * ystep
+        while v <= y1:
+            y = rect.bottom() - (v - y0) / (y1 - y0) * rect.height()
+            painter.drawLine(QtCore.QPointF(rect.left() - 5, y), QtCore.QPointF(rect.left() + 5, y))
+            painter.drawText(QtCore.QRectF(0, y - 8, rect.left() - 8, 16),
+                             QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter, f"{v:.6g}")
+            v += ystep
+
+        if q is not None and len(q["t"]):
+            painter.setClipRect(rect)
+            px = rect.left() + (q["t"] - t0) * (rect.width() / span)
+            sy = rect.height() / (y1 - y0)
+            for j, (_, _, color) in enumerate(self.channels):
+                ok = np.isfinite(q["mean"][:, j])
+                if not ok.any():
+                    continue
+                x = px[ok]
+                lo = rect.bottom() - (q["lo"][ok, j] - y0) * sy
+                hi = rect.bottom() - (q["hi"][ok, j] - y0) * sy
+                mean = rect.bottom() - (q["mean"][ok, j] - y0) * sy
+                # banda mín/máx: ida por el máximo y vuelta por el mínimo
+                band = QtGui.QColor(color)
+                band.setAlpha(70)
+                painter.setPen(QtCore.Qt.NoPen)
+                painter.setBrush(band)
+                painter.drawPolygon(polygon_from_xy(np.concatenate([x, x[::-1]]), np.concatenate([hi, lo[::-1]])))
+                painter.setBrush(QtCore.Qt.NoBrush)
+                painter.setPen(QtGui.QPen(QtGui.QColor(color), 1))
+                painter.drawPolyline(polygon_from_xy(x, mean))
+            painter.setClipping(False)
+
+        # leyenda y nivel usado
+        for i, (_, name, color) in enumerate(self.channels):
+            painter.setPen(QtGui.QColor(color))
+            painter.drawText(QtCore.QPointF(rect.left() + 10, rect.top() + 16 + 16 * i), name)
+        if q is not None:
+            painter.setPen(QtGui.QColor("white"))
+            painter.drawText(QtCore.QRectF(rect.left(), 8, rect.width(), 20), QtCore.Qt.AlignRight,
+                             f"resolución: {q['period']:g} s")
+
+    # ---------- zoom / desplazamiento ----------
+    def wheelEvent(self, event):
+        factor = 0.8 ** (event.angleDelta().y() / 120)
+        self.span = min(max(self.span * factor, 5.0), 30 * 86400.0)
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() == QtCore.Qt.LeftButton:
+            t0, t1 = self._window()
+            self._drag = (event.position().x(), t1)
+
+    def mouseMoveEvent(self, event):
+        if self._drag is None:
+            return
+        x_start, t_end = self._drag
+        if self.follow:
+            self.follow = False
+            self.follow_changed.emit(False)
+        self.t_end = t_end - (event.position().x() - x_start) / self._plot_rect().width() * self.span
+        self.update()
+
+    def mouseReleaseEvent(self, event):
+        self._drag = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.follow = True
+        self.follow_changed.emit(True)
+        self.update()
+
+
+class TrendWidget(QtWidgets.QWidget):
+    """Pestaña de tendencias: canales a mostrar, ventana de tiempo y el registrador."""
+    REFRESH_MS = 1000
+
+    def __init__(self, trends, parent=None):
+        super().__init__(parent)
+        self.trends = trends
+        self._build_ui()
+
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.chart.update)
+
+    def _build_ui(self):
+        layout = QtWidgets.QHBoxLayout(self)
+        left = QtWidgets.QVBoxLayout()
+
+        group = QtWidgets.QGroupBox("Canales")
+        grid = QtWidgets.QGridLayout(group)
+        self.checks = {}
+        for i, (title, key, unit) in enumerate(REGISTRY.meter_defs()):
+            check = QtWidgets.QCheckBox(f"{title} ({unit})")
+            check.toggled.connect(self._update_channels)
+            grid.addWidget(check, i // 2, i % 2)
+            self.checks[key] = check
+        left.addWidget(group)
+
+        group_t = QtWidgets.QGroupBox("Ventana")
+        form = QtWidgets.QFormLayout(group_t)
+        self.span_combo = QtWidgets.QComboBox()
+        self.span_combo.addItems(list(SPANS))
+        self.span_combo.setCurrentText("10 min")
+        self.span_combo.currentTextChanged.connect(self._set_span)
+        form.addRow("Tiempo:", self.span_combo)
+        self.follow_check = QtWidgets.QCheckBox("Seguir el último dato")
+        self.follow_check.setChecked(True)
+        self.follow_check.toggled.connect(self._set_follow)
+        form.addRow(self.follow_check)
+        left.addWidget(group_t)
+        left.addStretch()
+
+        layout.addLayout(left, 1)
+        self.chart = TrendChart(self.trends)
+        self.chart.follow_changed.connect(self.follow_check.setChecked)
+        layout.addWidget(self.chart, 3)
+
+        first = next(iter(self.checks.values()), None)
+        if first is not None:
+            first.setChecked(True)
+
+    def _update_channels(self, *_):
+        channels = []
+        for i, (title, key, unit) in enumerate(REGISTRY.meter_defs()):
+            if self.checks[key].isChecked():
+                channels.append((key, f"{title} ({unit})", SERIES_COLORS[i % len(SERIES_COLORS)]))
+        self.chart.channels = channels
+        self.chart.update()
+
+    def _set_span(self, text):
+        span = SPANS[text]
+        if span is None:
+            # desde el dato más viejo que conserva la pirámide
+            first = min(tier.oldest() for tier in self.trends.tiers)
+            last = self.trends.last_time()
+            span = last - first if last is not None and np.isfinite(first) else 600.0
+        self.chart.span = max(span, 5.0)
+        self.chart.update()
+
+    def _set_follow(self, checked):
+        self.chart.follow = checked
+        self.chart.update()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.refresh_timer.stop()